@@ -25,12 +25,20 @@ class NoteEditor(QtGui.QTextEdit):
     """
     A Shotgun note creation/reply editor with user and group auto
     completion.
+
+    Searches are debounced the same way as the :class:`SearchCompleter`'s: a
+    search only reaches Shotgun once no key has been pressed for
+    :attr:`search_delay` milliseconds, and a search that has been superseded
+    by a newer one is cancelled.
     """
 
     # internal role constant defining where the auto completer
     # stores shotgun data
     _SG_DATA_ROLE = QtCore.Qt.UserRole + 1
 
+    # default time to wait for more typing before searching, in milliseconds
+    DEFAULT_SEARCH_DELAY = 300
+
     def __init__(self, parent):
         """
         Constructor
@@ -42,8 +50,15 @@ class NoteEditor(QtGui.QTextEdit):
         # set up some handy references
         self._bundle = sgtk.platform.current_bundle()
 
-        # the currently processing async autocompleting lookup
+        # the currently processing async autocompleting lookup, and the text
+        # waiting for the user to stop typing before it is searched for
         self._processing_id = None
+        self._pending_search_text = None
+
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.DEFAULT_SEARCH_DELAY)
+        self._search_timer.timeout.connect(self._on_search_timeout)
 
         # list of users that have been pushed through via auto completion
         self._users_selected = []
@@ -65,6 +80,18 @@ class NoteEditor(QtGui.QTextEdit):
 
         self._completer.activated[QtCore.QModelIndex].connect(self._insert_completion)
 
+    def _get_search_delay(self):
+        """
+        The time in milliseconds to wait for more typing before a search is
+        sent to Shotgun. A delay of ``0`` searches right away.
+        """
+        return self._search_timer.interval()
+
+    def _set_search_delay(self, delay):
+        self._search_timer.setInterval(max(0, int(delay)))
+
+    search_delay = property(_get_search_delay, _set_search_delay)
+
     def set_bg_task_manager(self, task_manager):
         """
         Specify the background task manager to use to pull
@@ -86,6 +113,7 @@ class NoteEditor(QtGui.QTextEdit):
         """
         Should be called before the reply widget is closed
         """
+        self._cancel_search()
         if self.__sg_data_retriever:
             self.__sg_data_retriever.stop()
             self.__sg_data_retriever.work_completed.disconnect(self.__on_worker_signal)
@@ -187,26 +215,20 @@ class NoteEditor(QtGui.QTextEdit):
             # this will also add a "now loading" placeholder item
             self._clear_model()
 
-            # clear async download queue
-            if self.__sg_data_retriever:
-                self.__sg_data_retriever.clear()
-
-            # kick off async data request from shotgun
-            # we request to run an arbitrary method in the worker thread
-            # this  _do_sg_global_search method will be called by the worker
-            # thread when the worker queue reaches that point and will
-            # call out to execute it. The data dictionary specified will
-            # be forwarded to the method.
-            data = {"text": login_to_search_for}
-            if self.__sg_data_retriever:
-                self._processing_id = self.__sg_data_retriever.execute_method(
-                    self._do_sg_global_search, data
-                )
-            else:
+            if not self.__sg_data_retriever:
                 raise TankError(
                     "Please associate this class with a background task processor."
                 )
 
+            # the search is sent to Shotgun once the user stops typing. Any
+            # search for the previous text is superseded.
+            self._cancel_search()
+            self._pending_search_text = login_to_search_for
+            if self._search_timer.interval() > 0:
+                self._search_timer.start()
+            else:
+                self._on_search_timeout()
+
             # finally, show the completer and make it appear right next to
             # where the cursor is located.
             cr = self.cursorRect()
@@ -219,11 +241,42 @@ class NoteEditor(QtGui.QTextEdit):
         else:
             # we are not in completion mode
             # make sure completer is hidden
+            self._cancel_search()
             self._completer.popup().hide()
 
     ##########################################################################################
     # internal methods
 
+    def _on_search_timeout(self):
+        """
+        Sends the pending search to Shotgun once the user has stopped typing.
+        """
+        text = self._pending_search_text
+        self._pending_search_text = None
+        if text is None or not self.__sg_data_retriever:
+            return
+
+        # kick off async data request from shotgun
+        # we request to run an arbitrary method in the worker thread
+        # this  _do_sg_global_search method will be called by the worker
+        # thread when the worker queue reaches that point and will
+        # call out to execute it. The data dictionary specified will
+        # be forwarded to the method.
+        data = {"text": text}
+        self._processing_id = self.__sg_data_retriever.execute_method(
+            self._do_sg_global_search, data
+        )
+
+    def _cancel_search(self):
+        """
+        Cancels the pending search and the search in progress, if any.
+        """
+        self._search_timer.stop()
+        self._pending_search_text = None
+        if self._processing_id is not None and self.__sg_data_retriever:
+            self.__sg_data_retriever.stop_work(self._processing_id)
+        self._processing_id = None
+
     def _clear_model(self, add_loading_item=True):
         """
         Clears the current data in the model.
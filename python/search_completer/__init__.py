@@ -10,3 +10,5 @@
 
 from .global_search_completer import GlobalSearchCompleter
 from .hierarchical_search_completer import HierarchicalSearchCompleter
+from .local_entity_index import LocalEntityIndex
+from .search_result_ranker import SearchResultRanker
@@ -8,6 +8,9 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import bisect
+import functools
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
@@ -16,6 +19,7 @@ shotgun_model = sgtk.platform.import_framework(
 )
 
 from .search_completer import SearchCompleter
+from .search_result_ranker import SearchResultRanker
 
 
 class GlobalSearchCompleter(SearchCompleter):
@@ -38,12 +42,32 @@ class GlobalSearchCompleter(SearchCompleter):
         list (see modes above)
 
     :model role: ``SG_DATA_ROLE`` - Role for storing shotgun data in the model
+
+    Each searchable entity type is searched in a separate request so that the
+    requests run concurrently. Matches are added to the completion list as
+    each request completes, ordered by relevance.
+
+    :ivar ranker: The :class:`SearchResultRanker` ordering the matches by
+        relevance. By default, all global search completers share a ranker.
+    :vartype ranker: :class:`SearchResultRanker`
+
+    :ivar local_index: Optional :class:`LocalEntityIndex` to show matches from
+        while the text search is in progress. The text search results are
+        shown first, followed by the local matches it didn't return.
+    :vartype local_index: :class:`LocalEntityIndex`
     """
 
     # emitted when shotgun has been updated
     entity_selected = QtCore.Signal(str, int)
     entity_activated = QtCore.Signal(str, int, str)
 
+    # the most matches Shotgun returns for a text search. result sets this
+    # large may have been truncated so they can't be refined locally.
+    TEXT_SEARCH_RESULT_LIMIT = 50
+
+    # the ranker shared by all completers
+    _default_ranker = None
+
     def __init__(self, parent=None):
         """
         :param parent: Parent widget
@@ -65,6 +89,41 @@ class GlobalSearchCompleter(SearchCompleter):
             "PublishedFile": [],
         }
 
+        self._local_index = None
+
+        # the delegate rendering the results in the popup
+        self._delegate = None
+
+        if GlobalSearchCompleter._default_ranker is None:
+            GlobalSearchCompleter._default_ranker = SearchResultRanker()
+        self._ranker = GlobalSearchCompleter._default_ranker
+
+        # the negated scores of the streamed matches, in the order they are
+        # listed
+        self._streamed_keys = []
+
+    def _get_local_index(self):
+        """
+        The local entity index matches are shown from while searching.
+        """
+        return self._local_index
+
+    def _set_local_index(self, local_index):
+        self._local_index = local_index
+
+    local_index = property(_get_local_index, _set_local_index)
+
+    def _get_ranker(self):
+        """
+        The ranker ordering the matches by relevance.
+        """
+        return self._ranker
+
+    def _set_ranker(self, ranker):
+        self._ranker = ranker
+
+    ranker = property(_get_ranker, _set_ranker)
+
     def get_result(self, model_index):
         """
         Return the entity data for the supplied model index or None if there is
@@ -138,21 +197,39 @@ class GlobalSearchCompleter(SearchCompleter):
 
         :param str text: Text used for completion.
         """
+        # reuse the delegate set up for a previous search
+        if self._delegate and popup.itemDelegate() is self._delegate:
+            self._delegate.text = text
+            return
+
         # deferred import to help documentation generation.
         from .global_search_result_delegate import GlobalSearchResultDelegate
 
         self._delegate = GlobalSearchResultDelegate(popup, text)
         popup.setItemDelegate(self._delegate)
 
-    def _launch_sg_search(self, text):
+    def _get_search_cache_key(self, text):
         """
-        Launches a search on the Shotgun server.
+        Returns the key to cache the results of a search for the supplied text
+        under.
 
         :param str text: Text to search for.
 
-        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id.
+        :returns: A tuple identifying the text, entity criteria and projects.
+        """
+        return (
+            self.__class__.__name__,
+            text,
+            repr(sorted(self._entity_search_criteria.items())),
+            tuple(self._get_project_ids()),
+        )
+
+    def _get_project_ids(self):
         """
+        Returns the ids of the projects the search is constrained to.
 
+        :returns: A list of project ids.
+        """
         # constrain by project in the search
         project_ids = []
 
@@ -165,9 +242,184 @@ class GlobalSearchCompleter(SearchCompleter):
         elif self._bundle.context.project:
             project_ids.append(self._bundle.context.project["id"])
 
-        return self._sg_data_retriever.execute_text_search(
-            text, self._entity_search_criteria, project_ids
+        return project_ids
+
+    def _refine_search_results(self, data, text):
+        """
+        Filters the results of a previous search down to the matches whose name
+        contains each of the words of the supplied text.
+
+        :param dict data: Results of the previous search.
+        :param str text: Text to search for.
+
+        :returns: The refined results, or ``None`` if the previous results may
+            have been truncated.
+        """
+        matches = data["sg"]["matches"]
+        if data.get("truncated", len(matches) >= self.TEXT_SEARCH_RESULT_LIMIT):
+            return None
+
+        words = text.lower().split()
+        refined_matches = [
+            match
+            for match in matches
+            if all(word in (match.get("name") or "").lower() for word in words)
+        ]
+
+        refined = dict(data)
+        refined["sg"] = dict(
+            data["sg"], matches=self._ranker.rank(refined_matches, text)
+        )
+        return refined
+
+    def _get_local_results(self, text):
+        """
+        Returns the matches for the supplied text from the local entity index,
+        and keeps the index up to date with the current search criteria.
+
+        :param str text: Text to search for.
+
+        :returns: Results in the format of the text search, or ``None`` if the
+            index has no matches.
+        """
+        if not self._local_index:
+            return None
+
+        project_ids = self._get_project_ids()
+        self._local_index.sync(self._entity_search_criteria, project_ids)
+
+        matches = self._local_index.search(
+            text,
+            self._entity_search_criteria,
+            project_ids,
+            limit=self.TEXT_SEARCH_RESULT_LIMIT,
         )
+        if not matches:
+            # the index may not be complete yet, so wait for the text search
+            # rather than report that nothing was found
+            return None
+
+        return {
+            "sg": {"matches": self._ranker.rank(matches, text), "terms": text.split()}
+        }
+
+    def _merge_local_results(self, data, local_data):
+        """
+        Adds the local matches the text search didn't return to its matches.
+
+        :param dict data: Results of the text search.
+        :param dict local_data: Results from the local entity index.
+
+        :returns: The merged results.
+        """
+        matches = data["sg"]["matches"]
+        found = set((match["type"], match["id"]) for match in matches)
+        extra_matches = [
+            match
+            for match in local_data["sg"]["matches"]
+            if (match["type"], match["id"]) not in found
+        ]
+        if not extra_matches:
+            return data
+
+        merged = dict(data)
+        merged["sg"] = dict(
+            data["sg"],
+            matches=self._ranker.rank(matches + extra_matches, self._processing_text),
+        )
+        return merged
+
+    def _launch_sg_search(self, text):
+        """
+        Launches a search on the Shotgun server.
+
+        :param str text: Text to search for.
+
+        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id.
+        """
+        # search each entity type separately, so the searches run concurrently
+        # and the results of the fastest ones can be shown first
+        project_ids = self._get_project_ids()
+        return [
+            self._sg_data_retriever.execute_text_search(
+                text, {entity_type: filters}, project_ids
+            )
+            for (entity_type, filters) in self._entity_search_criteria.items()
+        ]
+
+    def _combine_search_results(self, results, text):
+        """
+        Combines the results of the text searches of each entity type, listing
+        the matches by relevance.
+
+        :param list results: Results of the text searches, in the order they
+            arrived.
+        :param str text: Text that was searched for.
+
+        :returns: The combined results, which also record whether any of the
+            searches may have been truncated.
+        """
+        matches = []
+        for data in results:
+            matches.extend(data["sg"]["matches"])
+
+        # the sort is stable so matches with the same score stay in the order
+        # they arrived, as they are streamed into the model
+        matches = self._ranker.rank(matches, text)
+
+        return {
+            "sg": dict(results[0]["sg"], matches=matches),
+            "truncated": any(
+                len(data["sg"]["matches"]) >= self.TEXT_SEARCH_RESULT_LIMIT
+                for data in results
+            ),
+        }
+
+    def _stream_search_results(self, data):
+        """
+        Inserts the matches of a text search into the model, after the matches
+        received so far that are at least as relevant. Consecutive matches are
+        inserted all at once.
+
+        :param dict data: Results of the text search of an entity type.
+
+        :returns: ``True`` if matches were added to the model, ``False``
+            otherwise.
+        """
+        matches = data["sg"]["matches"]
+        if not matches:
+            return False
+
+        if not self._processing_streamed:
+            # replace the loading item
+            self._clear_model(add_loading_item=False)
+            self._streamed_keys = []
+
+        score = self._ranker.get_scorer(self._processing_text)
+        keyed_matches = sorted(
+            ((-score(match), match) for match in matches), key=lambda km: km[0]
+        )
+
+        # group the matches by the row they are inserted at
+        runs = []
+        for (key, match) in keyed_matches:
+            position = bisect.bisect_right(self._streamed_keys, key)
+            if runs and runs[-1][0] == position:
+                runs[-1][1].append((key, match))
+            else:
+                runs.append((position, [(key, match)]))
+
+        root_item = self.model().invisibleRootItem()
+        inserted = 0
+        for (position, run) in runs:
+            row = position + inserted
+            root_item.insertRows(
+                row, [self._create_result_item(match) for (_, match) in run]
+            )
+            self._streamed_keys[row:row] = [key for (key, _) in run]
+            inserted += len(run)
+
+        return True
 
     def _on_select(self, model_index):
         """
@@ -178,6 +430,7 @@ class GlobalSearchCompleter(SearchCompleter):
         """
         data = self.get_result(model_index)
         if data:
+            self._ranker.record_selection(data["type"], data["id"])
             self.entity_selected.emit(data["type"], data["id"])
             self.entity_activated.emit(data["type"], data["id"], data["name"])
 
@@ -196,18 +449,48 @@ class GlobalSearchCompleter(SearchCompleter):
             self.model().appendRow(item)
 
         # insert new data into model
-        for d in matches:
-            item = QtGui.QStandardItem(d["name"])
-            item.setData(self.MODE_RESULT, self.MODE_ROLE)
+        if matches:
+            self.model().invisibleRootItem().appendRows(
+                [self._create_result_item(d) for d in matches]
+            )
 
-            item.setData(shotgun_model.sanitize_for_qt_model(d), self.SG_DATA_ROLE)
+    def _create_result_item(self, d):
+        """
+        Creates the model item of a text search match.
 
-            item.setIcon(self._pixmaps.no_thumbnail)
+        :param dict d: A text search match.
 
-            if d.get("image") and self._sg_data_retriever:
-                uid = self._sg_data_retriever.request_thumbnail(
-                    d["image"], d["type"], d["id"], "image", load_image=True
-                )
-                self._thumb_map[uid] = {"item": item}
+        :returns: The model item.
+        :rtype: :class:`~PySide.QtGui.QStandardItem`
+        """
+        item = QtGui.QStandardItem(d["name"])
+        item.setData(self.MODE_RESULT, self.MODE_ROLE)
+
+        item.setData(shotgun_model.sanitize_for_qt_model(d), self.SG_DATA_ROLE)
+        # the key includes the values the result's text is formatted from, so
+        # that a refreshed result with a new name or link is formatted again
+        item.setData(
+            "%s:%s:%r" % (d["type"], d["id"], (d.get("name"), d.get("links"))),
+            self.RESULT_KEY_ROLE,
+        )
 
-            self.model().appendRow(item)
+        if d.get("image") and self._sg_data_retriever:
+            # thumbnail urls are signed with query parameters that change
+            # between searches, so the thumbnail is identified by the rest of
+            # the url, as the data retriever's disk cache does
+            self._set_item_thumbnail(
+                item,
+                ("image", d["image"].split("?", 1)[0]),
+                functools.partial(
+                    self._sg_data_retriever.request_thumbnail,
+                    d["image"],
+                    d["type"],
+                    d["id"],
+                    "image",
+                    load_image=True,
+                ),
+            )
+        else:
+            item.setIcon(self._pixmaps.no_thumbnail)
+
+        return item
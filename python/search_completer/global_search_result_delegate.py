@@ -31,30 +31,15 @@ class GlobalSearchResultDelegate(SearchResultDelegate):
     search completer.
     """
 
-    def _render_result(self, widget, model_index):
+    def _format_result(self, data):
         """
-        Renders a result from the model into the provided widget.
+        Formats a result from the model as rich text.
 
-        :param widget: Widget used to render the result.
-        :type widget: ``SearchResultWidget``
+        :param dict data: The Shotgun data stored for the result.
 
-        :param model_index: Index of the item to render.
-        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+        :returns: The rich text to display for the result.
+        :rtype: str
         """
-        from .global_search_completer import GlobalSearchCompleter
-
-        icon = shotgun_model.get_sanitized_data(model_index, QtCore.Qt.DecorationRole)
-        if icon:
-            thumb = icon.pixmap(512)
-            widget.set_thumbnail(thumb)
-        else:
-            # probably won't hit here, but just in case, use default/empty
-            # thumbnail
-            widget.set_thumbnail(self._pixmaps.no_thumbnail)
-
-        data = shotgun_model.get_sanitized_data(
-            model_index, GlobalSearchCompleter.SG_DATA_ROLE
-        )
         # Example of data stored in the data role:
         # {'status': 'vwd',
         #  'name': 'bunny_010_0050_comp_v001',
@@ -108,4 +93,4 @@ class GlobalSearchResultDelegate(SearchResultDelegate):
                     underlined_link,
                 )
 
-        widget.set_text(content)
+        return content
@@ -8,6 +8,8 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import functools
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
@@ -47,6 +49,10 @@ class HierarchicalSearchCompleter(SearchCompleter):
         :type parent: :class:`~PySide.QtGui.QWidget`
         """
         super(HierarchicalSearchCompleter, self).__init__(parent)
+
+        # the delegate rendering the results in the popup
+        self._delegate = None
+
         self.search_root = self._bundle.context.project
         self.show_entities_only = True
         self.seed_entity_field = "PublishedFile.entity"
@@ -108,6 +114,11 @@ class HierarchicalSearchCompleter(SearchCompleter):
         :param popup: Qt Popup widget receiving the delegate.
         :paarm text: Text from the current search.
         """
+        # reuse the delegate set up for a previous search
+        if self._delegate and popup.itemDelegate() is self._delegate:
+            self._delegate.text = text
+            return
+
         # deferred import to help documentation generation.
         from .hierarchical_search_result_delegate import (
             HierarchicalSearchResultDelegate,
@@ -116,23 +127,44 @@ class HierarchicalSearchCompleter(SearchCompleter):
         self._delegate = HierarchicalSearchResultDelegate(popup, text)
         popup.setItemDelegate(self._delegate)
 
-    def _launch_sg_search(self, text):
+    def _get_search_cache_key(self, text):
         """
-        Launches a search on the Shotgun server.
+        Returns the key to cache the results of a search for the supplied text
+        under.
 
         :param str text: Text to search for.
 
-        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id.
+        :returns: A tuple identifying the text, search root and seed entity field.
+        """
+        return (
+            self.__class__.__name__,
+            text,
+            self._get_root_path(),
+            self._seed_entity_field,
+        )
+
+    def _get_root_path(self):
+        """
+        Returns the navigation path of the search root.
+
+        :returns: The path as a string.
         """
         # FIXME: Ideally we would use the nav_search_entity endpoint to compute the path to the root.
         # Unfortunately there is a bug a the moment that prevents this.
         if not self._search_root:
-            root_path = "/"
-        else:
-            root_path = "/Project/%d" % self._search_root.get("id")
+            return "/"
+        return "/Project/%d" % self._search_root.get("id")
+
+    def _launch_sg_search(self, text):
+        """
+        Launches a search on the Shotgun server.
 
+        :param str text: Text to search for.
+
+        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id.
+        """
         return self._sg_data_retriever.execute_nav_search_string(
-            root_path, text, self._seed_entity_field
+            self._get_root_path(), text, self._seed_entity_field
         )
 
     def _handle_search_results(self, data):
@@ -185,16 +217,28 @@ class HierarchicalSearchCompleter(SearchCompleter):
             item.setData(self.MODE_RESULT, self.MODE_ROLE)
 
             item.setData(shotgun_model.sanitize_for_qt_model(data), self.SG_DATA_ROLE)
-
-            item.setIcon(self._pixmaps.no_thumbnail)
+            item.setData(
+                "%s:%r"
+                % (data["incremental_path"][-1], (data["label"], data["path_label"])),
+                self.RESULT_KEY_ROLE,
+            )
 
             data_type = data["ref"]["type"]
             data_id = data["ref"]["id"]
             if data_type and data_id and self._sg_data_retriever:
-                uid = self._sg_data_retriever.request_thumbnail_source(
-                    data_type, data_id, load_image=True
+                # the thumbnail url isn't known, so identify it by its entity
+                self._set_item_thumbnail(
+                    item,
+                    ("thumbnail_source", data_type, data_id),
+                    functools.partial(
+                        self._sg_data_retriever.request_thumbnail_source,
+                        data_type,
+                        data_id,
+                        load_image=True,
+                    ),
                 )
-                self._thumb_map[uid] = {"item": item}
+            else:
+                item.setIcon(self._pixmaps.no_thumbnail)
 
             self.model().appendRow(item)
 
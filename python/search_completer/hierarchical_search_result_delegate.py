@@ -31,30 +31,15 @@ class HierarchicalSearchResultDelegate(SearchResultDelegate):
     search completer.
     """
 
-    def _render_result(self, widget, model_index):
+    def _format_result(self, data):
         """
-        Renders a result from the model into the provided widget.
+        Formats a result from the model as rich text.
 
-        :param widget: Widget used to render the result.
-        :type widget: ``SearchResultWidget``
+        :param dict data: The Shotgun data stored for the result.
 
-        :param model_index: Index of the item to render.
-        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+        :returns: The rich text to display for the result.
+        :rtype: str
         """
-        from .hierarchical_search_completer import HierarchicalSearchCompleter
-
-        icon = shotgun_model.get_sanitized_data(model_index, QtCore.Qt.DecorationRole)
-        if icon:
-            thumb = icon.pixmap(512)
-            widget.set_thumbnail(thumb)
-        else:
-            # probably won't hit here, but just in case, use default/empty
-            # thumbnail
-            widget.set_thumbnail(self._pixmaps.no_thumbnail)
-
-        data = shotgun_model.get_sanitized_data(
-            model_index, HierarchicalSearchCompleter.SG_DATA_ROLE
-        )
         # Example of data stored in the data role:
         # {
         #     "path_label": "Assets > Character",
@@ -90,4 +75,4 @@ class HierarchicalSearchResultDelegate(SearchResultDelegate):
 
         content += "<br>%s" % data["path_label"]
 
-        widget.set_text(content)
+        return content
@@ -0,0 +1,694 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import os
+import sqlite3
+import time
+
+import sgtk
+from sgtk.platform.qt import QtCore
+from tank_vendor import six
+
+shotgun_data = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_data"
+)
+shotgun_model = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_model"
+)
+
+
+class LocalEntityIndex(QtCore.QObject):
+    """
+    An on-disk index of Shotgun entity names, used by the
+    :class:`GlobalSearchCompleter` to show matches without waiting for a text
+    search on the Shotgun server.
+
+    The index is stored in a sqlite database in the bundle's cache location and
+    is populated in the background, one page of entities at a time. Each
+    synchronization only fetches the entities updated since the previous one.
+    Names are indexed by trigram so that matching any part of a name stays fast
+    for large numbers of entities.
+
+    Entities are indexed separately for each entity type, filter and project
+    combination, so that local matches honour the same search criteria as the
+    text search. Entities that are updated so that they no longer match the
+    filters, such as deactivated users, are removed from the index on the next
+    synchronization. Entities that are retired in Shotgun remain in the index
+    until it is cleared.
+
+    :signal: ``index_updated()`` - Fires when entities have been added to,
+        updated in or removed from the index.
+    """
+
+    DATABASE_FORMAT_VERSION = 1
+
+    # number of entities fetched from Shotgun per background request
+    SYNC_BATCH_SIZE = 2000
+
+    # default time in seconds before the entities of a search criteria are
+    # synchronized again
+    DEFAULT_SYNC_INTERVAL = 300
+
+    # default maximum number of matches returned by a search
+    DEFAULT_RESULT_LIMIT = 50
+
+    # time in seconds a search waits for the database to be unlocked before
+    # giving up. searches run in the main thread so this must be short.
+    SEARCH_TIMEOUT = 0.05
+
+    index_updated = QtCore.Signal()
+
+    def __init__(self, parent=None, bg_task_manager=None, cache_path=None):
+        """
+        Constructor
+
+        :param parent: Parent object
+        :type parent: :class:`~PySide.QtCore.QObject`
+        :param bg_task_manager: Optional Task manager. If this is not passed in
+            the data retriever will create its own.
+        :type bg_task_manager: :class:`~task_manager.BackgroundTaskManager`
+        :param str cache_path: Optional path of the database file. Defaults to
+            a file in the bundle's cache location.
+        """
+        super(LocalEntityIndex, self).__init__(parent)
+
+        self._bundle = sgtk.platform.current_bundle()
+
+        self._cache_path = cache_path or os.path.join(
+            self._bundle.cache_location,
+            "search_index_v%s.sqlite" % self.DATABASE_FORMAT_VERSION,
+        )
+
+        self._sync_interval = self.DEFAULT_SYNC_INTERVAL
+
+        # the scopes waiting to be synchronized, keyed by scope, the page of
+        # entities currently being fetched: (uid, scope, criteria) and when
+        # each scope was last fully synchronized
+        self._sync_queue = collections.OrderedDict()
+        self._in_flight = None
+        self._synced_at = {}
+
+        # the fields available for each entity type
+        self._entity_fields = {}
+
+        # the connection used by the main thread, opened on first use. the
+        # background synchronization uses its own connections.
+        self._connection = None
+
+        self._sg_data_retriever = shotgun_data.ShotgunDataRetriever(
+            self, bg_task_manager=bg_task_manager
+        )
+        self._sg_data_retriever.start()
+        self._sg_data_retriever.work_completed.connect(self._on_worker_signal)
+        self._sg_data_retriever.work_failure.connect(self._on_worker_failure)
+
+    ############################################################################
+    # properties
+
+    def _get_sync_interval(self):
+        """
+        The time in seconds before the entities of a search criteria are
+        synchronized with Shotgun again.
+        """
+        return self._sync_interval
+
+    def _set_sync_interval(self, interval):
+        self._sync_interval = max(0, interval)
+
+    sync_interval = property(_get_sync_interval, _set_sync_interval)
+
+    ############################################################################
+    # public methods
+
+    def sync(self, entity_search_criteria, project_ids):
+        """
+        Synchronizes the entities matching the supplied search criteria with
+        Shotgun in the background. Criteria that have been synchronized within
+        :attr:`sync_interval` seconds are skipped.
+
+        :param dict entity_search_criteria: Entity types and their filters, as
+            passed to the Shotgun text search.
+        :param list project_ids: Ids of the projects to constrain the entities to.
+        """
+        if not self._sg_data_retriever:
+            return
+
+        # the database must be set up before it is written to in the background
+        try:
+            self._get_connection()
+        except sqlite3.Error as e:
+            self._bundle.log_warning("Could not open the entity index: %s" % e)
+            return
+
+        expired = time.time() - self._sync_interval
+        for (entity_type, filters) in entity_search_criteria.items():
+            scope = self._get_scope(entity_type, filters, project_ids)
+            if self._synced_at.get(scope, 0) > expired:
+                continue
+            if self._in_flight and self._in_flight[1] == scope:
+                continue
+            self._sync_queue[scope] = {
+                "entity_type": entity_type,
+                "filters": filters,
+                "project_ids": list(project_ids),
+            }
+
+        self._sync_next()
+
+    def search(
+        self, text, entity_search_criteria, project_ids, limit=DEFAULT_RESULT_LIMIT
+    ):
+        """
+        Returns the indexed entities whose name contains each of the words of
+        the supplied text.
+
+        The matches are ordered with the names starting with the text first,
+        then by name length. They use the format of the matches returned by the
+        Shotgun text search.
+
+        :param str text: Text to search for.
+        :param dict entity_search_criteria: Entity types and their filters, as
+            passed to the Shotgun text search.
+        :param list project_ids: Ids of the projects to constrain the entities to.
+        :param int limit: Maximum number of matches to return.
+
+        :returns: A list of match dictionaries, or ``None`` if none of the
+            search criteria have been indexed yet.
+        """
+        words = text.lower().split()
+        if not words:
+            return None
+
+        scopes = [
+            self._get_scope(entity_type, filters, project_ids)
+            for (entity_type, filters) in entity_search_criteria.items()
+        ]
+        if not scopes:
+            return None
+        scope_params = ",".join("?" * len(scopes))
+
+        sql = (
+            "SELECT entity_type, entity_id, project_id, name, status, link_type, "
+            "link_name FROM entity WHERE scope IN (%s)" % scope_params
+        )
+        params = list(scopes)
+
+        for word in words:
+            sql += " AND name_lower LIKE ? ESCAPE '\\'"
+            params.append("%%%s%%" % self._escape_like(word))
+
+        # narrow the names down using the trigram index before they are matched
+        trigrams = set()
+        for word in words:
+            trigrams.update(self._get_trigrams(word))
+        if trigrams:
+            sql += " AND rowid IN (%s)" % " INTERSECT ".join(
+                ["SELECT entity_rowid FROM trigram WHERE tri = ?"] * len(trigrams)
+            )
+            params.extend(sorted(trigrams))
+
+        sql += (
+            " ORDER BY name_lower LIKE ? ESCAPE '\\' DESC, length(name), name_lower "
+            "LIMIT ?"
+        )
+        params.extend(["%s%%" % self._escape_like(text.lower()), limit])
+
+        try:
+            cursor = self._get_connection().cursor()
+            synced = cursor.execute(
+                "SELECT count(*) FROM sync WHERE scope IN (%s)" % scope_params, scopes,
+            ).fetchone()[0]
+            if not synced:
+                return None
+            rows = cursor.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            # the index is busy or unusable, the text search will do
+            self._bundle.log_debug("Could not search the entity index: %s" % e)
+            return None
+
+        return [
+            {
+                "type": entity_type,
+                "id": entity_id,
+                "project_id": project_id,
+                "name": name,
+                "status": status,
+                "links": [link_type, link_name] if link_type else [],
+                "image": None,
+            }
+            for (
+                entity_type,
+                entity_id,
+                project_id,
+                name,
+                status,
+                link_type,
+                link_name,
+            ) in rows
+        ]
+
+    def clear(self):
+        """
+        Removes all entities from the index. They are fetched again the next
+        time the index is synchronized.
+        """
+        self._sync_queue.clear()
+        self._in_flight = None
+        self._synced_at = {}
+        if self._sg_data_retriever:
+            self._sg_data_retriever.clear()
+
+        try:
+            connection = self._get_connection()
+            # wait for a page being written in the background to be done
+            connection.execute("PRAGMA busy_timeout = 5000")
+            try:
+                connection.executescript(
+                    "DELETE FROM trigram; DELETE FROM entity; DELETE FROM sync;"
+                )
+                connection.commit()
+            finally:
+                connection.execute(
+                    "PRAGMA busy_timeout = %d" % (self.SEARCH_TIMEOUT * 1000)
+                )
+        except sqlite3.Error:
+            self._bundle.log_exception(
+                "Could not clear the entity index %s" % self._cache_path
+            )
+
+    def destroy(self):
+        """
+        Should be called before the index is discarded.
+        """
+        self._sync_queue.clear()
+        self._in_flight = None
+        if self._sg_data_retriever:
+            self._sg_data_retriever.stop()
+            self._sg_data_retriever.work_completed.disconnect(self._on_worker_signal)
+            self._sg_data_retriever.work_failure.disconnect(self._on_worker_failure)
+            self._sg_data_retriever = None
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    ############################################################################
+    # protected methods
+
+    def _get_scope(self, entity_type, filters, project_ids):
+        """
+        Returns the key the entities matching the supplied criteria are indexed
+        under.
+
+        :param str entity_type: Shotgun entity type
+        :param list filters: Filters the entities must match.
+        :param list project_ids: Ids of the projects to constrain the entities to.
+
+        :returns: A string identifying the criteria.
+        """
+        return "%s|%r|%s" % (
+            entity_type,
+            filters,
+            ",".join(str(project_id) for project_id in sorted(project_ids)),
+        )
+
+    def _get_trigrams(self, text):
+        """
+        Returns the set of three character sequences in the supplied text.
+
+        :param str text: Lower case text.
+
+        :returns: A set of strings.
+        """
+        return set(text[i : i + 3] for i in range(len(text) - 2))
+
+    def _escape_like(self, text):
+        """
+        Escapes the wildcards of a sqlite LIKE pattern in the supplied text.
+
+        :param str text: Text to escape.
+
+        :returns: The escaped text.
+        """
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def _connect(self, timeout=5.0):
+        """
+        Opens the database. Returns a handle that must be closed.
+
+        :param float timeout: Time in seconds to wait for the database to be
+            unlocked.
+        """
+        return sqlite3.connect(self._cache_path, timeout=timeout)
+
+    def _get_connection(self):
+        """
+        Returns the connection used by the main thread, opening the database
+        and creating its tables if needed.
+        """
+        if self._connection:
+            return self._connection
+
+        connection = self._connect(timeout=self.SEARCH_TIMEOUT)
+        try:
+            # readers in the main thread mustn't be blocked by the writes
+            # happening in the background
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entity (
+                    rowid INTEGER PRIMARY KEY, scope text, entity_type text,
+                    entity_id integer, project_id integer, name text,
+                    name_lower text, status text, link_type text, link_name text
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS entity_1
+                    ON entity(scope, entity_type, entity_id);
+
+                CREATE TABLE IF NOT EXISTS trigram (tri text, entity_rowid integer);
+                CREATE INDEX IF NOT EXISTS trigram_1 ON trigram(tri, entity_rowid);
+                CREATE INDEX IF NOT EXISTS trigram_2 ON trigram(entity_rowid);
+
+                CREATE TABLE IF NOT EXISTS sync (scope text PRIMARY KEY, position blob);
+                """
+            )
+        except:
+            connection.close()
+            raise
+
+        self._connection = connection
+        return connection
+
+    def _sync_next(self):
+        """
+        Requests the next page of entities to index, if no page is being
+        fetched already.
+        """
+        if self._in_flight or not self._sync_queue or not self._sg_data_retriever:
+            return
+
+        (scope, criteria) = next(iter(self._sync_queue.items()))
+        del self._sync_queue[scope]
+
+        data = dict(criteria)
+        data["scope"] = scope
+        data["fields"] = self._entity_fields.get(criteria["entity_type"])
+        uid = self._sg_data_retriever.execute_method(self._sync_page, data)
+        self._in_flight = (uid, scope, criteria)
+
+    def _sync_page(self, sg, data):
+        """
+        Async callback called by the data retriever. Fetches the next page of
+        entities updated since the last synchronization, writes the ones
+        matching the filters to the index and removes the ones that don't.
+        Note: This runs in a different thread and cannot access
+        any QT UI components.
+
+        :param sg: Shotgun instance
+        :param data: data dictionary passed in from _sync_next()
+
+        :returns: A dictionary with the number of entities in the page, the
+            number of entities added, updated or removed and the fields
+            available for the entity type.
+        """
+        entity_type = data["entity_type"]
+        available_fields = data["fields"]
+        if available_fields is None:
+            available_fields = list(sg.schema_field_read(entity_type).keys())
+
+        name_field = sgtk.util.get_sg_entity_name_field(entity_type)
+        fields = [name_field, "updated_at"]
+        for field in ("project", "sg_status_list", "entity"):
+            if field in available_fields:
+                fields.append(field)
+
+        project_filters = []
+        if data["project_ids"] and "project" in available_fields:
+            project_filters.append(
+                [
+                    "project",
+                    "in",
+                    [
+                        {"type": "Project", "id": project_id}
+                        for project_id in data["project_ids"]
+                    ],
+                ]
+            )
+
+        connection = self._connect()
+        # transactions are started explicitly so that the write lock is held
+        # while checking that the index hasn't been cleared
+        connection.isolation_level = None
+        try:
+            cursor = connection.cursor()
+
+            # page through the entities by (updated_at, id) so that entities
+            # sharing the same update time aren't skipped
+            row = self._read_sync_position(cursor, data["scope"])
+            page_filters = list(project_filters)
+            if row and row[0]:
+                position = sgtk.util.pickle.loads(row[0])
+                page_filters.append(self._get_position_filter(position, "greater_than"))
+
+            # the page is made of all the updated entities, not only the ones
+            # matching the filters, so that the ones that stopped matching them
+            # can be removed
+            page = sg.find(
+                entity_type,
+                page_filters,
+                ["updated_at"],
+                order=[
+                    {"field_name": "updated_at", "direction": "asc"},
+                    {"field_name": "id", "direction": "asc"},
+                ],
+                limit=self.SYNC_BATCH_SIZE,
+            )
+
+            entities = []
+            if page:
+                position = (page[-1]["updated_at"], page[-1]["id"])
+                entities = sg.find(
+                    entity_type,
+                    page_filters
+                    + list(data["filters"])
+                    + [self._get_position_filter(position, "less_than")],
+                    fields,
+                )
+
+            cursor.execute("BEGIN IMMEDIATE")
+            if self._read_sync_position(cursor, data["scope"]) != row:
+                # the index was cleared while the page was being fetched. the
+                # page continues from a position that no longer exists.
+                cursor.execute("ROLLBACK")
+                return {"count": 0, "changed": 0, "fields": available_fields}
+
+            changed = 0
+            if page:
+                for entity in entities:
+                    self._write_entity(cursor, data["scope"], name_field, entity)
+
+                matched_ids = set(entity["id"] for entity in entities)
+                for entity in page:
+                    if entity["id"] not in matched_ids:
+                        changed += self._remove_entity(
+                            cursor, data["scope"], entity_type, entity["id"]
+                        )
+                changed += len(entities)
+
+                cursor.execute(
+                    "INSERT OR REPLACE INTO sync (scope, position) VALUES (?, ?)",
+                    (
+                        data["scope"],
+                        sqlite3.Binary(
+                            six.ensure_binary(sgtk.util.pickle.dumps(position))
+                        ),
+                    ),
+                )
+            elif not row:
+                # remember that the criteria has been indexed, even if empty
+                cursor.execute(
+                    "INSERT INTO sync (scope, position) VALUES (?, NULL)",
+                    (data["scope"],),
+                )
+            cursor.execute("COMMIT")
+        finally:
+            # anything not committed is rolled back
+            connection.close()
+
+        return {"count": len(page), "changed": changed, "fields": available_fields}
+
+    def _read_sync_position(self, cursor, scope):
+        """
+        Returns the position the synchronization of a scope has reached.
+
+        :param cursor: Database cursor
+        :param str scope: Key of the criteria being synchronized.
+
+        :returns: ``None`` if the scope hasn't been synchronized, otherwise a
+            tuple holding the pickled position, or ``None`` if no entities
+            matched the criteria.
+        """
+        row = cursor.execute(
+            "SELECT position FROM sync WHERE scope = ?", (scope,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (bytes(row[0]) if row[0] is not None else None,)
+
+    def _get_position_filter(self, position, operator):
+        """
+        Returns a filter matching the entities before or after a position in
+        the (updated_at, id) order. Entities at the position are matched when
+        looking before it.
+
+        :param tuple position: The updated_at and id of an entity.
+        :param str operator: ``greater_than`` to match the entities after the
+            position, ``less_than`` to match the ones up to the position.
+
+        :returns: A complex Shotgun filter.
+        """
+        (updated_at, entity_id) = position
+        if operator == "less_than":
+            # include the entity at the position
+            entity_id += 1
+        return {
+            "filter_operator": "any",
+            "filters": [
+                ["updated_at", operator, updated_at],
+                {
+                    "filter_operator": "all",
+                    "filters": [
+                        ["updated_at", "is", updated_at],
+                        ["id", operator, entity_id],
+                    ],
+                },
+            ],
+        }
+
+    def _remove_entity(self, cursor, scope, entity_type, entity_id):
+        """
+        Removes an entity and its name trigrams from the index.
+
+        :param cursor: Database cursor
+        :param str scope: Key of the criteria the entity was indexed under.
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+
+        :returns: The number of entities removed.
+        """
+        row = cursor.execute(
+            "SELECT rowid FROM entity WHERE scope = ? AND entity_type = ? "
+            "AND entity_id = ?",
+            (scope, entity_type, entity_id),
+        ).fetchone()
+        if not row:
+            return 0
+        cursor.execute("DELETE FROM trigram WHERE entity_rowid = ?", (row[0],))
+        cursor.execute("DELETE FROM entity WHERE rowid = ?", (row[0],))
+        return 1
+
+    def _write_entity(self, cursor, scope, name_field, entity):
+        """
+        Adds or updates an entity and its name trigrams in the index.
+
+        :param cursor: Database cursor
+        :param str scope: Key of the criteria the entity matches.
+        :param str name_field: The field holding the entity's name.
+        :param dict entity: Shotgun entity dictionary
+        """
+        name = entity.get(name_field) or ""
+        name_lower = name.lower()
+        project_id = (entity.get("project") or {}).get("id")
+        link = entity.get("entity") or {}
+
+        row = cursor.execute(
+            "SELECT rowid FROM entity WHERE scope = ? AND entity_type = ? "
+            "AND entity_id = ?",
+            (scope, entity["type"], entity["id"]),
+        ).fetchone()
+        values = (
+            project_id,
+            name,
+            name_lower,
+            entity.get("sg_status_list"),
+            link.get("type"),
+            link.get("name"),
+        )
+        if row:
+            rowid = row[0]
+            cursor.execute(
+                "UPDATE entity SET project_id = ?, name = ?, name_lower = ?, "
+                "status = ?, link_type = ?, link_name = ? WHERE rowid = ?",
+                values + (rowid,),
+            )
+            cursor.execute("DELETE FROM trigram WHERE entity_rowid = ?", (rowid,))
+        else:
+            cursor.execute(
+                "INSERT INTO entity (scope, entity_type, entity_id, project_id, "
+                "name, name_lower, status, link_type, link_name) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (scope, entity["type"], entity["id"]) + values,
+            )
+            rowid = cursor.lastrowid
+
+        cursor.executemany(
+            "INSERT INTO trigram (tri, entity_rowid) VALUES (?, ?)",
+            [(trigram, rowid) for trigram in self._get_trigrams(name_lower)],
+        )
+
+    def _on_worker_signal(self, uid, request_type, data):
+        """
+        Signaled whenever the worker completes something.
+
+        :param uid: Unique id for request
+        :param request_type: String identifying the request class
+        :param data: the data that was returned
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        if not self._in_flight or self._in_flight[0] != uid:
+            return
+
+        data = shotgun_model.sanitize_qt(data)
+        (_, scope, criteria) = self._in_flight
+        self._in_flight = None
+
+        result = data["return_value"]
+        self._entity_fields[criteria["entity_type"]] = result["fields"]
+
+        if result["count"] >= self.SYNC_BATCH_SIZE:
+            # there are more entities to fetch, carry on where this page ended
+            self._sync_queue[scope] = criteria
+        else:
+            self._synced_at[scope] = time.time()
+
+        if result["changed"]:
+            self.index_updated.emit()
+
+        self._sync_next()
+
+    def _on_worker_failure(self, uid, msg):
+        """
+        Asynchronous callback - the worker thread errored.
+
+        :param uid: Unique id for request that failed
+        :param msg: Error message
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        if not self._in_flight or self._in_flight[0] != uid:
+            return
+
+        msg = shotgun_model.sanitize_qt(msg)
+        (_, scope, _) = self._in_flight
+        self._in_flight = None
+
+        # don't try again until the next synchronization is due
+        self._synced_at[scope] = time.time()
+        self._bundle.log_warning("Unable to update the entity index: %s" % msg)
+
+        self._sync_next()
@@ -8,6 +8,9 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import collections
+import time
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
@@ -33,20 +36,113 @@ class SearchCompleter(QtGui.QCompleter):
 
     :model role: ``SG_DATA_ROLE`` - Role for storing shotgun data in the model
 
+    :model role: ``RESULT_KEY_ROLE`` - Stores a string identifying a result and
+        the values its text is formatted from, used to cache its formatted text
+
+    Searches are debounced: a search only reaches Shotgun once no new search has
+    been requested for :attr:`search_delay` milliseconds, and the results of a
+    search that has been superseded by a newer one are dropped.
+
+    Search results are cached, shared by all completers. Results younger than
+    ``RESULT_CACHE_TTL`` seconds are shown without searching again. Older results
+    are shown right away while the search is refreshed in the background.
+
+    When the text extends the text of the previous search and that search
+    returned a complete result set, the previous results are filtered locally
+    and shown right away. Unless :attr:`confirm_refined_results` is turned off,
+    the search is still sent to Shotgun to confirm them.
+
     Derived classes are expected to implement the following methods:
         - :method:``_handle_search_results``
         - :method:``_on_select``
         - :method:``_launch_sg_search``
         - :method:``_set_item_delegate``
         - :method:``get_result``
+
+    Result thumbnails are composited once and kept in a cache shared by all
+    completers. Derived classes should use :method:``_set_item_thumbnail`` to
+    set the thumbnail of a result item.
+
+    Derived classes can also implement :method:``_get_search_cache_key`` to have
+    their search results cached, :method:``_refine_search_results`` to have
+    them refined locally and :method:``_get_local_results`` to show results
+    from a local source while the search is in progress.
     """
 
+    class _ResultCache(object):
+        """
+        A least recently used cache of search results with a time to live.
+        """
+
+        def __init__(self, max_entries, ttl):
+            """
+            :param int max_entries: The maximum number of results to keep.
+            :param ttl: The time in seconds results are considered fresh for.
+            """
+            self._max_entries = max_entries
+            self._ttl = ttl
+            self._entries = collections.OrderedDict()
+
+        def get(self, key):
+            """
+            Returns the cached results for the supplied key.
+
+            :param key: The search cache key.
+            :returns: A tuple with the results and whether they are stale, or
+                ``None`` if there are no results for the key.
+            """
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+
+            # mark as most recently used:
+            self._entries[key] = entry
+
+            (data, timestamp) = entry
+            return (data, time.time() - timestamp > self._ttl)
+
+        def add(self, key, data):
+            """
+            Caches the supplied results.
+
+            :param key: The search cache key.
+            :param data: The search results.
+            """
+            self._entries.pop(key, None)
+            self._entries[key] = (data, time.time())
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        def clear(self):
+            """
+            Removes all results from the cache.
+            """
+            self._entries = collections.OrderedDict()
+
     # custom roles for the model that tracks the auto completion results
     MODE_ROLE = QtCore.Qt.UserRole + 1
     SG_DATA_ROLE = QtCore.Qt.UserRole + 2
+    RESULT_KEY_ROLE = QtCore.Qt.UserRole + 3
 
     COMPLETE_MINIMUM_CHARACTERS = 3
 
+    # default time to wait for more typing before searching, in milliseconds
+    DEFAULT_SEARCH_DELAY = 300
+
+    # time in seconds search results are served from the cache without being
+    # refreshed, and the maximum number of search results kept in the cache
+    RESULT_CACHE_TTL = 60
+    RESULT_CACHE_SIZE = 100
+
+    # time in seconds composited thumbnails are reused for before they are
+    # requested again, and the maximum number of thumbnails kept in the cache
+    THUMBNAIL_CACHE_TTL = 3600
+    THUMBNAIL_CACHE_SIZE = 500
+
+    # search results and thumbnail caches shared by all completers
+    _result_cache = None
+    _thumbnail_cache = None
+
     # different items in the auto complete list can have
     # a different meaning, so track those here too
     (MODE_LOADING, MODE_NOT_FOUND, MODE_RESULT, MODE_NOT_ENOUGH_TEXT) = range(4)
@@ -70,9 +166,42 @@ class SearchCompleter(QtGui.QCompleter):
 
         self._sg_data_retriever = None
 
-        self._processing_id = None
+        self._processing_ids = []
+        self._processing_results = []
+        self._processing_streamed = False
+        self._processing_failed = False
+        self._processing_text = None
+        self._processing_cache_key = None
+        self._processing_cached_data = None
+        self._processing_local_data = None
         self._thumb_map = {}
 
+        # the thumbnail request in progress for each thumbnail cache key
+        self._thumb_requests = {}
+
+        # the text, cache key and results of the last search that completed
+        self._last_results = None
+        self._confirm_refined_results = True
+
+        if SearchCompleter._result_cache is None:
+            SearchCompleter._result_cache = SearchCompleter._ResultCache(
+                self.RESULT_CACHE_SIZE, self.RESULT_CACHE_TTL
+            )
+        if SearchCompleter._thumbnail_cache is None:
+            SearchCompleter._thumbnail_cache = SearchCompleter._ResultCache(
+                self.THUMBNAIL_CACHE_SIZE, self.THUMBNAIL_CACHE_TTL
+            )
+
+        # whether the popup has been set up for displaying results
+        self._popup_prepared = False
+
+        # the text to search for once the user stops typing
+        self._pending_search_text = None
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.DEFAULT_SEARCH_DELAY)
+        self._search_timer.timeout.connect(self._on_search_timeout)
+
         # configure popup data source
         self.setModel(QtGui.QStandardItemModel(self))
         self._clear_model()
@@ -86,16 +215,52 @@ class SearchCompleter(QtGui.QCompleter):
         # ensure the icon size is consistent
         self.popup().setIconSize(QtCore.QSize(48, 38))
 
+    def _get_search_delay(self):
+        """
+        The time in milliseconds to wait for more typing before a search is
+        sent to Shotgun. A delay of ``0`` searches right away.
+        """
+        return self._search_timer.interval()
+
+    def _set_search_delay(self, delay):
+        self._search_timer.setInterval(max(0, int(delay)))
+
+    search_delay = property(_get_search_delay, _set_search_delay)
+
+    def _get_confirm_refined_results(self):
+        """
+        Whether results refined locally from the previous search are confirmed
+        by searching Shotgun. If ``False``, refined results are used as is.
+        """
+        return self._confirm_refined_results
+
+    def _set_confirm_refined_results(self, state):
+        self._confirm_refined_results = bool(state)
+
+    confirm_refined_results = property(
+        _get_confirm_refined_results, _set_confirm_refined_results
+    )
+
+    @classmethod
+    def clear_result_cache(cls):
+        """
+        Removes all search results from the cache shared by all completers.
+        """
+        if SearchCompleter._result_cache:
+            SearchCompleter._result_cache.clear()
+
     def clear(self):
         """
         Manually clear the contents of the completer's popup view.
         """
+        self._cancel_search()
         self._clear_model(add_loading_item=False, add_more_text_item=True)
 
     def destroy(self):
         """
         Should be called before the widget is closed
         """
+        self._cancel_search()
         if self._sg_data_retriever:
             self._sg_data_retriever.stop()
             self._sg_data_retriever.work_completed.disconnect(self.__on_worker_signal)
@@ -106,6 +271,10 @@ class SearchCompleter(QtGui.QCompleter):
         """
         Triggers the popup to display results based on the supplied text.
 
+        The search is sent to Shotgun once no other search has been requested
+        for :attr:`search_delay` milliseconds. Any search still in progress is
+        superseded and its results are ignored.
+
         :param text: current contents of editor
         """
         if len(text) < self.COMPLETE_MINIMUM_CHARACTERS:
@@ -115,53 +284,61 @@ class SearchCompleter(QtGui.QCompleter):
             self.clear()
             return
 
-        # now we are about to populate the model with data
-        # and therefore trigger the completer to pop up.
-        #
-        # The completer seems to have some internal properties
-        # which are transitory and won't last between sessions.
-        # for these, we have to set them up every time the
-        # completion process is about to start it seems.
-
-        # tell completer to render matches using our delegate
-        # configure how the popup should look
-
-        self._set_item_delegate(self.popup(), text)
-
-        # try to disconnect and reconnect the activated signal
-        # it seems this signal is lost every time the widget
-        # looses focus.
-        try:
-            self.activated[QtCore.QModelIndex].disconnect(self._on_select)
-        except Exception:
-            self._bundle.log_debug(
-                "Could not disconnect activated signal prior to "
-                "reconnect. Looks like this connection must have been "
-                "discarded at some point along the way."
+        if not self._sg_data_retriever:
+            raise sgtk.TankError(
+                "Please associate this class with a background task manager."
             )
 
-        self.activated[QtCore.QModelIndex].connect(self._on_select)
-
-        # now clear the model
-        self._clear_model()
-
-        # clear thumbnail map
-        self._thumb_map = {}
+        # drop any search in progress
+        self._cancel_search()
+
+        # show cached results right away. fresh results don't need a search.
+        cache_key = self._get_search_cache_key(text)
+        cached = None
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)
+
+        refined = None
+        if not cached:
+            refined = self._get_refined_results(text)
+
+        local = None
+        if not cached and refined is None:
+            local = self._get_local_results(text)
+
+        # results shown right away need the popup set up for their text. the
+        # loading item only needs it set up once.
+        shown = cached or refined is not None or local is not None
+        if shown or not self._popup_prepared:
+            self._prepare_popup(text)
+
+        if cached:
+            (data, stale) = cached
+            self._show_search_results(data)
+            if not stale:
+                self._last_results = (text, cache_key, data)
+                return
+            # remember what is shown so unchanged results aren't redrawn
+            self._processing_cached_data = data
+        elif refined is not None:
+            self._show_search_results(refined)
+            if not self._confirm_refined_results:
+                self._last_results = (text, cache_key, refined)
+                return
+            self._processing_cached_data = refined
+        elif local is not None:
+            self._show_search_results(local)
+            self._processing_local_data = local
+            self._processing_cached_data = local
+        else:
+            # show that results are coming
+            self._clear_model()
 
-        # kick off async data request from shotgun
-        # we request to run an arbitrary method in the worker thread
-        # this  _do_sg_global_search method will be called by the worker
-        # thread when the worker queue reaches that point and will
-        # call out to execute it. The data dictionary specified will
-        # be forwarded to the method.
-        if self._sg_data_retriever:
-            # clear download queue and do the new search
-            self._sg_data_retriever.clear()
-            self._processing_id = self._launch_sg_search(text)
+        self._pending_search_text = text
+        if self._search_timer.interval() > 0:
+            self._search_timer.start()
         else:
-            raise sgtk.TankError(
-                "Please associate this class with a background task manager."
-            )
+            self._on_search_timeout()
 
     def get_current_result(self):
         """
@@ -197,17 +374,167 @@ class SearchCompleter(QtGui.QCompleter):
         :param task_manager: Background task manager to use
         :type  task_manager: :class:`~tk-framework-shotgunutils:task_manager.BackgroundTaskManager`
         """
-        self._sg_data_retriever = shotgun_data.ShotgunDataRetriever(
+        data_retriever = shotgun_data.ShotgunDataRetriever(
             self, bg_task_manager=task_manager
         )
+        data_retriever.start()
+        self.set_data_retriever(data_retriever)
+
+    def set_data_retriever(self, data_retriever):
+        """
+        Specify the data retriever to pull data in the background with,
+        instead of the one created by :meth:`set_bg_task_manager`. This lets
+        the completer share the requests of other widgets, such as the worker
+        pool of a field manager.
 
-        self._sg_data_retriever.start()
+        :param data_retriever: Started data retriever to use
+        :type  data_retriever: :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`
+        """
+        self._sg_data_retriever = data_retriever
         self._sg_data_retriever.work_completed.connect(self.__on_worker_signal)
         self._sg_data_retriever.work_failure.connect(self.__on_worker_failure)
 
     ############################################################################
     # internal methods
 
+    def _prepare_popup(self, text):
+        """
+        Sets up the popup to display the results of a search for the supplied
+        text.
+
+        :param str text: Text that is searched for.
+        """
+        # The completer seems to have some internal properties
+        # which are transitory and won't last between sessions.
+        # for these, we have to set them up every time the
+        # completion process is about to start it seems.
+
+        # tell completer to render matches using our delegate
+        # configure how the popup should look
+        self._set_item_delegate(self.popup(), text)
+
+        # try to disconnect and reconnect the activated signal
+        # it seems this signal is lost every time the widget
+        # looses focus.
+        try:
+            self.activated[QtCore.QModelIndex].disconnect(self._on_select)
+        except Exception:
+            self._bundle.log_debug(
+                "Could not disconnect activated signal prior to "
+                "reconnect. Looks like this connection must have been "
+                "discarded at some point along the way."
+            )
+
+        self.activated[QtCore.QModelIndex].connect(self._on_select)
+        self._popup_prepared = True
+
+    def _cancel_search(self):
+        """
+        Cancels the pending search and drops the results of the search in
+        progress, if any.
+        """
+        self._search_timer.stop()
+        self._pending_search_text = None
+        self._processing_ids = []
+        self._processing_results = []
+        self._processing_streamed = False
+        self._processing_failed = False
+        self._processing_text = None
+        self._processing_cache_key = None
+        self._processing_cached_data = None
+        self._processing_local_data = None
+
+    def _on_search_timeout(self):
+        """
+        Sends the pending search to Shotgun once the user has stopped typing.
+        """
+        text = self._pending_search_text
+        self._pending_search_text = None
+        if text is None or not self._sg_data_retriever:
+            return
+
+        self._prepare_popup(text)
+
+        # drop the requests of superseded searches still waiting in the queue
+        self._sg_data_retriever.clear()
+
+        # remember what to cache the results as
+        self._processing_text = text
+        self._processing_cache_key = self._get_search_cache_key(text)
+
+        # kick off async data request from shotgun
+        # we request to run an arbitrary method in the worker thread
+        # this  _do_sg_global_search method will be called by the worker
+        # thread when the worker queue reaches that point and will
+        # call out to execute it. The data dictionary specified will
+        # be forwarded to the method.
+        uids = self._launch_sg_search(text)
+        if not isinstance(uids, list):
+            uids = [uids]
+        self._processing_ids = uids
+        self._processing_results = []
+
+    def _get_refined_results(self, text):
+        """
+        Returns the results of the last search refined for the supplied text, if
+        the text extends the text of the last search and the last search was
+        done with the same criteria.
+
+        :param str text: Text to search for.
+
+        :returns: The refined results or ``None`` if they can't be refined.
+        """
+        if not self._last_results:
+            return None
+
+        (last_text, last_cache_key, last_data) = self._last_results
+        if len(text) <= len(last_text) or not text.lower().startswith(
+            last_text.lower()
+        ):
+            return None
+
+        # the criteria other than the text must not have changed
+        if last_cache_key != self._get_search_cache_key(last_text):
+            return None
+
+        return self._refine_search_results(last_data, text)
+
+    def _show_search_results(self, data):
+        """
+        Replaces the contents of the model with the supplied search results.
+
+        :param dict data: Search results, as received from the data retriever.
+        """
+        self._clear_model(add_loading_item=False)
+        self._handle_search_results(data)
+
+    def _set_item_thumbnail(self, item, cache_key, request_thumbnail):
+        """
+        Sets the thumbnail of a result item. Thumbnails are taken from the cache
+        shared by all completers when possible. Otherwise the thumbnail is
+        requested, unless a request for it is already in progress, and set once
+        it has been downloaded.
+
+        :param item: The result item to set the thumbnail of.
+        :type item: :class:`~PySide.QtGui.QStandardItem`
+        :param cache_key: A hashable key identifying the thumbnail, such as its url.
+        :param request_thumbnail: Callable that requests the thumbnail from the
+            data retriever and returns the request's unique id.
+        """
+        cached = self._thumbnail_cache.get(cache_key)
+        if cached and not cached[1]:
+            item.setIcon(cached[0])
+            return
+
+        item.setIcon(self._pixmaps.no_thumbnail)
+
+        uid = self._thumb_requests.get(cache_key)
+        if uid is None:
+            uid = request_thumbnail()
+            self._thumb_requests[cache_key] = uid
+            self._thumb_map[uid] = {"items": [], "cache_key": cache_key}
+        self._thumb_map[uid]["items"].append(item)
+
     def _clear_model(self, add_loading_item=True, add_more_text_item=False):
         """
         Clears the current data in the model.
@@ -217,6 +544,14 @@ class SearchCompleter(QtGui.QCompleter):
         :param add_more_text_item: if true, a "type at least 3 characers..."
             item will be added.
         """
+        # the items waiting for thumbnails are about to be deleted, so drop
+        # the downloads in progress
+        if self._sg_data_retriever:
+            for uid in self._thumb_map:
+                self._sg_data_retriever.stop_work(uid)
+        self._thumb_map = {}
+        self._thumb_requests = {}
+
         # clear model
         self.model().clear()
 
@@ -242,8 +577,12 @@ class SearchCompleter(QtGui.QCompleter):
         """
         uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
         msg = shotgun_model.sanitize_qt(msg)
-        if self._processing_id == uid:
+        if uid in self._processing_ids:
             self._bundle.log_warning("Could not retrieve search results: %s" % msg)
+            self._processing_ids.remove(uid)
+            self._processing_failed = True
+            if not self._processing_ids and self._processing_results:
+                self._finish_search()
 
     def __on_worker_signal(self, uid, request_type, data):
         """
@@ -259,20 +598,64 @@ class SearchCompleter(QtGui.QCompleter):
         data = shotgun_model.sanitize_qt(data)
 
         if uid in self._thumb_map:
+            thumb_info = self._thumb_map.pop(uid)
+            cache_key = thumb_info["cache_key"]
+            self._thumb_requests.pop(cache_key, None)
+
             thumbnail = data["image"]
-            item = self._thumb_map[uid]["item"]
             if thumbnail:
                 thumb = QtGui.QPixmap.fromImage(thumbnail)
-                item.setIcon(create_rectangular_thumbnail(thumb))
+                icon = create_rectangular_thumbnail(thumb)
+                if cache_key is not None:
+                    self._thumbnail_cache.add(cache_key, icon)
             else:
                 # probably won't hit here, but just in case, use default/empty
                 # thumbnail
-                item.setIcon(self._pixmaps.no_thumbnail)
+                icon = self._pixmaps.no_thumbnail
+
+            for item in thumb_info["items"]:
+                item.setIcon(icon)
 
-        if self._processing_id == uid:
-            # all done!
-            self._clear_model(add_loading_item=False)
-            self._handle_search_results(data)
+        if uid in self._processing_ids:
+            self._processing_ids.remove(uid)
+            self._processing_results.append(data)
+
+            # show the results as they arrive, unless other results are shown
+            if self._processing_cached_data is None or self._processing_streamed:
+                if self._stream_search_results(data):
+                    self._processing_streamed = True
+                    self._processing_cached_data = self._combine_search_results(
+                        self._processing_results, self._processing_text
+                    )
+
+            if not self._processing_ids:
+                # all done!
+                self._finish_search()
+
+    def _finish_search(self):
+        """
+        Combines, caches and shows the results of the search in progress once
+        all of its requests are done.
+        """
+        data = self._combine_search_results(
+            self._processing_results, self._processing_text
+        )
+        if self._processing_local_data is not None:
+            data = self._merge_local_results(data, self._processing_local_data)
+
+        # incomplete results mustn't be reused for other searches
+        if not self._processing_failed:
+            if self._processing_cache_key is not None:
+                self._result_cache.add(self._processing_cache_key, data)
+            self._last_results = (
+                self._processing_text,
+                self._processing_cache_key,
+                data,
+            )
+
+        # when refreshing cached results, only redraw if they changed
+        if data != self._processing_cached_data:
+            self._show_search_results(data)
 
     ############################################################################
     # Abstract methods
@@ -291,17 +674,121 @@ class SearchCompleter(QtGui.QCompleter):
         """
         raise NotImplementedError
 
+    def _get_search_cache_key(self, text):
+        """
+        Returns the key to cache the results of a search for the supplied text
+        under. The key should identify everything the search depends on, such
+        as the entity criteria, the search root and the project.
+
+        Derived classes can implement this method to have their search results
+        cached. The default implementation returns ``None``, which disables the
+        cache.
+
+        :param str text: Text to search for.
+
+        :returns: A hashable key or ``None``.
+        """
+        return None
+
+    def _refine_search_results(self, data, text):
+        """
+        Filters the results of a previous search down to the results of a
+        search for the supplied text, which extends the previous search text.
+
+        Derived classes can implement this method to show refined results while
+        typing. The default implementation returns ``None``, which disables
+        local refinement.
+
+        :param dict data: Results of the previous search, as received from the
+            data retriever.
+        :param str text: Text to search for.
+
+        :returns: The refined results, or ``None`` if the previous results can't
+            be refined. This must be the case if they may have been truncated.
+        """
+        return None
+
+    def _get_local_results(self, text):
+        """
+        Returns results for the supplied text from a local source, shown while
+        the search on the Shotgun server is in progress. They are merged with
+        the server's results using :method:``_merge_local_results``.
+
+        Derived classes can implement this method to show results before the
+        server responds. The default implementation returns ``None``, which
+        disables local results.
+
+        :param str text: Text to search for.
+
+        :returns: The local results, in the format received from the data
+            retriever, or ``None`` if there are none.
+        """
+        return None
+
+    def _merge_local_results(self, data, local_data):
+        """
+        Merges the results of the search on the Shotgun server with the local
+        results that were shown while it was in progress.
+
+        The default implementation returns the server's results.
+
+        :param dict data: Results of the search, as received from the data
+            retriever.
+        :param dict local_data: Results returned by
+            :method:``_get_local_results``.
+
+        :returns: The merged results.
+        """
+        return data
+
+    def _combine_search_results(self, results, text):
+        """
+        Combines the results of the requests launched by
+        :method:``_launch_sg_search``.
+
+        Derived classes that launch several requests for a search must
+        implement this method. The default implementation returns the results
+        of the first request.
+
+        :param list results: Results of the requests, in the order they arrived.
+        :param str text: Text that was searched for.
+
+        :returns: The combined results.
+        """
+        return results[0]
+
+    def _stream_search_results(self, data):
+        """
+        Adds the results of one of the requests launched by
+        :method:``_launch_sg_search`` to the model while the others are still in
+        progress. The model must end up showing the results combined so far by
+        :method:``_combine_search_results``. ``_processing_streamed`` is
+        ``False`` for the first results of a search.
+
+        Derived classes can implement this method to show results as they
+        arrive. The default implementation does nothing.
+
+        :param dict data: Results of the request.
+
+        :returns: ``True`` if the results were added to the model, ``False``
+            otherwise.
+        """
+        return False
+
     def _launch_sg_search(self, text):
         """
         Launches a search on the Shotgun server.
 
         Is is expected that the search is launched using the
         :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever` and than the job
-        id is returned to the called.
+        id is returned to the called. The search can be split into several
+        requests, in which case the list of their job ids is returned and
+        :method:``_combine_search_results`` must be implemented.
 
         :param str text: Text to search for.
 
-        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id.
+        :returns: The :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`'s job id,
+            or a list of job ids.
         """
         raise NotImplementedError
 
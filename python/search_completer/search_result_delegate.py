@@ -8,7 +8,10 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import collections
+
 import sgtk
+from sgtk.platform.qt import QtCore, QtGui
 from tank_vendor import six
 
 # import the shotgun_model and view modules from the shotgun utils framework
@@ -30,8 +33,21 @@ class SearchResultDelegate(views.WidgetDelegate):
     """
     Delegate which renders search match entries in the global
     search completer.
+
+    Results are painted directly rather than through the
+    :class:`SearchResultWidget`. The rich text of each result is formatted and
+    laid out once, and reused until the result or the search text changes.
+    Derived classes implement :meth:`_format_result` to provide this text.
     """
 
+    # maximum number of formatted results kept by each delegate
+    RESULT_TEXT_CACHE_SIZE = 200
+
+    # geometry of the result rows, matching the layout of the SearchResultWidget
+    THUMBNAIL_RECT = QtCore.QRect(11, 4, 48, 38)
+    TEXT_LEFT = 69
+    TEXT_MARGIN = 4
+
     def __init__(self, view, text=None):
         """
         :param view: The view where this delegate is being used
@@ -48,6 +64,21 @@ class SearchResultDelegate(views.WidgetDelegate):
 
         self.__current_index = None
 
+        # formatted rich text of the results painted recently, keyed by the
+        # result key and search text: [html, laid out text document]
+        self._result_text_cache = collections.OrderedDict()
+
+    def _get_text(self):
+        """
+        The search text underlined in the results.
+        """
+        return self._text
+
+    def _set_text(self, text):
+        self._text = six.ensure_str(text)
+
+    text = property(_get_text, _set_text)
+
     def _on_selection_changed(self, selected, deselected):
         """
         Signal triggered when someone changes the selection in the view.
@@ -111,6 +142,198 @@ class SearchResultDelegate(views.WidgetDelegate):
         else:
             widget.set_text("Unknown mode!")
 
+    def paint(self, painter, style_options, model_index):
+        """
+        Paints results directly. Other items are painted using the widget.
+
+        :param painter: The painter instance to use when painting
+        :param style_options: The style options to use when painting
+        :param model_index: The index in the data model that needs to be painted
+        """
+        # note: local import to avoid cyclic dependencies
+        from .search_completer import SearchCompleter
+
+        mode = shotgun_model.get_sanitized_data(model_index, SearchCompleter.MODE_ROLE)
+        if mode != SearchCompleter.MODE_RESULT:
+            super(SearchResultDelegate, self).paint(painter, style_options, model_index)
+            return
+
+        rect = style_options.rect
+        selected = model_index == self.__current_index
+
+        painter.save()
+        try:
+            painter.translate(rect.topLeft())
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+            if selected:
+                painter.setPen(QtGui.QPen(QtGui.QColor(48, 167, 227), 2))
+                painter.setBrush(QtGui.QColor(48, 167, 227, 38))
+                painter.drawRoundedRect(
+                    QtCore.QRectF(2, 2, rect.width() - 4, rect.height() - 4), 4, 4
+                )
+
+            painter.drawPixmap(
+                self.THUMBNAIL_RECT, self._get_result_thumbnail(model_index)
+            )
+
+            text_rect = QtCore.QRect(
+                self.TEXT_LEFT,
+                0,
+                rect.width() - self.TEXT_LEFT - self.TEXT_MARGIN,
+                rect.height(),
+            )
+            document = self._get_result_document(
+                model_index, text_rect.width(), style_options.font
+            )
+            if document:
+                # center the text vertically, as the label does
+                text_height = document.size().height()
+                top = max(0, (text_rect.height() - text_height) / 2.0)
+                painter.save()
+                painter.translate(text_rect.left(), top)
+                painter.setClipRect(
+                    QtCore.QRectF(0, -top, text_rect.width(), text_rect.height())
+                )
+                context = QtGui.QAbstractTextDocumentLayout.PaintContext()
+                context.palette.setColor(
+                    QtGui.QPalette.Text,
+                    style_options.palette.color(QtGui.QPalette.WindowText),
+                )
+                document.documentLayout().draw(painter, context)
+                painter.restore()
+
+            if not selected:
+                # fade the bottom of the text out rather than chopping it
+                fade_rect = QtCore.QRect(60, rect.height() - 9, rect.width(), 9)
+                gradient = QtGui.QLinearGradient(
+                    fade_rect.topLeft(), fade_rect.bottomLeft()
+                )
+                gradient.setColorAt(0, QtGui.QColor(0, 0, 0, 0))
+                gradient.setColorAt(0.15, style_options.palette.base().color())
+                painter.fillRect(fade_rect, gradient)
+        finally:
+            painter.restore()
+
+    def _render_result(self, widget, model_index):
+        """
+        Renders a result from the model into the provided widget.
+
+        :param widget: Widget used to render the result.
+        :type widget: ``SearchResultWidget``
+
+        :param model_index: Index of the item to render.
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+        """
+        widget.set_thumbnail(self._get_result_thumbnail(model_index))
+        entry = self._get_result_text(model_index)
+        widget.set_text(entry[0] if entry else "")
+
+    def _get_result_thumbnail(self, model_index):
+        """
+        Returns the thumbnail of a result from the model.
+
+        :param model_index: Index of the result.
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+
+        :returns: The thumbnail pixmap.
+        :rtype: :class:`~PySide.QtGui.QPixmap`
+        """
+        icon = shotgun_model.get_sanitized_data(model_index, QtCore.Qt.DecorationRole)
+        if icon:
+            return icon.pixmap(512)
+        # probably won't hit here, but just in case, use default/empty
+        # thumbnail
+        return self._pixmaps.no_thumbnail
+
+    def _get_result_text(self, model_index):
+        """
+        Returns the cache entry holding the formatted text of a result from the
+        model, formatting the result if it isn't cached.
+
+        :param model_index: Index of the result.
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+
+        :returns: A list holding the rich text and its text document, if it
+            has been laid out, or ``None`` if the result has no data.
+        """
+        # note: local import to avoid cyclic dependencies
+        from .search_completer import SearchCompleter
+
+        # the result's key is cheaper to get than its data, which is only
+        # needed to format it
+        result_key = shotgun_model.get_sanitized_data(
+            model_index, SearchCompleter.RESULT_KEY_ROLE
+        )
+        data = None
+        if result_key is None:
+            # results of completers that don't set a key are keyed by their data
+            data = shotgun_model.get_sanitized_data(
+                model_index, SearchCompleter.SG_DATA_ROLE
+            )
+            if not data:
+                return None
+            result_key = repr(sorted(data.items()))
+
+        key = (result_key, self._text)
+        entry = self._result_text_cache.pop(key, None)
+        if entry is None:
+            if data is None:
+                data = shotgun_model.get_sanitized_data(
+                    model_index, SearchCompleter.SG_DATA_ROLE
+                )
+            entry = [self._format_result(data), None]
+        self._result_text_cache[key] = entry
+
+        while len(self._result_text_cache) > self.RESULT_TEXT_CACHE_SIZE:
+            self._result_text_cache.popitem(last=False)
+
+        return entry
+
+    def _get_result_document(self, model_index, width, font):
+        """
+        Returns the laid out text document of a result from the model.
+
+        :param model_index: Index of the result.
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+        :param int width: The width to lay the text out for.
+        :param font: The default font of the text.
+        :type font: :class:`~PySide.QtGui.QFont`
+
+        :returns: The text document or ``None`` if the result has no data.
+        :rtype: :class:`~PySide.QtGui.QTextDocument`
+        """
+        entry = self._get_result_text(model_index)
+        if not entry:
+            return None
+
+        document = entry[1]
+        if document is None:
+            document = QtGui.QTextDocument()
+            document.setDocumentMargin(0)
+            document.setDefaultFont(font)
+            document.setHtml(entry[0])
+            entry[1] = document
+
+        # only lay the text out again if the width has changed
+        if document.textWidth() != width:
+            document.setTextWidth(width)
+
+        return document
+
+    def _format_result(self, data):
+        """
+        Formats a result from the model as rich text.
+
+        Derived classes are expected to implement this method.
+
+        :param dict data: The Shotgun data stored for the result.
+
+        :returns: The rich text to display for the result.
+        :rtype: str
+        """
+        raise NotImplementedError
+
     def _underline_search_term(self, matching):
         """
         Generates a text string with the searched text underlined.
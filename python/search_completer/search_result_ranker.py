@@ -0,0 +1,225 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import re
+
+import sgtk
+
+settings = sgtk.platform.import_framework("tk-framework-shotgunutils", "settings")
+
+
+class SearchResultRanker(object):
+    """
+    Scores the matches of a global search by relevance, so that the most
+    relevant matches are listed first.
+
+    A match's score is the sum of:
+
+    - How well its name matches the searched text: an exact match scores
+      higher than a prefix match, which scores higher than a match at the start
+      of a word, which scores higher than a match anywhere in the name.
+    - The weight of its entity type.
+    - How recently the user selected it, if it is one of the user's recent
+      selections. Recent selections are stored in the user's settings.
+    - Whether it belongs to the current project.
+
+    Scoring is done by a function built once per searched text with
+    :meth:`get_scorer`, so that ranking a few hundred matches per keystroke
+    only costs a few string comparisons per match.
+    """
+
+    # scores for how the searched text matches a name. the word and substring
+    # scores are shared between the words of the text.
+    EXACT_MATCH_SCORE = 100
+    PREFIX_MATCH_SCORE = 60
+    WORD_MATCH_SCORE = 30
+    SUBSTRING_MATCH_SCORE = 10
+
+    # score given to an entity type of weight 1.0
+    ENTITY_TYPE_SCORE = 20
+
+    # default weights of the entity types. types that aren't listed have a
+    # weight of DEFAULT_ENTITY_TYPE_WEIGHT
+    DEFAULT_ENTITY_TYPE_WEIGHTS = {
+        "Shot": 1.0,
+        "Asset": 1.0,
+        "Sequence": 0.9,
+        "Project": 0.9,
+        "Task": 0.8,
+        "Version": 0.7,
+        "PublishedFile": 0.6,
+        "HumanUser": 0.6,
+        "ClientUser": 0.3,
+        "Group": 0.3,
+        "ApiUser": 0.1,
+    }
+    DEFAULT_ENTITY_TYPE_WEIGHT = 0.5
+
+    # score of the most recent selection. older selections score less.
+    RECENT_SELECTION_SCORE = 25
+    MAX_RECENT_SELECTIONS = 50
+
+    # score for matches in the current project
+    PROJECT_AFFINITY_SCORE = 15
+
+    # key the recent selections are stored under in the user's settings
+    RECENT_SELECTIONS_SETTINGS_KEY = "search_completer_recent_selections"
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._bundle = sgtk.platform.current_bundle()
+        self._settings = settings.UserSettings(self._bundle)
+
+        self._entity_type_weights = dict(self.DEFAULT_ENTITY_TYPE_WEIGHTS)
+
+        # the user's recent selections, most recent first, and their scores
+        # keyed by (entity type, entity id). loaded on first use.
+        self._recent_selections = None
+        self._recent_scores = {}
+
+    def _get_entity_type_weights(self):
+        """
+        Dictionary of entity types and their weights. A weight of ``1.0`` adds
+        ``ENTITY_TYPE_SCORE`` to a match's score.
+        """
+        return self._entity_type_weights
+
+    def _set_entity_type_weights(self, weights):
+        self._entity_type_weights = dict(weights)
+
+    entity_type_weights = property(_get_entity_type_weights, _set_entity_type_weights)
+
+    def record_selection(self, entity_type, entity_id):
+        """
+        Records that the user selected an entity, which ranks it higher in
+        later searches.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        """
+        self._load_recent_selections()
+
+        selection = [entity_type, entity_id]
+        if selection in self._recent_selections:
+            self._recent_selections.remove(selection)
+        self._recent_selections.insert(0, selection)
+        del self._recent_selections[self.MAX_RECENT_SELECTIONS :]
+        self._update_recent_scores()
+
+        self._settings.store(
+            self.RECENT_SELECTIONS_SETTINGS_KEY,
+            self._recent_selections,
+            scope=settings.UserSettings.SCOPE_SITE,
+        )
+
+    def get_scorer(self, text):
+        """
+        Returns a function scoring matches for the supplied text.
+
+        :param str text: Text that was searched for.
+
+        :returns: A function taking a text search match dictionary and
+            returning its score.
+        """
+        self._load_recent_selections()
+
+        text = (text or "").lower().strip()
+        words = text.split()
+        word_patterns = [
+            re.compile(r"(?:^|[\W_])" + re.escape(word), re.UNICODE) for word in words
+        ]
+        word_score = float(self.WORD_MATCH_SCORE) / max(1, len(words))
+        substring_score = float(self.SUBSTRING_MATCH_SCORE) / max(1, len(words))
+
+        type_scores = dict(
+            (entity_type, self.ENTITY_TYPE_SCORE * weight)
+            for (entity_type, weight) in self._entity_type_weights.items()
+        )
+        default_type_score = self.ENTITY_TYPE_SCORE * self.DEFAULT_ENTITY_TYPE_WEIGHT
+
+        project_id = None
+        if self._bundle.context.project:
+            project_id = self._bundle.context.project["id"]
+
+        recent_scores = self._recent_scores
+
+        def score(match):
+            name = (match.get("name") or "").lower()
+            if name == text:
+                value = self.EXACT_MATCH_SCORE
+            elif name.startswith(text):
+                value = self.PREFIX_MATCH_SCORE
+            else:
+                value = 0
+                for (word, pattern) in zip(words, word_patterns):
+                    if word not in name:
+                        continue
+                    if pattern.search(name):
+                        value += word_score
+                    else:
+                        value += substring_score
+
+            value += type_scores.get(match.get("type"), default_type_score)
+            value += recent_scores.get((match.get("type"), match.get("id")), 0)
+            if project_id and match.get("project_id") == project_id:
+                value += self.PROJECT_AFFINITY_SCORE
+            return value
+
+        return score
+
+    def rank(self, matches, text):
+        """
+        Returns the supplied matches ordered by decreasing score. Matches with
+        the same score keep their order.
+
+        :param list matches: Text search match dictionaries.
+        :param str text: Text that was searched for.
+
+        :returns: A new list of the matches.
+        """
+        score = self.get_scorer(text)
+        return sorted(matches, key=lambda match: -score(match))
+
+    def _load_recent_selections(self):
+        """
+        Loads the user's recent selections from their settings, if they haven't
+        been loaded yet.
+        """
+        if self._recent_selections is not None:
+            return
+
+        recent_selections = self._settings.retrieve(
+            self.RECENT_SELECTIONS_SETTINGS_KEY,
+            default=[],
+            scope=settings.UserSettings.SCOPE_SITE,
+        )
+        self._recent_selections = [
+            list(selection)
+            for selection in recent_selections or []
+            if isinstance(selection, (list, tuple)) and len(selection) == 2
+        ]
+        self._update_recent_scores()
+
+    def _update_recent_scores(self):
+        """
+        Updates the scores of the recent selections, decreasing with their age.
+        """
+        count = len(self._recent_selections)
+        self._recent_scores = dict(
+            (
+                (entity_type, entity_id),
+                self.RECENT_SELECTION_SCORE * float(count - position) / count,
+            )
+            for (position, (entity_type, entity_id)) in enumerate(
+                self._recent_selections
+            )
+        )
@@ -8,5 +8,7 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+from .shotgun_field_edit_queue import ShotgunFieldEditQueue
 from .shotgun_field_manager import ShotgunFieldManager
 from .shotgun_field_meta import ShotgunFieldMeta
+from .shotgun_field_worker_pool import ShotgunFieldWorkerPool
@@ -161,12 +161,15 @@ class BubbleEditWidget(QtGui.QTextEdit):
 
         super(BubbleEditWidget, self).__init__(parent)
 
-        self._char_formats = {}
+        # position in the document of each bubble's replacement character,
+        # keyed by bubble id. kept up to date as the document changes.
+        self._bubble_positions = {}
 
         self._bubble_text_object = _BubbleTextObject(self)
         self.document().documentLayout().registerHandler(
             _BubbleTextObject.OBJECT_TYPE, self._bubble_text_object
         )
+        self.document().contentsChange.connect(self._on_contents_change)
 
         self.setMouseTracking(True)
         self.viewport().installEventFilter(self)
@@ -190,13 +193,11 @@ class BubbleEditWidget(QtGui.QTextEdit):
             self._bubble_text_object.BUBBLE_DATA_PROPERTY, bubble_id
         )
 
-        # keep a reference to the char format so that we can map a cursor to this
-        # bubble later on
-        self._char_formats[bubble_id] = char_format
-
         bubble.remove_clicked.connect(lambda: self.remove_bubble(bubble_id))
 
-        # insert the bubble character into the text editor and char format it properly
+        # insert the bubble character into the text editor and char format it
+        # properly. the bubble's position is indexed when the document reports
+        # the change.
         cursor = self.textCursor()
         cursor.beginEditBlock()
         cursor.insertText(self._OBJECT_REPLACEMENT_CHAR, char_format)
@@ -209,10 +210,9 @@ class BubbleEditWidget(QtGui.QTextEdit):
         """
         Clears all bubbles from the editor.
         """
-        for char_format in self._char_formats.values():
-            del char_format
         self._bubble_text_object.clear()
         super(BubbleEditWidget, self).clear()
+        self._bubble_positions = {}
 
     def clear_typed_text(self):
         """
@@ -297,62 +297,26 @@ class BubbleEditWidget(QtGui.QTextEdit):
         :rtype: :class:`.BubbleWidget`
         """
 
-        if not bubble_id in self._char_formats:
+        if bubble_id not in self._bubble_positions:
             return None
 
-        text = self.toPlainText()
-        cursor = self.textCursor()
-
-        # loop over each character until a replacement character with a known
-        # char format that matches the supplied id is found.
-        for i in range(0, len(text)):
-            if text[i] != self._OBJECT_REPLACEMENT_CHAR:
-                continue
-
-            cursor.setPosition(i + 1, QtGui.QTextCursor.MoveAnchor)
-            char_format = cursor.charFormat()
-
-            if self._char_formats[bubble_id] != char_format:
-                continue
-
-            # bubble is in the text
-            return self._bubble_text_object.get_bubble(bubble_id)
-
-        return None
+        # bubble is in the text
+        return self._bubble_text_object.get_bubble(bubble_id)
 
     def get_bubbles(self):
         """
-        Similar to ``get_bubble``, but returns all bubble widgets.
+        Similar to ``get_bubble``, but returns all bubble widgets in the order
+        they appear in the editor.
 
         :return: List of :class:`.BubbleWidget` classes
         :rtype: list
         """
 
-        text = self.toPlainText()
-        cursor = self.textCursor()
-
-        char_formats = []
-        bubbles = []
-
-        # find char formats for bubbles in the text editor
-        for i in range(0, len(text)):
-            if text[i] != self._OBJECT_REPLACEMENT_CHAR:
-                continue
-
-            cursor.setPosition(i + 1, QtGui.QTextCursor.MoveAnchor)
-            char_format = cursor.charFormat()
-
-            if not char_format in self._char_formats.values():
-                continue
-
-            char_formats.append(char_format)
-
-        # get the corresponding bubbles for each found char format
-        for bubble_id in self._char_formats:
-            if self._char_formats[bubble_id] in char_formats:
-                bubbles.append(self.get_bubble(bubble_id))
-
-        return bubbles
+        positions = self._bubble_positions
+        return [
+            self._bubble_text_object.get_bubble(bubble_id)
+            for bubble_id in sorted(positions, key=positions.get)
+        ]
 
     def get_typed_text(self):
         """
@@ -375,35 +339,61 @@ class BubbleEditWidget(QtGui.QTextEdit):
         :meth:`.add_bubble` method.
         """
 
-        if not self.get_bubble(bubble_id):
+        position = self._bubble_positions.get(bubble_id)
+        if position is None:
             return
 
-        text = self.toPlainText()
+        # select the bubble's object character and remove it. the index is
+        # updated when the document reports the change.
         cursor = self.textCursor()
+        cursor.beginEditBlock()
+        cursor.setPosition(position, QtGui.QTextCursor.MoveAnchor)
+        cursor.setPosition(position + 1, QtGui.QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.endEditBlock()
 
-        # locate the bubble by iterating over each character in the editor.
-        # when the match is found, remove it.
-        for i in range(0, len(text)):
-            if text[i] != self._OBJECT_REPLACEMENT_CHAR:
-                continue
+        self.update()
 
-            cursor.setPosition(i + 1, QtGui.QTextCursor.MoveAnchor)
-            char_format = cursor.charFormat()
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """
+        Keeps the bubble positions up to date as the document changes.
 
-            if self._char_formats[bubble_id] != char_format:
-                continue
+        :param int position: The position of the change in the document.
+        :param int chars_removed: The number of characters removed.
+        :param int chars_added: The number of characters added.
+        """
 
-            # we found the bubble's object character.
-            cursor.beginEditBlock()
-            cursor.movePosition(QtGui.QTextCursor.Left, QtGui.QTextCursor.KeepAnchor)
-            cursor.removeSelectedText()
-            cursor.endEditBlock()
+        removed_end = position + chars_removed
+        offset = chars_added - chars_removed
 
-            del self._char_formats[bubble_id]
+        # forget the bubbles in the removed range and shift those after it
+        for (bubble_id, bubble_position) in list(self._bubble_positions.items()):
+            if bubble_position < position:
+                continue
+            if bubble_position < removed_end:
+                del self._bubble_positions[bubble_id]
+            elif offset:
+                self._bubble_positions[bubble_id] = bubble_position + offset
 
-            self.update()
+        if not chars_added:
             return
 
+        # index any bubbles in the added range. formatting changes are reported
+        # as characters being removed and added again, so bubbles found here
+        # may have been forgotten above.
+        doc = self.document()
+        cursor = QtGui.QTextCursor(doc)
+        for i in range(position, position + chars_added):
+            if doc.characterAt(i) != self._OBJECT_REPLACEMENT_CHAR:
+                continue
+
+            cursor.setPosition(i + 1, QtGui.QTextCursor.MoveAnchor)
+            bubble_id = cursor.charFormat().property(
+                _BubbleTextObject.BUBBLE_DATA_PROPERTY
+            )
+            if self._bubble_text_object.get_bubble(bubble_id) is not None:
+                self._bubble_positions[bubble_id] = i
+
 
 class _BubbleTextObject(QtGui.QPyTextObject):
     """
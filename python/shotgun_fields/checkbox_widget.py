@@ -21,6 +21,7 @@ class CheckBoxWidget(QtGui.QCheckBox):
 
     _DISPLAY_TYPE = "checkbox"
     _EDITOR_TYPE = "checkbox"
+    _PAINT_VALUE = True
 
     def enable_editing(self, enable):
         """
@@ -33,6 +34,43 @@ class CheckBoxWidget(QtGui.QCheckBox):
         """
         self.setEnabled(enable)
 
+    def paint_value(self, painter, rect, value, option):
+        """
+        Paint the check box indicator directly without rendering the widget.
+
+        :param painter: The painter to paint with
+        :type painter: :class:`~PySide.QtGui.QPainter`
+        :param rect: The rectangle to paint into
+        :type rect: :class:`~PySide.QtCore.QRect`
+        :param bool value: The value to paint
+        :param option: The style options for the cell being painted
+        :type option: :class:`~PySide.QtGui.QStyleOptionViewItem`
+
+        :returns: ``True`` as the value can always be painted.
+        """
+        check_option = QtGui.QStyleOptionButton()
+        check_option.initFrom(self)
+
+        style = self.style()
+        width = style.pixelMetric(QtGui.QStyle.PM_IndicatorWidth, check_option, self)
+        height = style.pixelMetric(QtGui.QStyle.PM_IndicatorHeight, check_option, self)
+        margins = self.contentsMargins()
+        check_option.rect = QtCore.QRect(
+            rect.left() + margins.left(),
+            rect.top() + (rect.height() - height) // 2,
+            width,
+            height,
+        )
+        if value:
+            check_option.state |= QtGui.QStyle.State_On
+        else:
+            check_option.state |= QtGui.QStyle.State_Off
+
+        style.drawPrimitive(
+            QtGui.QStyle.PE_IndicatorCheckBox, check_option, painter, self
+        )
+        return True
+
     def setup_widget(self):
         """
         Prepare the widget for display.
@@ -22,6 +22,7 @@ class CurrencyWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "currency"
+    _PAINT_VALUE = True
 
     def _string_value(self, value):
         """
@@ -28,6 +28,7 @@ class DateWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "date"
+    _PAINT_VALUE = True
 
     def _display_value(self, value):
         """
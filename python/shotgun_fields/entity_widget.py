@@ -78,8 +78,9 @@ class EntityEditorWidget(global_search_widget.GlobalSearchWidget):
         """
         Prepare the widget for display.
 
-        Called by the metaclass during initialization. Sets the bg task manager
-        for the completer and sets the entity type(s) to be searched.
+        Called by the metaclass during initialization. Sets the worker pool or
+        bg task manager for the completer and sets the entity type(s) to be
+        searched.
         """
 
         sg_connection = self._bundle.sgtk.shotgun
@@ -87,7 +88,13 @@ class EntityEditorWidget(global_search_widget.GlobalSearchWidget):
         # TODO: remove this check and backward compatibility layer. added 09/16
         self._project_search_supported = check_project_search_supported(sg_connection)
 
-        self.set_bg_task_manager(self._bg_task_manager)
+        # send the searches through the field manager's worker pool, if any
+        if self._worker_pool:
+            self.set_data_retriever(
+                self._worker_pool.create_data_retriever(self.completer())
+            )
+        else:
+            self.set_bg_task_manager(self._bg_task_manager)
 
         self._types = shotgun_globals.get_valid_types(
             self._entity_type, self._field_name
@@ -22,6 +22,7 @@ class FloatWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "float"
+    _PAINT_VALUE = True
 
     def _string_value(self, value):
         """
@@ -54,7 +54,7 @@ class ImageWidget(QtGui.QLabel):
         """
         Clears the widget's knowledge of an external resource.
         """
-        self._task_uid = None
+        self._cancel_download()
         self._pixmap = None
         self._image_path = None
         if not self._delegate:
@@ -170,7 +170,7 @@ class ImageWidget(QtGui.QLabel):
         """
 
         # unset the task id so that we don't get overridden by running workers
-        self._task_uid = None
+        self._cancel_download()
 
         self._value = value
         if value is None:
@@ -201,6 +201,8 @@ class ImageWidget(QtGui.QLabel):
 
         self.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
 
+        self._task_uid = None
+
         if self._delegate:
             # in delegate mode. that means this widget is being used to display
             # multiple entity's image fields. so setting up a data retriever to
@@ -209,13 +211,15 @@ class ImageWidget(QtGui.QLabel):
         else:
             self._needs_download = True
 
+            # without the worker pool shared by the widgets of a field manager,
             # start up a data retriever to fetch the thumbnail in the background
-            self._data_retriever = shotgun_data.ShotgunDataRetriever(
-                bg_task_manager=self._bg_task_manager
-            )
-            self._data_retriever.start()
-            self._data_retriever.work_completed.connect(self._on_worker_signal)
-            self._data_retriever.work_failure.connect(self._on_worker_failure)
+            if not self._worker_pool:
+                self._data_retriever = shotgun_data.ShotgunDataRetriever(
+                    bg_task_manager=self._bg_task_manager
+                )
+                self._data_retriever.start()
+                self._data_retriever.work_completed.connect(self._on_worker_signal)
+                self._data_retriever.work_failure.connect(self._on_worker_failure)
 
         self.setSizePolicy(QtGui.QSizePolicy.Expanding, QtGui.QSizePolicy.Expanding)
 
@@ -322,13 +326,33 @@ class ImageWidget(QtGui.QLabel):
                 entity_id = self._entity.get("id")
                 entity_type = self._entity.get("type")
 
-            self._task_uid = self._data_retriever.request_thumbnail(
-                value, entity_type, entity_id, self._field_name, load_image=True
-            )
+            self._cancel_download()
+            if self._worker_pool:
+                self._task_uid = self._worker_pool.request_thumbnail(
+                    value,
+                    entity_type,
+                    entity_id,
+                    self._field_name,
+                    load_image=True,
+                    completed=self._on_thumbnail_loaded,
+                    failed=self._on_thumbnail_failed,
+                )
+            else:
+                self._task_uid = self._data_retriever.request_thumbnail(
+                    value, entity_type, entity_id, self._field_name, load_image=True
+                )
             self._needs_download = False
 
         self.value_changed.emit()
 
+    def _cancel_download(self):
+        """
+        Cancels the thumbnail download in progress, if any.
+        """
+        if self._task_uid is not None and self._worker_pool:
+            self._worker_pool.cancel(self._task_uid)
+        self._task_uid = None
+
     def _on_link_activated(self, url):
         """
         Handle a url being clicked in the widget display.
@@ -367,20 +391,42 @@ class ImageWidget(QtGui.QLabel):
         """
         On failure just display an error and set the toolkit to the error string.
         """
-        if uid == self._task_uid:
-            self.clear()
-            self.setText("Error loading image.")
-            self.setToolTip(msg)
+        self._on_thumbnail_failed(uid, msg)
 
     def _on_worker_signal(self, uid, request_type, data):
         """
         Handle the finished download by updating the image the label displays.
         """
-        if uid == self._task_uid:
-            image = data["image"]
-            self._image_path = data["thumb_path"]
-            pixmap = QtGui.QPixmap.fromImage(image)
-            self.setPixmap(pixmap)
+        self._on_thumbnail_loaded(uid, data)
+
+    def _on_thumbnail_failed(self, uid, msg):
+        """
+        Display an error when the thumbnail could not be downloaded.
+
+        :param uid: Id of the download request.
+        :param str msg: Error message.
+        """
+        if uid != self._task_uid:
+            return
+        self._task_uid = None
+        self.clear()
+        self.setText("Error loading image.")
+        self.setToolTip(msg)
+
+    def _on_thumbnail_loaded(self, uid, data):
+        """
+        Display the thumbnail once it has been downloaded.
+
+        :param uid: Id of the download request.
+        :param dict data: The downloaded image and its path.
+        """
+        if uid != self._task_uid:
+            return
+        self._task_uid = None
+        image = data["image"]
+        self._image_path = data["thumb_path"]
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self.setPixmap(pixmap)
 
     def _replace_image(self):
         """
@@ -13,12 +13,95 @@ Widget that represents a Shotgun value that can be directly displayed in a QLabe
 """
 
 import sgtk
-from sgtk.platform.qt import QtGui
+from sgtk.platform.qt import QtCore, QtGui
 
 elided_label = sgtk.platform.current_bundle().import_module("elided_label")
 
 
-class LabelBaseWidget(QtGui.QLabel):
+class _LabelPaintMixin(object):
+    """
+    Paints the values of label based display widgets directly, the same way the
+    label would display them, so that field delegates don't need to render the
+    widget.
+    """
+
+    # whether field delegates paint values with paint_value(). display classes
+    # whose values are displayed with _string_value() set this to True.
+    _PAINT_VALUE = False
+
+    def paint_value(self, painter, rect, value, option):
+        """
+        Paint the value directly without rendering the widget.
+
+        :param painter: The painter to paint with
+        :type painter: :class:`~PySide.QtGui.QPainter`
+        :param rect: The rectangle to paint into
+        :type rect: :class:`~PySide.QtCore.QRect`
+        :param value: The value to paint
+        :param option: The style options for the cell being painted
+        :type option: :class:`~PySide.QtGui.QStyleOptionViewItem`
+
+        :returns: ``True`` if the value was painted, ``False`` if the widget
+            should be rendered instead.
+        """
+        if value is None:
+            # nothing to display!
+            return True
+        return self._paint_text(painter, rect, self._string_value(value))
+
+    def _paint_text(self, painter, rect, text, swatch_color=None):
+        """
+        Paint plain text into the rect using the label's font, palette,
+        alignment and margins, eliding it if it doesn't fit. Rich text can't be
+        painted this way so is left for the label to render.
+
+        :param painter: The painter to paint with
+        :type painter: :class:`~PySide.QtGui.QPainter`
+        :param rect: The rectangle to paint into
+        :type rect: :class:`~PySide.QtCore.QRect`
+        :param str text: The text to paint
+        :param swatch_color: Optional color of a swatch to paint before the text
+        :type swatch_color: :class:`~PySide.QtGui.QColor`
+
+        :returns: ``True`` if the text was painted, ``False`` if it looks like
+            rich text and needs to be rendered by the widget.
+        """
+        if "<" in text or "&" in text:
+            # (probably) rich text so let the label render it
+            return False
+
+        margins = self.contentsMargins()
+        margin = self.margin()
+        text_rect = rect.adjusted(
+            margins.left() + margin,
+            margins.top() + margin,
+            -(margins.right() + margin),
+            -(margins.bottom() + margin),
+        )
+        alignment = self.alignment()
+        font = self.font()
+        font_metrics = QtGui.QFontMetrics(font)
+        painter.setFont(font)
+
+        if swatch_color:
+            # paint a full block character in the swatch color followed by a space,
+            # matching the way status colors are displayed by the label:
+            swatch = u"\u2588 "
+            painter.setPen(swatch_color)
+            painter.drawText(text_rect, alignment, swatch)
+            if hasattr(font_metrics, "horizontalAdvance"):
+                swatch_width = font_metrics.horizontalAdvance(swatch)
+            else:
+                swatch_width = font_metrics.width(swatch)
+            text_rect.setLeft(text_rect.left() + swatch_width)
+
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        text = font_metrics.elidedText(text, QtCore.Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, alignment, text)
+        return True
+
+
+class LabelBaseWidget(_LabelPaintMixin, QtGui.QLabel):
     """
     Display any Shotgun field value than can be directly rendered as a string.
     """
@@ -56,7 +139,7 @@ class LabelBaseWidget(QtGui.QLabel):
         return str(value)
 
 
-class ElidedLabelBaseWidget(elided_label.ElidedLabel):
+class ElidedLabelBaseWidget(_LabelPaintMixin, elided_label.ElidedLabel):
     """
     Display any Shotgun field value than can be directly rendered as a string.
     """
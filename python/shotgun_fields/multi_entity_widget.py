@@ -204,7 +204,13 @@ class MultiEntityEditorWidget(BubbleEditWidget):
                 valid_types[entity_type] = []
 
         self._completer = global_search_completer.GlobalSearchCompleter()
-        self._completer.set_bg_task_manager(self._bg_task_manager)
+        # send the searches through the field manager's worker pool, if any
+        if self._worker_pool:
+            self._completer.set_data_retriever(
+                self._worker_pool.create_data_retriever(self._completer)
+            )
+        else:
+            self._completer.set_bg_task_manager(self._bg_task_manager)
         self._completer.set_searchable_entity_types(valid_types)
         self._completer.setWidget(self)
 
@@ -22,6 +22,7 @@ class NumberWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "number"
+    _PAINT_VALUE = True
 
     def _string_value(self, value):
         """
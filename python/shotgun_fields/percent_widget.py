@@ -23,6 +23,7 @@ class PercentWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "percent"
+    _PAINT_VALUE = True
 
     def _string_value(self, value):
         """
@@ -44,6 +44,7 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
         view,
         bg_task_manager=None,
         field_data_role=QtCore.Qt.EditRole,
+        field_manager=None,
     ):
         """
         Constructor
@@ -69,6 +70,11 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
 
         :param int field_data_role: The data role that stores SG field data in
             the model where this delegate is to be used.
+
+        :param field_manager: Optional field manager. If this is passed in, the
+            painter widget is shared with the other delegates of the view that
+            use the same display class.
+        :type field_manager: :class:`~shotgun_fields.ShotgunFieldManager`
         """
         views.WidgetDelegate.__init__(self, view)
 
@@ -80,6 +86,7 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
         self._display_class = display_class
         self._editor_class = editor_class
         self._bg_task_manager = bg_task_manager
+        self._field_manager = field_manager
 
     @property
     def field_data_role(self):
@@ -89,6 +96,20 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
         """
         return self._field_data_role
 
+    @property
+    def paint_cacheable(self):
+        """
+        Whether the rendered cells are worth caching with
+        :meth:`~views.WidgetDelegate.enable_paint_cache`. This is the case when
+        the display widget is rendered rather than painting the value itself,
+        and everything it shows comes from the cell's data. Image widgets are
+        excluded as they download their thumbnail in the background.
+        """
+        return (
+            not getattr(self._display_class, "_PAINT_VALUE", False)
+            and getattr(self._display_class, "_DISPLAY_TYPE", None) != "image"
+        )
+
     def paint(self, painter, style_options, model_index):
         """
         Paint method to handle all cells that are not being currently edited.
@@ -98,6 +119,26 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
         :param model_index: The index in the data model that needs to be painted
         """
 
+        # simple display widgets can paint the value directly which is much
+        # faster than populating the widget and rendering it. the display class
+        # is checked first so other widgets don't pay for fetching the value.
+        widget = None
+        if getattr(self._display_class, "_PAINT_VALUE", False):
+            widget = self._get_painter_widget(model_index, self.view)
+        if widget:
+            src_index = _map_to_source(model_index)
+            if src_index and src_index.isValid():
+                value = self._get_model_value(src_index)
+                painter.save()
+                try:
+                    painted = widget.paint_value(
+                        painter, style_options.rect, value, style_options
+                    )
+                finally:
+                    painter.restore()
+                if painted:
+                    return
+
         # let the base class do all the heavy lifting
         super(ShotgunFieldDelegateGeneric, self).paint(
             painter, style_options, model_index
@@ -108,6 +149,38 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
         widget = self._get_painter_widget(model_index, self.view)
         widget.set_value(None)
 
+    def _get_painter_widget(self, model_index, parent):
+        """
+        Return a widget that can be used to paint the specified model index.
+        When the delegate has a field manager, the widget is shared with the
+        other delegates painting in the same view.
+
+        :param model_index: The index of the item in the model to return a widget for
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+        :param parent: The parent view that the widget should be parented to
+        :type parent: :class:`~PySide.QtGui.QWidget`
+
+        :returns: A QWidget to be used for painting the current index
+        :rtype: :class:`~PySide.QtGui.QWidget`
+        """
+        if not self._field_manager:
+            return super(ShotgunFieldDelegateGeneric, self)._get_painter_widget(
+                model_index, parent
+            )
+
+        if not model_index.isValid():
+            return None
+
+        widget = self._field_manager.get_painter_widget(
+            self._display_class, parent, self._create_widget
+        )
+        if widget:
+            # the widget may have been created for another field, so point it
+            # at this delegate's field before it is used
+            widget.set_field(self._entity_type, self._field_name)
+
+        return widget
+
     def _create_widget(self, parent):
         """
         Creates a widget to use for the delegate.
@@ -376,8 +449,19 @@ class ShotgunFieldDelegateGeneric(views.WidgetDelegate):
             # invalid index, do nothing
             return
 
+        widget.set_value(self._get_model_value(src_index))
+
+    def _get_model_value(self, src_index):
+        """
+        Returns the field value stored in the supplied source model index.
+
+        :param src_index: The index of the source model where the data comes from
+        :type src_index: :class:`~PySide.QtCore.QModelIndex`
+
+        :returns: The sanitized field value
+        """
         value = src_index.data(self.field_data_role)
-        widget.set_value(shotgun_model.sanitize_qt(value))
+        return shotgun_model.sanitize_qt(value)
 
 
 class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
@@ -385,8 +469,18 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
     A delegate for a given type of Shotgun field. This delegate is designed to
     work with indexes from a ``ShotgunModel`` where the value of the field is
     stored in the ``SG_ASSOCIATED_FIELD_ROLE`` role.
+
+    When an ``edit_queue`` is set, edits are also written back to Shotgun. The
+    model is updated right away and the edit is queued, so that edits made to
+    many rows in quick succession are sent to Shotgun as a single batch in the
+    background. Cells whose edit could not be written are marked in the view,
+    with the error available as a tooltip. The errors are kept by the edit
+    queue, so they outlive the delegate.
     """
 
+    # size of the marker painted in the corner of cells with failed edits
+    EDIT_ERROR_MARKER_SIZE = 7
+
     def __init__(
         self,
         sg_entity_type,
@@ -395,6 +489,8 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
         editor_class,
         view,
         bg_task_manager=None,
+        edit_queue=None,
+        field_manager=None,
     ):
         """
         Constructor
@@ -417,6 +513,15 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
         :param bg_task_manager: Optional Task manager.  If this is not passed in
             one will be created when the delegate widget is created.
         :type bg_task_manager: :class:`~task_manager.BackgroundTaskManager`
+
+        :param edit_queue: Optional queue used to write edits back to Shotgun.
+            If this is not passed in, edits only update the model.
+        :type edit_queue: :class:`~shotgun_fields.ShotgunFieldEditQueue`
+
+        :param field_manager: Optional field manager. If this is passed in, the
+            painter widget is shared with the other delegates of the view that
+            use the same display class.
+        :type field_manager: :class:`~shotgun_fields.ShotgunFieldManager`
         """
 
         field_data_role = shotgun_model.ShotgunModel.SG_ASSOCIATED_FIELD_ROLE
@@ -429,8 +534,95 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
             view,
             bg_task_manager=bg_task_manager,
             field_data_role=field_data_role,
+            field_manager=field_manager,
         )
 
+        self._edit_queue = None
+        self.edit_queue = edit_queue
+
+    def _get_edit_queue(self):
+        """
+        The :class:`~shotgun_fields.ShotgunFieldEditQueue` used to write edits
+        back to Shotgun, or ``None`` if edits only update the model.
+        """
+        return self._edit_queue
+
+    def _set_edit_queue(self, edit_queue):
+        if self._edit_queue:
+            self._edit_queue.update_completed.disconnect(self._on_update_completed)
+            self._edit_queue.update_failed.disconnect(self._on_update_failed)
+
+        self._edit_queue = edit_queue
+
+        if self._edit_queue:
+            self._edit_queue.update_completed.connect(self._on_update_completed)
+            self._edit_queue.update_failed.connect(self._on_update_failed)
+
+    edit_queue = property(_get_edit_queue, _set_edit_queue)
+
+    def paint(self, painter, style_options, model_index):
+        """
+        Paint method to handle all cells that are not being currently edited.
+        Cells whose edit could not be written to Shotgun are marked in their
+        top right corner.
+
+        :param painter: The painter instance to use when painting
+        :param style_options: The style options to use when painting
+        :param model_index: The index in the data model that needs to be painted
+        """
+        super(ShotgunFieldDelegate, self).paint(painter, style_options, model_index)
+
+        if self._has_edit_errors() and self._get_edit_error(model_index):
+            rect = style_options.rect
+            size = self.EDIT_ERROR_MARKER_SIZE
+            marker = QtGui.QPolygon(
+                [
+                    QtCore.QPoint(rect.right() - size, rect.top()),
+                    QtCore.QPoint(rect.right() + 1, rect.top()),
+                    QtCore.QPoint(rect.right() + 1, rect.top() + size + 1),
+                ]
+            )
+            painter.save()
+            try:
+                painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+                painter.setPen(QtCore.Qt.NoPen)
+                painter.setBrush(QtGui.QColor(QtCore.Qt.red))
+                painter.drawPolygon(marker)
+            finally:
+                painter.restore()
+
+    def helpEvent(self, event, view, option, index):
+        """
+        Shows the error message as a tooltip for cells whose edit could not be
+        written to Shotgun.
+
+        :param event: The help event.
+        :type event: :class:`~PySide.QtGui.QHelpEvent`
+        :param view: The view the event occurred in.
+        :param option: Options for rendering the item.
+        :param index: The index of the item the event occurred on.
+        :type index: :class:`~PySide.QtCore.QModelIndex`
+
+        :returns: ``True`` if the event was handled, ``False`` otherwise.
+        """
+        if event.type() == QtCore.QEvent.ToolTip and self._has_edit_errors():
+            error = self._get_edit_error(index)
+            if error:
+                QtGui.QToolTip.showText(
+                    event.globalPos(),
+                    "Unable to save %s: %s"
+                    % (
+                        shotgun_globals.get_field_display_name(
+                            self._entity_type, self._field_name
+                        ),
+                        error,
+                    ),
+                    view,
+                )
+                return True
+
+        return super(ShotgunFieldDelegate, self).helpEvent(event, view, option, index)
+
     def setModelData(self, editor, model, index):
         """
         Gets data from the editor widget and stores it in the specified model at
@@ -482,6 +674,66 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
                 "Unable to set model data for widget delegate: %s, %s"
                 % (self._entity_type, self._field_name)
             )
+            return
+
+        if self._edit_queue:
+            # the model now shows the new value, write it to Shotgun behind it
+            sg_data = shotgun_model.get_sg_data(src_index)
+            if sg_data and sg_data.get("id"):
+                self._edit_queue.queue_update(
+                    self._entity_type, sg_data["id"], {self._field_name: new_value}
+                )
+
+    def _has_edit_errors(self):
+        """
+        Whether any edit written through the edit queue failed.
+        """
+        return bool(self._edit_queue and self._edit_queue.has_errors)
+
+    def _get_edit_error(self, model_index):
+        """
+        Returns the error message of the failed edit for the supplied index.
+
+        :param model_index: The index to get the error for
+        :type model_index: :class:`~PySide.QtCore.QModelIndex`
+
+        :returns: The error message or ``None`` if there was no failed edit.
+        """
+        sg_data = shotgun_model.get_sg_data(model_index)
+        if not sg_data or not self._edit_queue:
+            return None
+        return self._edit_queue.get_error(
+            self._entity_type, sg_data.get("id"), self._field_name
+        )
+
+    def _on_update_completed(self, entity_type, entity_id, data):
+        """
+        Called when the edit queue has written an update to Shotgun. The mark
+        of a previous failure is removed from the edited cell.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: The field values that were written
+        """
+        if entity_type != self._entity_type or self._field_name not in data:
+            return
+
+        self.view.viewport().update()
+
+    def _on_update_failed(self, entity_type, entity_id, data, message):
+        """
+        Called when the edit queue failed to write an update to Shotgun. The
+        edited cell is marked as having failed.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: The field values that failed to be written
+        :param str message: The error message
+        """
+        if entity_type != self._entity_type or self._field_name not in data:
+            return
+
+        self.view.viewport().update()
 
     def _set_widget_value(self, widget, model_index):
         """
@@ -508,8 +760,7 @@ class ShotgunFieldDelegate(ShotgunFieldDelegateGeneric):
                 widget.set_value(icon.pixmap(QtCore.QSize(256, 256)))
             return
 
-        value = src_index.data(self.field_data_role)
-        widget.set_value(shotgun_model.sanitize_qt(value))
+        widget.set_value(self._get_model_value(src_index))
 
 
 def _map_to_source(idx, recursive=True):
@@ -0,0 +1,382 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import threading
+
+import sgtk
+from sgtk.platform.qt import QtCore
+
+shotgun_data = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_data"
+)
+shotgun_model = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_model"
+)
+
+
+class ShotgunFieldEditQueue(QtCore.QObject):
+    """
+    Collects edits of Shotgun field values and writes them to Shotgun in the
+    background.
+
+    Edits are not sent right away. Edits queued within ``flush_interval``
+    milliseconds of each other are coalesced: successive edits to the same
+    entity are merged into a single update, and all of the pending updates are
+    sent to Shotgun in a single ``batch()`` call. Only one batch is in flight at
+    a time so that edits are applied in the order they were made.
+
+    Failed batches are retried. If a batch containing several updates still
+    fails, each update is retried on its own so that the failure can be
+    attributed to the entities it belongs to. The error of an update that
+    failed is kept for each of its fields until the field is edited again or
+    written successfully, so that views can show it for as long as it applies.
+
+    :signals:
+        ``update_completed(str, int, object)`` - Fires when the update of an
+        entity has been written to Shotgun. The arguments are the entity type,
+        the entity id and the dictionary of field values that were written.
+
+        ``update_failed(str, int, object, str)`` - Fires when the update of an
+        entity could not be written to Shotgun. The arguments are the entity
+        type, the entity id, the dictionary of field values and the error
+        message.
+    """
+
+    # default time to wait for more edits before sending them, in milliseconds
+    DEFAULT_FLUSH_INTERVAL = 250
+
+    # default number of times a failed batch is retried
+    DEFAULT_MAX_RETRIES = 2
+
+    update_completed = QtCore.Signal(str, int, object)
+    update_failed = QtCore.Signal(str, int, object, str)
+
+    def __init__(
+        self,
+        parent=None,
+        bg_task_manager=None,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_retries=DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Constructor
+
+        :param parent: Parent object
+        :type parent: :class:`~PySide.QtCore.QObject`
+        :param bg_task_manager: Optional Task manager. If this is not passed in
+            the data retriever will create its own.
+        :type bg_task_manager: :class:`~task_manager.BackgroundTaskManager`
+        :param int flush_interval: Time to wait for more edits before sending
+            the queued edits to Shotgun, in milliseconds.
+        :param int max_retries: Number of times a failed batch is retried.
+        """
+        super(ShotgunFieldEditQueue, self).__init__(parent)
+
+        self._max_retries = max_retries
+
+        # field values waiting to be sent, keyed by (entity type, entity id)
+        self._pending = collections.OrderedDict()
+
+        # updates split out of a failed batch, waiting to be sent on their own
+        self._split_requests = collections.deque()
+
+        # the batch currently being processed: (uid, requests, attempt, state)
+        # where state tracks whether the batch has started running and whether
+        # it has been cancelled
+        self._in_flight = None
+        self._state_lock = threading.Lock()
+
+        # error messages of the updates that failed, keyed by (entity type,
+        # entity id, field name)
+        self._errors = {}
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self._sg_data_retriever = shotgun_data.ShotgunDataRetriever(
+            self, bg_task_manager=bg_task_manager
+        )
+        self._sg_data_retriever.start()
+        self._sg_data_retriever.work_completed.connect(self._on_worker_signal)
+        self._sg_data_retriever.work_failure.connect(self._on_worker_failure)
+
+    ############################################################################
+    # public methods
+
+    def queue_update(self, entity_type, entity_id, data):
+        """
+        Queues an update of the supplied entity's field values.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: Dictionary of field names and their new values
+        """
+        self._pending.setdefault((entity_type, entity_id), {}).update(data)
+        self._clear_errors(entity_type, entity_id, data)
+
+        # (re)start the timer so that rapid successive edits end up in the
+        # same batch
+        self._flush_timer.start()
+
+    def flush(self):
+        """
+        Sends all of the queued edits to Shotgun in a single batch. If a batch
+        is already being processed, the edits are sent once it is done.
+        """
+        self._flush_timer.stop()
+
+        if self._in_flight or not self._sg_data_retriever:
+            return
+
+        if self._split_requests:
+            # these have already been retried as part of their batch
+            self._submit([self._split_requests.popleft()], self._max_retries)
+            return
+
+        if not self._pending:
+            return
+
+        self._submit(self._take_pending_requests(), 0)
+
+    def get_error(self, entity_type, entity_id, field_name):
+        """
+        Returns the error message of the failed update of the supplied field.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param str field_name: Shotgun field name
+
+        :returns: The error message or ``None`` if the field's last update
+            didn't fail.
+        """
+        return self._errors.get((entity_type, entity_id, field_name))
+
+    @property
+    def has_errors(self):
+        """
+        Whether the update of any field failed.
+        """
+        return bool(self._errors)
+
+    @property
+    def pending_count(self):
+        """
+        The number of entities with edits that have not yet been written to
+        Shotgun.
+        """
+        count = len(self._pending) + len(self._split_requests)
+        if self._in_flight:
+            count += len(self._in_flight[1])
+        return count
+
+    def destroy(self):
+        """
+        Should be called before the queue is discarded. Stopping the data
+        retriever drops the requests it hasn't run yet, so the queued edits,
+        including the batch in flight if it hasn't started running, are written
+        to Shotgun from the calling thread instead. A batch that is already
+        running is left to complete in the background.
+        """
+        self._flush_timer.stop()
+
+        requests = []
+        if self._in_flight:
+            state = self._in_flight[3]
+            with self._state_lock:
+                state["cancelled"] = True
+                started = state["started"]
+            if not started:
+                requests.extend(self._in_flight[1])
+            self._in_flight = None
+        requests.extend(self._split_requests)
+        self._split_requests.clear()
+        requests.extend(self._take_pending_requests())
+
+        if self._sg_data_retriever:
+            self._sg_data_retriever.stop()
+            self._sg_data_retriever.work_completed.disconnect(self._on_worker_signal)
+            self._sg_data_retriever.work_failure.disconnect(self._on_worker_failure)
+            self._sg_data_retriever = None
+
+        if requests:
+            self._write_now(requests)
+
+    ############################################################################
+    # protected methods
+
+    def _take_pending_requests(self):
+        """
+        Empties the queue of pending edits.
+
+        :returns: A list of Shotgun batch request dictionaries updating the
+            entities with pending edits.
+        """
+        requests = [
+            {
+                "request_type": "update",
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "data": data,
+            }
+            for ((entity_type, entity_id), data) in self._pending.items()
+        ]
+        self._pending = collections.OrderedDict()
+        return requests
+
+    def _submit(self, requests, attempt):
+        """
+        Submits the supplied batch requests to the data retriever.
+
+        :param list requests: Shotgun batch request dictionaries
+        :param int attempt: Number of times the requests have been tried so far
+        """
+        state = {"started": False, "cancelled": False}
+        uid = self._sg_data_retriever.execute_method(
+            self._execute_batch, {"requests": requests, "state": state}
+        )
+        self._in_flight = (uid, requests, attempt, state)
+
+    def _write_now(self, requests):
+        """
+        Writes the supplied batch requests to Shotgun from the calling thread.
+        If the batch fails, each update is tried on its own.
+
+        :param list requests: Shotgun batch request dictionaries
+        """
+        bundle = sgtk.platform.current_bundle()
+        try:
+            bundle.shotgun.batch(requests)
+        except Exception as e:
+            if len(requests) > 1:
+                for request in requests:
+                    self._write_now([request])
+                return
+
+            self._report_failure(requests[0], str(e))
+            return
+
+        for request in requests:
+            self._report_completion(request)
+
+    def _report_completion(self, request):
+        """
+        Forgets the errors of the fields written by the supplied request and
+        reports that it completed.
+
+        :param dict request: Shotgun batch request dictionary
+        """
+        self._clear_errors(
+            request["entity_type"], request["entity_id"], request["data"]
+        )
+        self.update_completed.emit(
+            request["entity_type"], request["entity_id"], request["data"]
+        )
+
+    def _report_failure(self, request, msg):
+        """
+        Records the error of the fields updated by the supplied request and
+        reports that it failed.
+
+        :param dict request: Shotgun batch request dictionary
+        :param str msg: Error message
+        """
+        sgtk.platform.current_bundle().log_warning(
+            "Unable to update %s %s in ShotGrid: %s"
+            % (request["entity_type"], request["entity_id"], msg)
+        )
+        for field_name in request["data"]:
+            self._errors[
+                (request["entity_type"], request["entity_id"], field_name)
+            ] = msg
+        self.update_failed.emit(
+            request["entity_type"], request["entity_id"], request["data"], msg
+        )
+
+    def _clear_errors(self, entity_type, entity_id, data):
+        """
+        Forgets the errors of the supplied fields.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: Dictionary of field names and values
+        """
+        if self._errors:
+            for field_name in data:
+                self._errors.pop((entity_type, entity_id, field_name), None)
+
+    def _execute_batch(self, sg, data):
+        """
+        Async callback called by the data retriever.
+        Note: This runs in a different thread and cannot access
+        any QT UI components.
+
+        :param sg: Shotgun instance
+        :param data: data dictionary passed in from _submit()
+        """
+        # the queue writes the batch itself if it is destroyed before the
+        # batch starts running
+        with self._state_lock:
+            if data["state"]["cancelled"]:
+                return None
+            data["state"]["started"] = True
+        return sg.batch(data["requests"])
+
+    def _on_worker_signal(self, uid, request_type, data):
+        """
+        Signaled whenever the worker completes something.
+
+        :param uid: Unique id for request
+        :param request_type: String identifying the request class
+        :param data: the data that was returned
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        if not self._in_flight or self._in_flight[0] != uid:
+            return
+
+        (_, requests, _, _) = self._in_flight
+        self._in_flight = None
+
+        for request in requests:
+            self._report_completion(request)
+
+        self.flush()
+
+    def _on_worker_failure(self, uid, msg):
+        """
+        Asynchronous callback - the worker thread errored.
+
+        :param uid: Unique id for request that failed
+        :param msg: Error message
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        if not self._in_flight or self._in_flight[0] != uid:
+            return
+
+        msg = shotgun_model.sanitize_qt(msg)
+        (_, requests, attempt, _) = self._in_flight
+        self._in_flight = None
+
+        if attempt < self._max_retries:
+            # try the whole batch again
+            self._submit(requests, attempt + 1)
+            return
+
+        if len(requests) > 1:
+            # Shotgun batches are all or nothing, so split the batch up to find
+            # out which of the updates are failing. The individual updates are
+            # sent ahead of any new edits.
+            self._split_requests.extend(requests)
+        else:
+            self._report_failure(requests[0], msg)
+
+        self.flush()
@@ -8,10 +8,14 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import weakref
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 from .shotgun_field_delegate import ShotgunFieldDelegateGeneric, ShotgunFieldDelegate
 from .shotgun_field_editable import ShotgunFieldEditable, ShotgunFieldNotEditable
+from .shotgun_field_edit_queue import ShotgunFieldEditQueue
+from .shotgun_field_worker_pool import ShotgunFieldWorkerPool
 
 shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
@@ -46,6 +50,9 @@ class ShotgunFieldManager(QtCore.QObject):
     # widget types enumeration
     _WIDGET_TYPES = (DISPLAY, EDITOR, EDITABLE) = ("display", "editor", "editable")
 
+    # default number of threads of the task manager created by the manager
+    DEFAULT_MAX_THREADS = 4
+
     ############################################################################
     # class methods
 
@@ -159,7 +166,13 @@ class ShotgunFieldManager(QtCore.QObject):
     ############################################################################
     # special methods
 
-    def __init__(self, parent, bg_task_manager=None):
+    def __init__(
+        self,
+        parent,
+        bg_task_manager=None,
+        max_threads=DEFAULT_MAX_THREADS,
+        max_requests_per_host=ShotgunFieldWorkerPool.DEFAULT_MAX_REQUESTS_PER_HOST,
+    ):
         """
         Initialize the field manager factory.
 
@@ -168,11 +181,23 @@ class ShotgunFieldManager(QtCore.QObject):
         :param bg_task_manager: Optional Task manager.  If this is not passed in one will be created
                 when the object is initialized.
         :type bg_task_manager: :class:`~task_manager.BackgroundTaskManager`
+        :param int max_threads: Number of threads of the task manager created
+                when none is passed in.
+        :param int max_requests_per_host: Maximum number of requests the field
+                widgets have in flight to the same host.
         """
         QtCore.QObject.__init__(self, parent)
 
         self._task_manager = bg_task_manager
+        self._max_threads = max_threads
+        self._max_requests_per_host = max_requests_per_host
         self._initialized = False
+        self._edit_queue = None
+        self._worker_pool = None
+
+        # painter widgets shared by the delegates of a view, keyed by the
+        # widget class and the id of the view
+        self._painter_widgets = {}
 
     def __del__(self):
         """
@@ -183,9 +208,57 @@ class ShotgunFieldManager(QtCore.QObject):
         if self._initialized:
             shotgun_globals.unregister_bg_task_manager(self._task_manager)
 
+    ############################################################################
+    # properties
+
+    @property
+    def edit_queue(self):
+        """
+        The :class:`ShotgunFieldEditQueue` used to write field edits to Shotgun
+        in the background. It is created on first access and shares the
+        manager's background task manager.
+        """
+        if self._edit_queue is None:
+            self._edit_queue = ShotgunFieldEditQueue(
+                self, bg_task_manager=self._task_manager
+            )
+        return self._edit_queue
+
+    @property
+    def worker_pool(self):
+        """
+        The :class:`ShotgunFieldWorkerPool` running the background requests,
+        such as thumbnail downloads, of all of the widgets created by the
+        manager. It is created on first access and shares the manager's
+        background task manager, so it should only be accessed once the
+        manager has been initialized.
+        """
+        if self._worker_pool is None:
+            self._worker_pool = ShotgunFieldWorkerPool(
+                self,
+                bg_task_manager=self._task_manager,
+                max_requests_per_host=self._max_requests_per_host,
+            )
+        return self._worker_pool
+
     ############################################################################
     # public methods
 
+    def destroy(self):
+        """
+        Should be called before the manager is discarded, for example when
+        the widget owning it is closed. Any field edits still waiting in the
+        :attr:`edit_queue` are written to Shotgun, and the background work of
+        the edit queue and :attr:`worker_pool` is stopped.
+        """
+        if self._edit_queue:
+            self._edit_queue.destroy()
+            self._edit_queue = None
+
+        if self._worker_pool:
+            self._worker_pool.destroy()
+            self._worker_pool = None
+
     def create_delegate(self, sg_entity_type, field_name, view):
         """
         Returns a delegate that can be used in the given view to show data from the given
@@ -219,6 +292,7 @@ class ShotgunFieldManager(QtCore.QObject):
             editor_class,
             view,
             bg_task_manager=self._task_manager,
+            field_manager=self,
         )
 
     def create_generic_delegate(
@@ -263,6 +337,7 @@ class ShotgunFieldManager(QtCore.QObject):
             view,
             bg_task_manager=self._task_manager,
             field_data_role=field_data_role,
+            field_manager=self,
         )
 
     def create_label(self, sg_entity_type, field_name, prefix=None, postfix=None):
@@ -337,6 +412,53 @@ class ShotgunFieldManager(QtCore.QObject):
 
         return widget
 
+    def get_painter_widget(self, widget_class, view, create_widget):
+        """
+        Returns the painter widget of the supplied class that is shared by all of
+        the delegates painting in the supplied view. Delegates only use their
+        painter widget for the duration of a paint, so a view with many columns
+        of the same field type only needs one widget of that type. Widgets that
+        can be edited are put in their non-editing state, so that they are
+        painted the same way whichever delegate created them.
+
+        :param widget_class: The class of the painter widget
+        :param view: The view the widget paints in
+        :type view: :class:`~PySide.QtGui.QWidget`
+        :param create_widget: Callable that takes the view and returns a new
+            widget. It is called if the view doesn't have a widget of the
+            supplied class yet.
+
+        :returns: :class:`~PySide.QtGui.QWidget` or ``None`` if no widget could
+            be created.
+        """
+        view_id = id(view)
+        key = (widget_class, view_id)
+
+        widget = self._painter_widgets.get(key)
+        if widget is None:
+            widget = create_widget(view)
+            if widget is None:
+                return None
+
+            if hasattr(widget, "enable_editing"):
+                widget.enable_editing(False)
+
+            if not any(k[1] == view_id for k in self._painter_widgets):
+                # forget the view's widgets along with the view. the manager
+                # is only referenced weakly so that the view doesn't keep it
+                # alive.
+                manager_ref = weakref.ref(self)
+
+                def release_painter_widgets():
+                    manager = manager_ref()
+                    if manager is not None:
+                        manager._release_painter_widgets(view_id)
+
+                view.destroyed.connect(release_painter_widgets)
+            self._painter_widgets[key] = widget
+
+        return widget
+
     def initialize(self):
         """
         Initialize the task manager.
@@ -353,7 +475,7 @@ class ShotgunFieldManager(QtCore.QObject):
                 "tk-framework-shotgunutils", "task_manager"
             )
             self._task_manager = task_manager.BackgroundTaskManager(
-                parent=self, max_threads=1, start_processing=True
+                parent=self, max_threads=self._max_threads, start_processing=True
             )
 
         # let shotgun globals start loading the schema
@@ -459,6 +581,7 @@ class ShotgunFieldManager(QtCore.QObject):
                 field_name=field_name,
                 entity=entity,
                 bg_task_manager=self._task_manager,
+                worker_pool=self.worker_pool,
                 **kwargs
             )
 
@@ -518,6 +641,7 @@ class ShotgunFieldManager(QtCore.QObject):
                 field_name=field_name,
                 entity=entity,
                 bg_task_manager=self._task_manager,
+                worker_pool=self.worker_pool,
                 **kwargs
             )
 
@@ -566,6 +690,7 @@ class ShotgunFieldManager(QtCore.QObject):
                 field_name=field_name,
                 entity=entity,
                 bg_task_manager=self._task_manager,
+                worker_pool=self.worker_pool,
                 **kwargs
             )
             return widget
@@ -609,6 +734,15 @@ class ShotgunFieldManager(QtCore.QObject):
     ############################################################################
     # private methods
 
+    def _release_painter_widgets(self, view_id):
+        """
+        Forgets the shared painter widgets of a view that has been destroyed.
+
+        :param int view_id: The id of the destroyed view
+        """
+        for key in [k for k in self._painter_widgets if k[1] == view_id]:
+            del self._painter_widgets[key]
+
     def __schema_loaded(self):
         """
         Internal method that will be called when the schema is available.
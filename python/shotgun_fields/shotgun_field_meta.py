@@ -105,6 +105,7 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
         * ``_entity``: The entity the widget is representing a field of (if passed in)
         * ``_field_name``: The name of the field the widget is representing
         * ``_bg_task_manager``: The task manager the widget should use (if passed in)
+        * ``_worker_pool``: The worker pool the widget should use (if passed in)
         * ``_bundle``: The current Toolkit bundle
 
     - All instances of this class can emit the following signals:
@@ -120,6 +121,14 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
         * ``get_value()``: Returns the internal value stored for the widget. This
           value should match the format and type of data associated with the widget's
           field in Shotgun, as returned by the python API.
+        * ``paint_value(self, painter, rect, value, option)``: Paint the value
+          directly with the painter. When a display class implements it and sets
+          ``_PAINT_VALUE = True``, field delegates use it instead of setting the
+          value on the widget and rendering it, which is much cheaper. Should
+          return ``False`` if the value can't be painted directly, in which case
+          the widget is rendered as usual. Display classes deriving from the
+          label base widgets get an implementation painting the text returned by
+          ``_string_value()``, so they only need to set ``_PAINT_VALUE = True``.
 
     - If ``set_value`` is not defined, then the class must implement the following methods:
         * ``_display_default(self)``: Set the widget to display its "blank" state
@@ -215,6 +224,7 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
         entity=None,
         bg_task_manager=None,
         delegate=False,
+        worker_pool=None,
         **kwargs
     ):
         """
@@ -237,6 +247,9 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
 
         :param bool delegate: True if the widget field widget is being used as a delegate, False otherwise.
 
+        :param worker_pool: The worker pool the widget should use for background requests
+        :type worker_pool: :class:`ShotgunFieldWorkerPool`
+
         Additionally pass all other keyword args through to the PySide widget constructor for the
         class' superclass.
         """
@@ -251,6 +264,7 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
         instance._bg_task_manager = bg_task_manager
         instance._bundle = sgtk.platform.current_bundle()
         instance._delegate = delegate
+        instance._worker_pool = worker_pool
 
         # do any widget setup that is needed
         instance.setup_widget()
@@ -348,6 +362,19 @@ class ShotgunFieldMeta(type(QtGui.QWidget)):
         """
         return self._field_name
 
+    @staticmethod
+    @take_over
+    def set_field(self, entity_type, field_name):
+        """
+        Set the entity type and field the widget represents. Used when a widget
+        is shared to paint several fields of the same type.
+
+        :param str entity_type: The entity type associated with the field widget.
+        :param str field_name: The field name associated with the field widget.
+        """
+        self._entity_type = entity_type
+        self._field_name = field_name
+
     @staticmethod
     @take_over
     def _get_safe_str(self, value):
@@ -0,0 +1,538 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import itertools
+import weakref
+
+import sgtk
+from sgtk.platform.qt import QtCore
+from tank_vendor.six.moves import urllib
+
+shotgun_data = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_data"
+)
+shotgun_model = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_model"
+)
+
+
+class ShotgunFieldWorkerPool(QtCore.QObject):
+    """
+    Runs the background requests of field widgets, such as thumbnail
+    downloads, on a single data retriever shared by all of the widgets created
+    by a :class:`ShotgunFieldManager`.
+
+    Requests run on the manager's background task manager, so they run
+    concurrently up to its number of threads. The number of requests in flight
+    to the same host is limited so that a view full of image fields doesn't
+    flood a single server. Requests beyond the limit are queued and sent in the
+    order they were made.
+
+    Results are passed to the callbacks supplied with each request, so widgets
+    don't need to filter the results of the other widgets' requests. Callbacks
+    that are methods don't keep their object alive, and are dropped once it has
+    been garbage collected or deleted.
+
+    Widgets expecting a data retriever, such as the completers of the entity
+    editors, can send their requests through the pool using
+    :meth:`create_data_retriever`.
+    """
+
+    # default maximum number of requests in flight to the same host
+    DEFAULT_MAX_REQUESTS_PER_HOST = 4
+
+    def __init__(
+        self,
+        parent=None,
+        bg_task_manager=None,
+        max_requests_per_host=DEFAULT_MAX_REQUESTS_PER_HOST,
+    ):
+        """
+        Constructor
+
+        :param parent: Parent object
+        :type parent: :class:`~PySide.QtCore.QObject`
+        :param bg_task_manager: Optional Task manager. If this is not passed in
+            the data retriever will create its own.
+        :type bg_task_manager: :class:`~task_manager.BackgroundTaskManager`
+        :param int max_requests_per_host: Maximum number of requests in flight
+            to the same host.
+        """
+        super(ShotgunFieldWorkerPool, self).__init__(parent)
+
+        self._max_requests_per_host = max(1, max_requests_per_host)
+
+        self._request_ids = itertools.count(1)
+
+        # queries are made to the Shotgun site, thumbnails are downloaded from
+        # the host in their url
+        self._site_host = urllib.parse.urlparse(
+            sgtk.platform.current_bundle().sgtk.shotgun_url
+        ).netloc
+
+        # requests by request id, the requests waiting to be sent for each
+        # host, the number of requests in flight to each host and the request
+        # id of each data retriever uid
+        self._requests = {}
+        self._host_queues = {}
+        self._host_active = collections.defaultdict(int)
+        self._uid_requests = {}
+
+        self._sg_data_retriever = shotgun_data.ShotgunDataRetriever(
+            self, bg_task_manager=bg_task_manager
+        )
+        self._sg_data_retriever.start()
+        self._sg_data_retriever.work_completed.connect(self._on_worker_signal)
+        self._sg_data_retriever.work_failure.connect(self._on_worker_failure)
+
+    ############################################################################
+    # properties
+
+    def _get_max_requests_per_host(self):
+        """
+        The maximum number of requests in flight to the same host.
+        """
+        return self._max_requests_per_host
+
+    def _set_max_requests_per_host(self, count):
+        self._max_requests_per_host = max(1, count)
+        for host in list(self._host_queues.keys()):
+            self._send_queued(host)
+
+    max_requests_per_host = property(
+        _get_max_requests_per_host, _set_max_requests_per_host
+    )
+
+    ############################################################################
+    # public methods
+
+    def request_thumbnail(
+        self,
+        url,
+        entity_type,
+        entity_id,
+        field,
+        load_image=False,
+        completed=None,
+        failed=None,
+    ):
+        """
+        Requests a thumbnail to be downloaded and cached in the background.
+
+        :param str url: The thumbnail url.
+        :param str entity_type: Type of the entity the thumbnail belongs to.
+        :param int entity_id: Id of the entity the thumbnail belongs to.
+        :param str field: Field the thumbnail is stored in.
+        :param bool load_image: If ``True``, the image is loaded and passed to
+            the completed callback along with its path.
+        :param completed: Callable called with the request id and the data
+            returned by the data retriever once the thumbnail is downloaded.
+        :param failed: Callable called with the request id and the error
+            message if the download fails.
+
+        :returns: The id of the request, which can be passed to :meth:`cancel`.
+        """
+        host = urllib.parse.urlparse(url or "").netloc
+        return self._queue_request(
+            host,
+            lambda: self._sg_data_retriever.request_thumbnail(
+                url, entity_type, entity_id, field, load_image=load_image
+            ),
+            completed,
+            failed,
+        )
+
+    def create_data_retriever(self, parent=None):
+        """
+        Returns a data retriever sending its requests through the pool. It has
+        the interface of a
+        :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`
+        for the requests made by the field widgets: text and navigation
+        searches, methods and thumbnails.
+
+        :param parent: Parent object
+        :type parent: :class:`~PySide.QtCore.QObject`
+
+        :returns: The data retriever. It is already started.
+        """
+        return _WorkerPoolDataRetriever(self, parent)
+
+    def cancel(self, request_id):
+        """
+        Cancels a request. Its callbacks won't be called.
+
+        :param request_id: The id returned when the request was made.
+        """
+        request = self._requests.pop(request_id, None)
+        if not request:
+            return
+
+        uid = request["uid"]
+        if uid is None:
+            queue = self._host_queues[request["host"]]
+            queue.remove(request_id)
+            if not queue:
+                del self._host_queues[request["host"]]
+            return
+
+        self._uid_requests.pop(uid, None)
+        if self._sg_data_retriever:
+            self._sg_data_retriever.stop_work(uid)
+        self._finish_request(request)
+
+    def destroy(self):
+        """
+        Should be called before the pool is discarded. Pending requests are
+        dropped.
+        """
+        self._requests = {}
+        self._host_queues = {}
+        self._host_active.clear()
+        self._uid_requests = {}
+        if self._sg_data_retriever:
+            self._sg_data_retriever.stop()
+            self._sg_data_retriever.work_completed.disconnect(self._on_worker_signal)
+            self._sg_data_retriever.work_failure.disconnect(self._on_worker_failure)
+            self._sg_data_retriever = None
+
+    ############################################################################
+    # protected methods
+
+    def _queue_site_request(self, method_name, args, kwargs, completed, failed):
+        """
+        Queues a request to the Shotgun site, made by calling a method of the
+        data retriever.
+
+        :param str method_name: Name of the data retriever's method.
+        :param tuple args: Positional arguments of the method.
+        :param dict kwargs: Keyword arguments of the method.
+        :param completed: Callable called when the request completes.
+        :param failed: Callable called when the request fails.
+
+        :returns: The id of the request.
+        """
+        return self._queue_request(
+            self._site_host,
+            lambda: getattr(self._sg_data_retriever, method_name)(*args, **kwargs),
+            completed,
+            failed,
+        )
+
+    def _is_queued(self, request_id):
+        """
+        Whether the supplied request is waiting to be sent.
+
+        :param request_id: The id returned when the request was made.
+        """
+        request = self._requests.get(request_id)
+        return bool(request) and request["uid"] is None
+
+    def _queue_request(self, host, submit, completed, failed):
+        """
+        Queues a request for the supplied host and sends it if the host's limit
+        allows it.
+
+        :param str host: The host the request is made to.
+        :param submit: Callable sending the request to the data retriever and
+            returning its uid.
+        :param completed: Callable called when the request completes.
+        :param failed: Callable called when the request fails.
+
+        :returns: The id of the request.
+        """
+        request_id = next(self._request_ids)
+        self._requests[request_id] = {
+            "id": request_id,
+            "host": host,
+            "submit": submit,
+            "uid": None,
+            "completed": self._make_callback_ref(completed),
+            "failed": self._make_callback_ref(failed),
+        }
+        self._host_queues.setdefault(host, collections.deque()).append(request_id)
+        self._send_queued(host)
+        return request_id
+
+    def _send_queued(self, host):
+        """
+        Sends the requests queued for the supplied host, up to its limit.
+
+        :param str host: The host to send the requests of.
+        """
+        queue = self._host_queues.get(host)
+        while (
+            queue
+            and self._sg_data_retriever
+            and self._host_active[host] < self._max_requests_per_host
+        ):
+            request = self._requests[queue.popleft()]
+            request["uid"] = request["submit"]()
+            self._uid_requests[request["uid"]] = request["id"]
+            self._host_active[host] += 1
+
+        if not queue:
+            self._host_queues.pop(host, None)
+
+    def _finish_request(self, request):
+        """
+        Frees the request's slot for its host and sends the next queued request.
+
+        :param dict request: The request that is no longer in flight.
+        """
+        host = request["host"]
+        self._host_active[host] -= 1
+        if self._host_active[host] <= 0:
+            del self._host_active[host]
+        self._send_queued(host)
+
+    def _make_callback_ref(self, callback):
+        """
+        Returns a function returning the supplied callback, or ``None`` once
+        the object of a method callback has been garbage collected.
+
+        :param callback: A callable or ``None``.
+        """
+        if callback is None:
+            return lambda: None
+
+        obj = getattr(callback, "__self__", None)
+        func = getattr(callback, "__func__", None)
+        if obj is None or func is None:
+            return lambda: callback
+
+        obj_ref = weakref.ref(obj)
+
+        def get_callback():
+            obj = obj_ref()
+            if obj is None:
+                return None
+            return lambda *args: func(obj, *args)
+
+        return get_callback
+
+    def _call(self, callback_ref, *args):
+        """
+        Calls a callback if it still exists.
+
+        :param callback_ref: Function returned by :meth:`_make_callback_ref`.
+        """
+        callback = callback_ref()
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except RuntimeError:
+            # the widget the callback belongs to has been deleted
+            sgtk.platform.current_bundle().log_debug(
+                "Dropped the result of a background request: %s" % (args[0],)
+            )
+
+    def _on_worker_signal(self, uid, request_type, data):
+        """
+        Signaled whenever the worker completes something.
+
+        :param uid: Unique id for request
+        :param request_type: String identifying the request class
+        :param data: the data that was returned
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        request = self._requests.pop(self._uid_requests.pop(uid, None), None)
+        if not request:
+            return
+
+        self._finish_request(request)
+        data = shotgun_model.sanitize_qt(data)
+        self._call(request["completed"], request["id"], data)
+
+    def _on_worker_failure(self, uid, msg):
+        """
+        Asynchronous callback - the worker thread errored.
+
+        :param uid: Unique id for request that failed
+        :param msg: Error message
+        """
+        uid = shotgun_model.sanitize_qt(uid)  # qstring on pyqt, str on pyside
+        request = self._requests.pop(self._uid_requests.pop(uid, None), None)
+        if not request:
+            return
+
+        self._finish_request(request)
+        msg = shotgun_model.sanitize_qt(msg)
+        self._call(request["failed"], request["id"], msg)
+
+
+class _WorkerPoolDataRetriever(QtCore.QObject):
+    """
+    Data retriever sending its requests through a
+    :class:`ShotgunFieldWorkerPool`. Its request ids are the ids of the pool's
+    requests, as strings.
+
+    :signals:
+        ``work_completed(str, str, object)`` - Fires when a request completes.
+        The arguments are the request id, the name of the method the request
+        was made with and the data returned.
+
+        ``work_failure(str, str)`` - Fires when a request fails. The arguments
+        are the request id and the error message.
+    """
+
+    work_completed = QtCore.Signal(str, str, object)
+    work_failure = QtCore.Signal(str, str)
+
+    def __init__(self, pool, parent=None):
+        """
+        Constructor
+
+        :param pool: The pool to send the requests through.
+        :type pool: :class:`ShotgunFieldWorkerPool`
+        :param parent: Parent object
+        :type parent: :class:`~PySide.QtCore.QObject`
+        """
+        super(_WorkerPoolDataRetriever, self).__init__(parent)
+
+        self._pool = pool
+
+        # the method names of the requests that haven't completed yet, keyed
+        # by request id
+        self._request_types = {}
+
+    def start(self):
+        """
+        Does nothing. The pool's data retriever is already started.
+        """
+
+    def stop(self):
+        """
+        Cancels all of the requests that haven't completed yet.
+        """
+        for request_id in list(self._request_types.keys()):
+            self._pool.cancel(request_id)
+        self._request_types = {}
+
+    def clear(self):
+        """
+        Cancels the requests waiting to be sent. The requests in progress will
+        complete.
+        """
+        for request_id in list(self._request_types.keys()):
+            if self._pool._is_queued(request_id):
+                self._pool.cancel(request_id)
+                del self._request_types[request_id]
+
+    def stop_work(self, task_id):
+        """
+        Cancels a request. Its signals won't be emitted.
+
+        :param str task_id: The id returned when the request was made.
+        """
+        request_id = int(task_id)
+        if self._request_types.pop(request_id, None):
+            self._pool.cancel(request_id)
+
+    def execute_method(self, method, *args, **kwargs):
+        """
+        Runs a method in a background thread. The method is called with a
+        Shotgun connection followed by the supplied arguments.
+
+        :param method: The method to run.
+
+        :returns: The id of the request.
+        """
+        return self._queue("execute_method", (method,) + args, kwargs)
+
+    def execute_text_search(self, *args, **kwargs):
+        """
+        Runs a Shotgun text search in the background. Takes the arguments of
+        ``ShotgunDataRetriever.execute_text_search``.
+
+        :returns: The id of the request.
+        """
+        return self._queue("execute_text_search", args, kwargs)
+
+    def execute_nav_search_string(self, *args, **kwargs):
+        """
+        Runs a Shotgun navigation search in the background. Takes the arguments
+        of ``ShotgunDataRetriever.execute_nav_search_string``.
+
+        :returns: The id of the request.
+        """
+        return self._queue("execute_nav_search_string", args, kwargs)
+
+    def request_thumbnail_source(self, *args, **kwargs):
+        """
+        Downloads the source thumbnail of an entity in the background. Takes
+        the arguments of ``ShotgunDataRetriever.request_thumbnail_source``.
+
+        :returns: The id of the request.
+        """
+        return self._queue("request_thumbnail_source", args, kwargs)
+
+    def request_thumbnail(self, url, entity_type, entity_id, field, load_image=False):
+        """
+        Downloads a thumbnail in the background.
+
+        :param str url: The thumbnail url.
+        :param str entity_type: Type of the entity the thumbnail belongs to.
+        :param int entity_id: Id of the entity the thumbnail belongs to.
+        :param str field: Field the thumbnail is stored in.
+        :param bool load_image: If ``True``, the image is loaded and returned
+            along with its path.
+
+        :returns: The id of the request.
+        """
+        request_id = self._pool.request_thumbnail(
+            url,
+            entity_type,
+            entity_id,
+            field,
+            load_image=load_image,
+            completed=self._on_completed,
+            failed=self._on_failed,
+        )
+        self._request_types[request_id] = "request_thumbnail"
+        return str(request_id)
+
+    def _queue(self, method_name, args, kwargs):
+        """
+        Queues a request to the Shotgun site in the pool.
+
+        :param str method_name: Name of the data retriever's method.
+        :param tuple args: Positional arguments of the method.
+        :param dict kwargs: Keyword arguments of the method.
+
+        :returns: The id of the request.
+        """
+        request_id = self._pool._queue_site_request(
+            method_name, args, kwargs, self._on_completed, self._on_failed
+        )
+        self._request_types[request_id] = method_name
+        return str(request_id)
+
+    def _on_completed(self, request_id, data):
+        """
+        Called by the pool when a request completes.
+
+        :param request_id: The id of the request.
+        :param data: The data returned by the request.
+        """
+        request_type = self._request_types.pop(request_id, None)
+        if request_type:
+            self.work_completed.emit(str(request_id), request_type, data)
+
+    def _on_failed(self, request_id, msg):
+        """
+        Called by the pool when a request fails.
+
+        :param request_id: The id of the request.
+        :param str msg: The error message.
+        """
+        if self._request_types.pop(request_id, None):
+            self.work_failure.emit(str(request_id), msg)
@@ -26,6 +26,7 @@ class StatusListWidget(LabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "status_list"
+    _PAINT_VALUE = True
 
     def _string_value(self, value):
         """
@@ -45,6 +46,38 @@ class StatusListWidget(LabelBaseWidget):
 
         return str_val
 
+    def paint_value(self, painter, rect, value, option):
+        """
+        Paint the value directly without rendering the widget.
+
+        :param painter: The painter to paint with
+        :type painter: :class:`~PySide.QtGui.QPainter`
+        :param rect: The rectangle to paint into
+        :type rect: :class:`~PySide.QtCore.QRect`
+        :param str value: valid Shotgun status code
+        :param option: The style options for the cell being painted
+        :type option: :class:`~PySide.QtGui.QStyleOptionViewItem`
+
+        :returns: ``True`` if the value was painted, ``False`` if the widget
+            should be rendered instead.
+        """
+        if value is None:
+            # nothing to display!
+            return True
+
+        str_val = shotgun_globals.get_status_display_name(value)
+        color_str = shotgun_globals.get_status_color(value)
+
+        swatch_color = None
+        if color_str:
+            try:
+                swatch_color = QtGui.QColor(*[int(c) for c in color_str.split(",")])
+            except (TypeError, ValueError):
+                # not a color we know how to handle so let the widget render it
+                return False
+
+        return self._paint_text(painter, rect, str_val, swatch_color)
+
 
 @six.add_metaclass(ShotgunFieldMeta)
 class StatusListEditorWidget(QtGui.QComboBox):
@@ -21,6 +21,7 @@ class TextWidget(ElidedLabelBaseWidget):
     """
 
     _DISPLAY_TYPE = "text"
+    _PAINT_VALUE = True
 
 
 @six.add_metaclass(ShotgunFieldMeta)
@@ -33,11 +33,6 @@ class ShotgunSearchWidget(QtGui.QLineEdit):
         # trigger the completer to popup as text changes
         self.textEdited.connect(self._search_edited)
 
-        # Taken from https://wiki.qt.io/Delay_action_to_wait_for_user_interaction
-        self._delay_timer = QtCore.QTimer(self)
-        self._delay_timer.timeout.connect(self._typing_timeout)
-        self._delay_timer.setSingleShot(True)
-
         # FIXME: The following was stolen from SearchWidget. We can't refactor easily that
         # part of the code since the base classes for ShotgunSearchWidget and SearchWidget
         # are not the same, but at least the ShotgunSearchWidget has feature parity.
@@ -89,22 +84,26 @@ class ShotgunSearchWidget(QtGui.QLineEdit):
         """
         self.completer().set_bg_task_manager(task_manager)
 
-    def _search_edited(self, text):
+    def set_data_retriever(self, data_retriever):
         """
-        Called every time the user types something in the search box.
+        Specify the data retriever to pull data in the background with,
+        instead of one created for a background task manager.
+
+        :param data_retriever: Started data retriever to use
+        :type  data_retriever: :class:`~tk-framework-shotgunutils:shotgun_data.ShotgunDataRetriever`
         """
-        # This will fire _typing_timeout after 300 ms. If the user types something before it fires,
-        # the timer restarts counting. This differs from the editingFinished event on a QLineEdit which
-        # fires only when the user pressed enter. This fires when the user has finished typing for
-        # a short period of time.
-        self._clear_btn.setVisible(bool(text))
-        self._delay_timer.start(300)
+        self.completer().set_data_retriever(data_retriever)
 
-    def _typing_timeout(self):
+    def _search_edited(self, text):
         """
-        Launches the search in the completer.
+        Called every time the user types something in the search box.
         """
-        self.completer().search(self.text())
+        # The completer waits until the user has stopped typing for a short
+        # period of time before it actually searches. This differs from the
+        # editingFinished event on a QLineEdit which fires only when the user
+        # pressed enter.
+        self._clear_btn.setVisible(bool(text))
+        self.completer().search(text)
 
     def destroy(self):
         """
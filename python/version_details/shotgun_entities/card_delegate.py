@@ -8,6 +8,8 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import collections
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 from .card_widget import ShotgunEntityCardWidget
@@ -16,6 +18,7 @@ views = sgtk.platform.current_bundle().import_module("views")
 shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
+utils = sgtk.platform.import_framework("tk-framework-shotgunutils", "utils")
 
 
 class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
@@ -33,8 +36,15 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
     :ivar show_border:              Whether to draw borders around card widgets
                                     that are not selected.
     :vartype show_border:           bool
+
+    Painter widgets are kept in a bounded pool so that memory doesn't grow with
+    the number of items painted.  Once :attr:`max_live_widgets` widgets exist, the
+    least recently painted widget is recycled for the next index that needs one.
     """
 
+    # default maximum number of painter widgets to keep alive at once:
+    DEFAULT_MAX_LIVE_WIDGETS = 100
+
     def __init__(self, view, shotgun_field_manager=None, **kwargs):
         """
         Constructs a new ShotgunEntityCardDelegate.
@@ -48,7 +58,17 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
         super(ShotgunEntityCardDelegate, self).__init__(view)
 
         self._fields = ["code", "entity"]
-        self._widget_cache = dict()
+
+        # painter widgets keyed by model index in least to most recently used
+        # order, together with the field configuration each widget was built for.
+        self._widget_cache = collections.OrderedDict()
+        self._widget_configs = dict()
+        self._max_live_widgets = self.DEFAULT_MAX_LIVE_WIDGETS
+
+        # size hints measured from populated painter widgets, keyed by field
+        # configuration and width. The height of a card only depends on those,
+        # so rows can be laid out without constructing a widget for each of them.
+        self._size_hint_cache = dict()
         self._shotgun_field_manager = shotgun_field_manager
         self.__current_editor = None
 
@@ -75,10 +95,26 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
 
     fields = property(_get_fields, _set_fields)
 
+    def _get_max_live_widgets(self):
+        """
+        The maximum number of painter widgets the delegate keeps alive at once.
+        """
+        return self._max_live_widgets
+
+    def _set_max_live_widgets(self, max_live_widgets):
+        self._max_live_widgets = max(1, int(max_live_widgets))
+
+        # destroy the least recently used widgets until we're within the limit:
+        while len(self._widget_cache) > self._max_live_widgets:
+            _, widget = self._widget_cache.popitem(last=False)
+            self._destroy_widget(widget)
+
+    max_live_widgets = property(_get_max_live_widgets, _set_max_live_widgets)
+
     @property
     def widget_cache(self):
         """
-        A dictionary containing all painter widgets, keyed by model index.
+        A dictionary containing the live painter widgets, keyed by model index.
         """
         return self._widget_cache
 
@@ -156,10 +192,11 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
 
     def _get_painter_widget(self, model_index, parent):
         """
-        Constructs a widget to act as the basis for the paint event. If
-        a widget has already been instantiated for this model index, that
-        widget will be reused, otherwise a new widget will be instantiated
-        and cached.
+        Returns a widget to act as the basis for the paint event. If a widget
+        for the current field configuration is already live for this model index,
+        that widget will be reused.  Otherwise a widget is taken from the pool,
+        recycling the least recently used widget once :attr:`max_live_widgets`
+        widgets exist.
 
         :param model_index: The index of the item in the model to return a widget for
         :type model_index:  :class:`~PySide.QtCore.QModelIndex`
@@ -168,18 +205,62 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
         :returns:           A QWidget to be used for painting the current index
         :rtype:             :class:`~PySide.QtGui.QWidget`
         """
-        if model_index in self._widget_cache:
-            widget = self._widget_cache[model_index]
+        config = self._get_widget_config()
 
-            if sorted(self.fields) == sorted(widget.fields):
+        widget = self._widget_cache.pop(model_index, None)
+        if widget is not None:
+            if self._widget_configs.get(widget) == config:
+                # mark as most recently used and we're done:
+                self._widget_cache[model_index] = widget
                 return widget
+            # the fields being displayed have changed since this widget was built:
+            self._destroy_widget(widget)
+
+        widget = None
+        if len(self._widget_cache) >= self._max_live_widgets:
+            # recycle the least recently used widget:
+            _, lru_widget = self._widget_cache.popitem(last=False)
+            if self._widget_configs.get(lru_widget) == config:
+                widget = lru_widget
+            else:
+                self._destroy_widget(lru_widget)
+
+        if widget is None:
+            widget = self._create_widget(parent)
+            self._widget_configs[widget] = config
 
-        widget = self._create_widget(parent)
         self._widget_cache[model_index] = widget
         self.sizeHintChanged.emit(model_index)
 
         return widget
 
+    def _get_widget_config(self):
+        """
+        Returns a hashable representation of the field configuration used to build
+        painter widgets.  Widgets built for one configuration can only be recycled
+        for the same configuration.
+
+        :returns: A tuple describing the current field configuration.
+        """
+        return (
+            tuple(self.fields),
+            bool(self.show_labels),
+            bool(self.show_border),
+            tuple(self.label_exempt_fields),
+        )
+
+    def _destroy_widget(self, widget):
+        """
+        Cleans up a painter widget that is no longer needed.
+
+        :param widget: The painter widget to destroy.
+        :type widget:  :class:`~ShotgunEntityCardWidget`
+        """
+        self._widget_configs.pop(widget, None)
+        widget.hide()
+        widget.setParent(None)
+        utils.safe_delete_later(widget)
+
     def _create_editor_widget(self, model_index, style_options, parent):
         """
         Called when a cell is being edited.
@@ -221,10 +302,11 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
         sg_item = shotgun_model.get_sg_data(model_index)
         widget.entity = sg_item
 
-        if model_index in self.selection_model.selectedIndexes():
-            widget.set_selected(True)
-        else:
-            widget.set_selected(False)
+        # Ask the selection model directly rather than searching the list of
+        # selected indexes, which would be rebuilt for every painted row.
+        widget.set_selected(
+            bool(self.selection_model and self.selection_model.isSelected(model_index))
+        )
 
     ##########################################################################
     # sizing
@@ -240,9 +322,40 @@ class ShotgunEntityCardDelegate(views.EditSelectedWidgetDelegate):
         :param model_index:     The index of the item in the model.
         :type model_index:      :class:`~PySide.QtCore.QModelIndex`
         """
-        # We have to do this ourselves instead of calling
-        # _get_painter_widget because that itself emits
-        # the sizeHintChanged signal, which would put us
-        # into an infinite loop.
-        widget = self._widget_cache.get(model_index) or self._create_widget(self.view)
-        return widget.sizeHint()
+        config = self._get_widget_config()
+        size_key = (config, style_options.rect.width())
+
+        size_hint = self._size_hint_cache.get(size_key)
+        if size_hint is None:
+            # We have to do this ourselves instead of calling
+            # _get_painter_widget because that itself emits
+            # the sizeHintChanged signal, which would put us
+            # into an infinite loop.
+            widget = self._widget_cache.get(model_index)
+            if (
+                widget is None
+                or not widget.entity
+                or self._widget_configs.get(widget) != config
+            ):
+                # Nothing has been measured for this configuration yet, so
+                # estimate from the number of fields. The sizeHintChanged
+                # signal emitted once a painter widget has been populated
+                # will bring us back here to measure it properly.
+                return QtCore.QSize(
+                    ShotgunEntityCardWidget.WIDTH_HINT,
+                    len(self.fields) * ShotgunEntityCardWidget.ROW_HEIGHT
+                    + ShotgunEntityCardWidget.HEIGHT_HINT_PADDING,
+                )
+
+            size_hint = widget.sizeHint()
+            self._size_hint_cache[size_key] = size_hint
+
+        return QtCore.QSize(size_hint)
+
+    def clear_size_hint_cache(self):
+        """
+        Clears the cached size hints, forcing them to be measured again from the
+        painter widgets. This should be called if something other than the field
+        configuration, such as the font or style, changes the size of the cards.
+        """
+        self._size_hint_cache = dict()
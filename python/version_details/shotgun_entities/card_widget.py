@@ -10,8 +10,11 @@
 
 from __future__ import with_statement
 
+import collections
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
+from tank_vendor import six
 from .ui.card_widget import Ui_ShotgunEntityCardWidget
 
 import threading
@@ -23,12 +26,29 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
     """
     Simple entity widget which hosts a thumbnail, plus any requested
     entity fields in a layout to the right of the thumbnail.
+
+    Edits made in editable field widgets are written to Shotgun in the
+    background via the field manager's edit queue. The widget keeps showing
+    the edited values while the update is in progress, and restores the
+    previous values if the update fails.
+
+    :signals:
+        ``entity_updated(object)`` - Fires when edits made in the widget have
+        been written to Shotgun. The argument is the dictionary of field values
+        that were written.
+
+        ``entity_update_failed(object, str)`` - Fires when edits made in the
+        widget could not be written to Shotgun. The arguments are the dictionary
+        of field values and the error message.
     """
 
     WIDTH_HINT = 300
     HEIGHT_HINT_PADDING = 8
     ROW_HEIGHT = 20
 
+    entity_updated = QtCore.Signal(object)
+    entity_update_failed = QtCore.Signal(object, str)
+
     def __init__(self, parent, shotgun_field_manager=None, editable=True):
         """
         Constructs a new ShotgunEntityCardWidget.
@@ -51,7 +71,15 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
         self._editable = editable
         self.__selected = False
 
-        self._fields = _OrderedDict()
+        # the edit queue used to write edits to Shotgun, the values Shotgun
+        # has for the fields with edits that haven't been written yet and the
+        # value of the latest edit of each of those fields
+        self._edit_queue = None
+        self._saved_values = dict()
+        self._queued_values = dict()
+
+        # field data keyed by field name, in display order.
+        self._fields = collections.OrderedDict()
         self.set_selected(self.__selected)
 
     ##########################################################################
@@ -71,10 +99,10 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
                 "No ShotgunFieldManager has been set, unable to add fields."
             )
 
-        if field_name in self.fields:
+        if field_name in self._fields:
             return
 
-        self._fields[field_name] = _OrderedDict(
+        self._fields[field_name] = dict(
             widget=None, label=None, label_exempt=label_exempt, row=0
         )
 
@@ -109,7 +137,7 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
                 # If there's no label, then the widget goes in the first
                 # column and is set to span all columns.
                 self.ui.field_grid_layout.addWidget(
-                    field_widget, len(self.fields), 0, 1, -1
+                    field_widget, len(self._fields), 0, 1, -1
                 )
             else:
                 # We have a label, so we put that in column 0 and the
@@ -119,18 +147,20 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
                 )
                 self._fields[field_name]["label"] = field_label
                 self.ui.field_grid_layout.addWidget(
-                    field_label, len(self.fields), 0, QtCore.Qt.AlignRight
+                    field_label, len(self._fields), 0, QtCore.Qt.AlignRight
                 )
-                self.ui.field_grid_layout.addWidget(field_widget, len(self.fields), 1)
+                self.ui.field_grid_layout.addWidget(field_widget, len(self._fields), 1)
         else:
             # Nothing at all will have labels, so we can just put the
             # widget into column 0. No need to worry about telling it to
             # span any additional columns, because there will only be a
             # single column.
-            self.ui.field_grid_layout.addWidget(field_widget, len(self.fields), 0)
+            self.ui.field_grid_layout.addWidget(field_widget, len(self._fields), 0)
 
-        self.ui.field_grid_layout.setRowMinimumHeight(len(self.fields), self.ROW_HEIGHT)
-        self._fields[field_name]["row"] = len(self.fields)
+        self.ui.field_grid_layout.setRowMinimumHeight(
+            len(self._fields), self.ROW_HEIGHT
+        )
+        self._fields[field_name]["row"] = len(self._fields)
 
     def clear(self):
         """
@@ -152,7 +182,7 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
 
         for field_name in field_names:
             self.destroy_field(field_name)
-        self._fields = _OrderedDict()
+        self._fields = collections.OrderedDict()
 
     def get_visible_fields(self):
         """
@@ -163,7 +193,7 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
         if not self.entity:
             return []
 
-        return [f for f, d in self._fields.iteritems() if d["widget"].isVisible()]
+        return [f for f, d in six.iteritems(self._fields) if d["widget"].isVisible()]
 
     def destroy_field(self, field_name):
         """
@@ -172,7 +202,7 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
 
         :param str field_name: The Shotgun field name to remove.
         """
-        if field_name not in self.fields:
+        if field_name not in self._fields:
             return
 
         # Now ditch the widget for the field if we have one. If we
@@ -323,6 +353,10 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
         if self.entity and self.entity == entity:
             return
 
+        # Results of edits still in progress are ignored for other entities.
+        self._saved_values = dict()
+        self._queued_values = dict()
+
         # If we've already been populated previously, then we will
         # set the values of the existing field widgets. Otherwise
         # this is a first-time setup and we need to create and place
@@ -335,7 +369,7 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
                 self.thumbnail.set_value(entity.get("image"))
                 self.thumbnail.setMinimumWidth(150)
 
-                for field, field_data in self._fields.iteritems():
+                for field, field_data in six.iteritems(self._fields):
                     field_widget = field_data["widget"]
 
                     if field_widget:
@@ -414,16 +448,116 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
     def _value_changed(self):
         """
         All field widgets created in this class will call this function when their
-        editor emits a value_changed signal. We just call update from the bundle's
-        Shotgun instance so this function is blocking for now.
+        editor emits a value_changed signal. The new value is queued to be written
+        to Shotgun in the background, coalesced with any other edits made shortly
+        before or after it.
+        """
+        entity = self._get_entity()
+        field_name = self.sender().get_field_name()
+        value = self.sender().get_value()
+
+        # Remember what Shotgun has for the field so that it can be restored
+        # if the update fails, then update our entity right away. The widget
+        # is already displaying the new value.
+        self._saved_values.setdefault(field_name, entity.get(field_name))
+        self._queued_values[field_name] = value
+        self._entity = dict(entity)
+        self._entity[field_name] = value
+
+        self._get_edit_queue().queue_update(
+            entity["type"], entity["id"], {field_name: value}
+        )
+
+    def _get_edit_queue(self):
+        """
+        Returns the edit queue used to write edits to Shotgun, connecting to its
+        signals the first time it is requested.
+
+        :returns: :class:`~shotgun_fields.ShotgunFieldEditQueue`
+        """
+        if self._edit_queue is None:
+            self._edit_queue = self.field_manager.edit_queue
+            self._edit_queue.update_completed.connect(self._on_update_completed)
+            self._edit_queue.update_failed.connect(self._on_update_failed)
+        return self._edit_queue
+
+    def _is_current_entity(self, entity_type, entity_id):
+        """
+        Whether the supplied entity type and id match the widget's entity.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
         """
         entity = self._get_entity()
+        return bool(
+            entity
+            and entity.get("type") == entity_type
+            and entity.get("id") == entity_id
+        )
+
+    def _on_update_completed(self, entity_type, entity_id, data):
+        """
+        Called when the edit queue has written an update to Shotgun.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: The field values that were written
+        """
+        if not self._is_current_entity(entity_type, entity_id):
+            return
+
+        for (field_name, value) in data.items():
+            if field_name not in self._saved_values:
+                continue
+
+            if self._queued_values.get(field_name) == value:
+                # this was the latest edit of the field
+                del self._saved_values[field_name]
+                del self._queued_values[field_name]
+            else:
+                # a newer edit is still queued. Shotgun now has this value, so
+                # it is the one to restore if the newer edit fails.
+                self._saved_values[field_name] = value
+
+        self.entity_updated.emit(data)
+
+    def _on_update_failed(self, entity_type, entity_id, data, message):
+        """
+        Called when the edit queue failed to write an update to Shotgun. The
+        field values Shotgun has are restored.
+
+        :param str entity_type: Shotgun entity type
+        :param int entity_id: Shotgun entity id
+        :param dict data: The field values that failed to be written
+        :param str message: The error message
+        """
+        if not self._is_current_entity(entity_type, entity_id):
+            return
 
-        update_dict = {}
-        update_dict[self.sender().get_field_name()] = self.sender().get_value()
+        for (field_name, failed_value) in data.items():
+            if field_name not in self._saved_values:
+                continue
 
-        bundle = sgtk.platform.current_bundle()
-        sg_res = bundle.shotgun.update(entity["type"], entity["id"], update_dict)
+            if self._queued_values.get(field_name) != failed_value:
+                # a newer edit is still queued and will be displayed until it
+                # has been written or has failed too
+                continue
+
+            value = self._saved_values.pop(field_name)
+            del self._queued_values[field_name]
+            self._entity[field_name] = value
+
+            field_widget = self._fields.get(field_name, {}).get("widget")
+            if field_widget:
+                # Block signals so that restoring the value isn't seen as
+                # a new edit.
+                try:
+                    field_widget.blockSignals(True)
+                    field_widget.set_value(value)
+                finally:
+                    field_widget.blockSignals(False)
+
+        self.entity_update_failed.emit(data, message)
 
     def _get_field_manager(self):
         """
@@ -458,11 +592,11 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
         A list of field names that are exempt from receiving labels in the
         item's layout.
         """
-        return [f for f, d in self._fields.iteritems() if d["label_exempt"]]
+        return [f for f, d in six.iteritems(self._fields) if d["label_exempt"]]
 
     def _set_label_exempt_fields(self, fields):
         fields_to_add = {}
-        for field_name, field_data in self._fields.iteritems():
+        for field_name, field_data in list(self._fields.items()):
             now_exempt = field_name in fields
 
             if self.entity:
@@ -532,8 +666,8 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
         A list of field widget objects that are present in the item widget.
         """
         widgets = []
-        for field, data in self.fields.iteritems():
-            if "widget" in data:
+        for data in six.itervalues(self._fields):
+            if data["widget"]:
                 widgets.append(data["widget"])
         return widgets
 
@@ -543,76 +677,3 @@ class ShotgunEntityCardWidget(QtGui.QWidget):
     label_exempt_fields = property(_get_label_exempt_fields, _set_label_exempt_fields)
     show_border = property(_get_show_border, _set_show_border)
     show_labels = property(_get_show_labels, _set_show_labels)
-
-
-class _OrderedDict(object):
-    """
-    An OrderedDict-like class. This is implemented here in order to maintain
-    backwards compatibility with pre-2.7 releases of Python.
-    """
-
-    def __init__(self, **kwargs):
-        """
-        Constructor. Emulates the behavior of the dict() type.
-
-        .. Note:: The order of key/value pairs passed in as kwargs to the
-                  constructor will not have their order maintained. This is
-                  consistent with the behavior of collections.OrderedDict in
-                  Python 2.7.
-        """
-        self._keys = []
-        self._dict = dict()
-
-        for (key, value) in kwargs.items():
-            self.__setitem__(key, value)
-
-    def get(self, key, default=None):
-        """
-        Emulates dict.get()
-
-        :param key: The key to get the value of.
-        :param default: What to return if the key isn't in the dictionary.
-        """
-        try:
-            return self[key]
-        except KeyError:
-            return default
-
-    def iteritems(self):
-        """
-        Emulates dict.iteritems()
-        """
-        return [(k, self[k]) for k in self._keys]
-
-    def keys(self):
-        """
-        Emulates dict.keys()
-        """
-        return self._keys
-
-    def values(self):
-        """
-        Emulates dict.values()
-        """
-        return [self[k] for k in self._keys]
-
-    def __iter__(self):
-        for key in self._keys:
-            yield self._dict[key]
-
-    def __len__(self):
-        return len(self._keys)
-
-    def __getitem__(self, key):
-        return self._dict[key]
-
-    def __setitem__(self, key, value):
-        self._keys.append(key)
-        self._dict[key] = value
-
-    def __delitem__(self, key):
-        del self._dict[key]
-        self._keys.remove(key)
-
-    def __contains__(self, item):
-        return item in self._dict
@@ -456,6 +456,13 @@ class VersionDetailsWidget(QtGui.QWidget):
         """
         self.ui.note_stream_widget.deselect_note()
 
+    def destroy(self):
+        """
+        Should be called before the widget is closed. Writes any field edits
+        that haven't been sent to Shotgun yet.
+        """
+        self._shotgun_field_manager.destroy()
+
     def download_note_attachments(self, note_id):
         """
         Triggers the attachments linked to the given Note entity to
@@ -7,6 +7,8 @@
 # By accessing, using, copying or modifying this work you indicate your
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
+import bisect
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
@@ -60,6 +62,7 @@ class GroupedListView(QtGui.QAbstractItemView):
             """
             self.rect = QtCore.QRect()  # relative item rect for group header
             self.dirty = True  # True if data in group or children has changed
+            self.layout_dirty = False  # True if children were added or removed
             self.collapsed = False  # True if the group is currently collapsed
             self.child_info = (
                 []
@@ -68,10 +71,21 @@ class GroupedListView(QtGui.QAbstractItemView):
             # size is the visual size of the child for all child items in
             # the group
             self.child_area_rect = QtCore.QRect()  # total size of child area
+            self.layout_row_tops = []  # relative y position of each visual row
+            self.layout_row_starts = []  # index of the first child in each visual row
+            self.header_size = None  # cached size hint for the group header
+            self.child_sizes = []  # cached child size hints (None if unknown)
+            self.size_bucket = None  # width bucket the cached size hints are valid for
+            self.estimated = False  # True if the layout uses estimated child sizes
+            self.measured_range = None  # content range measured when estimated
 
         def __repr__(self):
             return "%s: %s" % (self.rect, self.child_area_rect)
 
+    # cached size hints are only valid for the viewport width bucket they
+    # were measured in.  This is the width of each bucket in pixels.
+    _SIZE_HINT_BUCKET_WIDTH = 50
+
     def __init__(self, parent):
         """
         :param parent: The parent QWidget
@@ -93,6 +107,28 @@ class GroupedListView(QtGui.QAbstractItemView):
 
         self._prev_viewport_sz = QtCore.QSize()
 
+        # prefix-sum index of the y-offset of each group so that hit-testing and
+        # item rect lookups don't have to walk every preceding group.  Entry N
+        # is the offset of the top of group N and the last entry is the total
+        # height of the content.  Offsets from _group_offsets_dirty_row onwards
+        # are stale and get recomputed on demand.
+        self._group_offsets = []
+        self._group_offsets_dirty_row = 0
+
+        # row insertions and removals are queued up and applied in one go on the
+        # next iteration of the event loop so that models that add or remove rows
+        # in lots of small batches only trigger a single layout pass:
+        self._pending_row_changes = []
+        self._row_changes_timer = QtCore.QTimer(self)
+        self._row_changes_timer.setSingleShot(True)
+        self._row_changes_timer.setInterval(0)
+        self._row_changes_timer.timeout.connect(self._on_row_changes_timer)
+
+        # running totals of measured child sizes, used to estimate the size of
+        # children that are too far from the viewport to be worth measuring:
+        self._measured_size_total = (0, 0)
+        self._measured_size_count = 0
+
         # initial values for the properties
         self._border = QtCore.QSize(6, 6)
         self._group_spacing = 30
@@ -112,6 +148,7 @@ class GroupedListView(QtGui.QAbstractItemView):
     def _set_border(self, border_sz):
         self._border = border_sz
         self._update_all_item_info = True
+        self._invalidate_group_offsets(0)
         self.viewport().update()
 
     border = property(_get_border, _set_border)
@@ -127,6 +164,7 @@ class GroupedListView(QtGui.QAbstractItemView):
     def _set_group_spacing(self, spacing):
         self._group_spacing = spacing
         self._update_all_item_info = True
+        self._invalidate_group_offsets(0)
         self.viewport().update()
 
     group_spacing = property(_get_group_spacing, _set_group_spacing)
@@ -142,6 +180,7 @@ class GroupedListView(QtGui.QAbstractItemView):
     def _set_item_spacing(self, spacing):
         self._item_spacing = spacing
         self._update_all_item_info = True
+        self._invalidate_group_offsets(0)
         self.viewport().update()
 
     item_spacing = property(_get_item_spacing, _set_item_spacing)
@@ -175,6 +214,7 @@ class GroupedListView(QtGui.QAbstractItemView):
         """
         if not index.isValid() or index.parent() != self.rootIndex():
             return False
+        self._apply_pending_row_changes()
         row = index.row()
         if row < len(self._item_info):
             return not self._item_info[row].collapsed
@@ -239,11 +279,13 @@ class GroupedListView(QtGui.QAbstractItemView):
             # can only expand valid root indexes!
             return
 
+        self._apply_pending_row_changes()
         row = index.row()
         if row < len(self._item_info):
             self._item_info[row].collapsed = not expand
             self._item_info[row].dirty = True
             self._update_some_item_info = True
+            self._invalidate_group_offsets(row)
             self.viewport().update()
 
     def dataChanged(self, top_left, bottom_right):
@@ -255,6 +297,7 @@ class GroupedListView(QtGui.QAbstractItemView):
         :param bottom_right:    The bottom-right model index of the data that has changed
         """
         # print "DATA CHANGED [%s] %s -> %s" % (top_left.parent().row(), top_left.row(), bottom_right.row())
+        self._apply_pending_row_changes()
 
         if top_left.parent() == self.rootIndex():
             # data has changed for top-level rows:
@@ -290,19 +333,10 @@ class GroupedListView(QtGui.QAbstractItemView):
         if not self._update_all_item_info:
             if parent_index == self.rootIndex():
                 # inserting root level rows:
-                new_rows = [GroupedListView._ItemInfo() for x in range(end + 1 - start)]
-                self._item_info = (
-                    self._item_info[:start] + new_rows + self._item_info[start:]
-                )
-                self._update_some_item_info = True
+                self._queue_row_change(True, None, start, end)
             elif parent_index.parent() == self.rootIndex():
                 # inserting group level rows:
-                parent_row = parent_index.row()
-                if parent_row < len(self._item_info):
-                    self._item_info[parent_row].dirty = True
-                    self._update_some_item_info = True
-                else:
-                    self._update_all_item_info = True
+                self._queue_row_change(True, parent_index.row(), start, end)
             else:
                 # something went wrong so refresh everything!
                 self._update_all_item_info = True
@@ -330,16 +364,10 @@ class GroupedListView(QtGui.QAbstractItemView):
         if not self._update_all_item_info:
             if parent_index == self.rootIndex():
                 # removing root level rows:
-                self._item_info = self._item_info[:start] + self._item_info[end + 1 :]
-                self._update_some_item_info = True
+                self._queue_row_change(False, None, start, end)
             elif parent_index.parent() == self.rootIndex():
-                # inserting group level rows:
-                parent_row = parent_index.row()
-                if parent_row < len(self._item_info):
-                    self._item_info[parent_row].dirty = True
-                    self._update_some_item_info = True
-                else:
-                    self._update_all_item_info = True
+                # removing group level rows:
+                self._queue_row_change(False, parent_index.row(), start, end)
             else:
                 # something went wrong!
                 self._update_all_item_info = True
@@ -388,6 +416,7 @@ class GroupedListView(QtGui.QAbstractItemView):
             # grandchildren are always hidden:
             return True
 
+        self._apply_pending_row_changes()
         row = parent_index.row()
         if row < len(self._item_info):
             if self._item_info[row].collapsed:
@@ -452,43 +481,34 @@ class GroupedListView(QtGui.QAbstractItemView):
         # convert viewport relative point to global point:
         point = point + QtCore.QPoint(self.horizontalOffset(), self.verticalOffset())
 
+        self._apply_pending_row_changes()
         num_rows = len(self._item_info)
         if num_rows != self.model().rowCount():
             # just in case!
             return QtCore.QModelIndex()
 
-        y_offset = self._border.height()
-        for row, item_info in enumerate(self._item_info):
-
-            # get point in local space:
-            local_point = point + QtCore.QPoint(0, -y_offset)
-
-            if local_point.y() < item_info.rect.y():
-                # point definitely isn't on an item as we'd have found it by now!
-                break
+        # find the group containing the point using the group offsets:
+        row = self._get_group_row_at(point.y())
+        if row is None:
+            return QtCore.QModelIndex()
+        item_info = self._item_info[row]
+        y_offset = self._get_group_offsets()[row]
 
-            # ok, we'll need an index for this row:
-            index = self.model().index(row, 0)
+        # ok, we'll need an index for this row:
+        index = self.model().index(row, 0)
 
-            # check if the point is within this item:
-            if item_info.rect.contains(local_point):
-                return index
+        # check if the point is within the group item:
+        local_point = point + QtCore.QPoint(0, -y_offset)
+        if item_info.rect.contains(local_point):
+            return index
 
-            # update y-offset:
-            y_offset += item_info.rect.height()
-
-            if not item_info.collapsed:
-                # now check children:
-                local_point = point + QtCore.QPoint(0, -y_offset)
-                for child_row, (_, _, child_rect) in enumerate(item_info.child_info):
-                    if child_rect.contains(local_point):
-                        # found a hit on a child item
-                        return self.model().index(child_row, 0, index)
-
-                # update y-offset
-                y_offset += item_info.child_area_rect.height() + self._group_spacing
-            else:
-                y_offset += self._item_spacing.height()
+        if not item_info.collapsed:
+            # now check children:
+            local_point = local_point + QtCore.QPoint(0, -item_info.rect.height())
+            child_row = self._get_child_row_at(item_info, local_point)
+            if child_row is not None:
+                # found a hit on a child item
+                return self.model().index(child_row, 0, index)
 
         # no match so return invalid model index
         return QtCore.QModelIndex()
@@ -511,6 +531,7 @@ class GroupedListView(QtGui.QAbstractItemView):
         index = self.currentIndex()
 
         # check that the item info is up-to-date:
+        self._apply_pending_row_changes()
         if len(self._item_info) != self.model().rowCount():
             return index
 
@@ -680,13 +701,21 @@ class GroupedListView(QtGui.QAbstractItemView):
         # now find which item rectangles intersect this rectangle:
         selection = QtGui.QItemSelection()
 
+        self._apply_pending_row_changes()
         num_rows = len(self._item_info)
         if num_rows != self.model().rowCount():
             # just in case!
             return
 
-        y_offset = self._border.height()
-        for row, item_info in enumerate(self._item_info):
+        # skip straight to the first group that could intersect the selection rect:
+        offsets = self._get_group_offsets()
+        first_row = self._get_group_row_at(selection_rect.top()) or 0
+        for row in range(first_row, num_rows):
+            y_offset = offsets[row]
+            if y_offset > selection_rect.bottom():
+                # no need to look any further!
+                break
+            item_info = self._item_info[row]
 
             # we only allow selection of child items so we can skip testing the group/top level:
             y_offset += item_info.rect.height()
@@ -716,14 +745,6 @@ class GroupedListView(QtGui.QAbstractItemView):
 
                     if top_left:
                         selection.select(top_left, bottom_right)
-                elif local_selection_rect.bottom() > item_info.child_area_rect.top():
-                    # no need to look any further!
-                    pass
-
-                # update y-offset
-                y_offset += item_info.child_area_rect.height() + self._group_spacing
-            else:
-                y_offset += self._item_spacing.height()
 
         # update the selection model:
         self.selectionModel().select(selection, flags)
@@ -769,23 +790,39 @@ class GroupedListView(QtGui.QAbstractItemView):
             )
             return
 
-        # build lookups for the group widgets:
+        # pull out the viewport size and offsets:
+        update_rect = event.rect()
+        viewport_rect = self.viewport().rect()
+        viewport_offset = (-self.horizontalOffset(), -self.verticalOffset())
+
+        # find the range of groups that are visible in the viewport.  The first
+        # visible group is found with a binary search of the group offsets and we
+        # stop as soon as a group starts below the bottom of the viewport:
+        group_offsets = self._get_group_offsets()
+        visible_top = self.verticalOffset()
+        visible_bottom = visible_top + viewport_rect.height()
+        first_row = self._get_group_row_at(visible_top) or 0
+        last_row = first_row
+        while last_row < row_count and group_offsets[last_row] <= visible_bottom:
+            last_row += 1
+
+        # build lookups for the group widgets.  Any widgets that were previously
+        # used for groups outside of the visible range are free to be reused:
         group_widgets_by_row = {}
-        for widget, row in self._group_widget_rows.items():
-            if row < row_count:
-                group_widgets_by_row[row] = widget
         unused_group_widgets = []
         for widget in self._group_widgets:
-            if widget not in group_widgets_by_row.values():
+            row = self._group_widget_rows.get(widget)
+            if row is not None and first_row <= row < last_row:
+                group_widgets_by_row[row] = widget
+            else:
                 unused_group_widgets.append(widget)
         next_unused_group_widget_idx = 0
         self._group_widget_rows = {}
         group_widgets_to_resize = []
 
-        # pull out the viewport size and offsets:
-        update_rect = event.rect()
-        viewport_rect = self.viewport().rect()
-        viewport_offset = (-self.horizontalOffset(), -self.verticalOffset())
+        item_delegate = self.itemDelegate()
+        selection_model = self.selectionModel()
+        current_index = self.currentIndex()
 
         # start painting:
         painter = QtGui.QPainter(self.viewport())
@@ -794,9 +831,9 @@ class GroupedListView(QtGui.QAbstractItemView):
                 QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing
             )
 
-            # keep track of the y-offset as we go:
-            y_offset = self._border.height()
-            for row, item_info in enumerate(self._item_info):
+            for row in range(first_row, last_row):
+                item_info = self._item_info[row]
+                y_offset = group_offsets[row]
 
                 # get valid model index:
                 index = self.model().index(row, 0, self.rootIndex())
@@ -818,8 +855,8 @@ class GroupedListView(QtGui.QAbstractItemView):
                             next_unused_group_widget_idx += 1
                         else:
                             # need to create a new group widget and hook up the signals:
-                            if hasattr(self.itemDelegate(), "create_group_widget"):
-                                grp_widget = self.itemDelegate().create_group_widget(
+                            if hasattr(item_delegate, "create_group_widget"):
+                                grp_widget = item_delegate.create_group_widget(
                                     self.viewport()
                                 )
                             if grp_widget:
@@ -843,58 +880,68 @@ class GroupedListView(QtGui.QAbstractItemView):
                     # group widget is hidden!
                     unused_group_widgets.append(grp_widget)
 
+                if item_info.collapsed or not item_info.child_info:
+                    continue
+
                 # add the group rectangle height to the y-offset
                 y_offset += rect.height()
 
-                if not item_info.collapsed:
-                    # draw any children:
-                    num_child_rows = self.model().rowCount(index)
-                    if len(item_info.child_info) == num_child_rows:
-                        # draw all children
-                        for child_row, (_, _, child_rect) in enumerate(
-                            item_info.child_info
-                        ):
-                            # figure out index and update rect:
-                            child_index = self.model().index(child_row, 0, index)
-
-                            child_rect = child_rect.translated(
-                                viewport_offset[0], viewport_offset[1] + y_offset
-                            )
-                            if not child_rect.isValid or not child_rect.intersects(
-                                update_rect
-                            ):
-                                # no need to draw!
-                                continue
-
-                            # set up the rendering options:
-                            # option = self.viewOptions())
-                            # (AD) - using self.viewOptions() to get the view style options seems
-                            # to return an invalid item in some versions of PySide/PyQt!  I think
-                            # it's returning a QtGui.QStyleOptionViewItem even though the
-                            # underlying C++ object is a QtGui.QStyleOptionViewItemV2 or higher.
-                            #
-                            # This would result in option.rect being corrupt immediately after it
-                            # was set below!
-                            #
-                            # creating the object directly and then using initFrom seems to work
-                            # though.
-                            option = QtGui.QStyleOptionViewItem()
-                            option.initFrom(self)
-
-                            option.rect = child_rect
-
-                            if self.selectionModel().isSelected(child_index):
-                                option.state |= QtGui.QStyle.State_Selected
-                            if child_index == self.currentIndex():
-                                option.state |= QtGui.QStyle.State_HasFocus
-
-                            # draw the widget using the item delegate
-                            self.itemDelegate().paint(painter, option, child_index)
-
-                    # update the y-offset to include the child area:
-                    y_offset += item_info.child_area_rect.height() + self._group_spacing
+                # draw any children:
+                num_child_rows = self.model().rowCount(index)
+                if len(item_info.child_info) != num_child_rows:
+                    continue
+
+                # only draw the children in the visual rows that intersect the
+                # update rect:
+                local_top = update_rect.top() - viewport_offset[1] - y_offset
+                local_bottom = update_rect.bottom() - viewport_offset[1] - y_offset
+                first_layout_row = max(
+                    0, bisect.bisect_right(item_info.layout_row_tops, local_top) - 1
+                )
+                last_layout_row = bisect.bisect_right(
+                    item_info.layout_row_tops, local_bottom
+                )
+                first_child_row = item_info.layout_row_starts[first_layout_row]
+                if last_layout_row < len(item_info.layout_row_starts):
+                    last_child_row = item_info.layout_row_starts[last_layout_row]
                 else:
-                    y_offset += self._item_spacing.height()
+                    last_child_row = num_child_rows
+
+                for child_row in range(first_child_row, last_child_row):
+                    child_rect = item_info.child_info[child_row][2].translated(
+                        viewport_offset[0], viewport_offset[1] + y_offset
+                    )
+                    if not child_rect.isValid or not child_rect.intersects(update_rect):
+                        # no need to draw!
+                        continue
+
+                    # figure out index:
+                    child_index = self.model().index(child_row, 0, index)
+
+                    # set up the rendering options:
+                    # option = self.viewOptions())
+                    # (AD) - using self.viewOptions() to get the view style options seems
+                    # to return an invalid item in some versions of PySide/PyQt!  I think
+                    # it's returning a QtGui.QStyleOptionViewItem even though the
+                    # underlying C++ object is a QtGui.QStyleOptionViewItemV2 or higher.
+                    #
+                    # This would result in option.rect being corrupt immediately after it
+                    # was set below!
+                    #
+                    # creating the object directly and then using initFrom seems to work
+                    # though.
+                    option = QtGui.QStyleOptionViewItem()
+                    option.initFrom(self)
+
+                    option.rect = child_rect
+
+                    if selection_model.isSelected(child_index):
+                        option.state |= QtGui.QStyle.State_Selected
+                    if child_index == current_index:
+                        option.state |= QtGui.QStyle.State_HasFocus
+
+                    # draw the widget using the item delegate
+                    item_delegate.paint(painter, option, child_index)
 
             # hide any group widgets that were not used:
             for w in unused_group_widgets[next_unused_group_widget_idx:]:
@@ -920,6 +967,7 @@ class GroupedListView(QtGui.QAbstractItemView):
                             collapsed
         """
         # get the row that is being expanded:
+        self._apply_pending_row_changes()
         group_widget = self.sender()
         row = self._group_widget_rows.get(group_widget)
         if row == None or row >= len(self._item_info):
@@ -938,12 +986,8 @@ class GroupedListView(QtGui.QAbstractItemView):
         Overriden base method responsible for updating the horizontal and vertical scroll
         bars so that they will correctly scroll the view's viewport.
         """
-        # calculate the maximum height of all visible items in the model:
-        max_height = 0
-        for item_info in self._item_info:
-            max_height += item_info.rect.height() + self._group_spacing
-            if not item_info.collapsed:
-                max_height += item_info.child_area_rect.height()
+        # the total height of all visible items is the last group offset:
+        max_height = self._get_group_offsets()[-1]
 
         self.horizontalScrollBar().setSingleStep(30)
         self.horizontalScrollBar().setPageStep(self.viewport().width())
@@ -965,6 +1009,8 @@ class GroupedListView(QtGui.QAbstractItemView):
         :returns:       A QRect representing the rectangle this index occupies in
                         the view.  This rectangle is viewport relative.
         """
+        self._apply_pending_row_changes()
+
         # first, get the row for each level of the hierarchy (bottom to top)
         rows = []
         while index.isValid() and index != self.rootIndex():
@@ -981,14 +1027,7 @@ class GroupedListView(QtGui.QAbstractItemView):
         root_info = self._item_info[root_row]
 
         # and the Y offset for the start of the root item:
-        y_offset = self._border.height()
-        for row_info in self._item_info[:root_row]:
-            y_offset += row_info.rect.height()
-            if not row_info.collapsed:
-                y_offset += row_info.child_area_rect.height()
-                y_offset += self._group_spacing
-            else:
-                y_offset += self._item_spacing.height()
+        y_offset = self._get_group_offsets()[root_row]
 
         # get the rect for the leaf item:
         rect = QtCore.QRect()
@@ -1010,8 +1049,16 @@ class GroupedListView(QtGui.QAbstractItemView):
         Update the cached item info when needed.  This updates the item layout for any items that have
         been 'dirtied' or if the widget size has changed, etc.
 
+        To keep this fast for large models, size hints are cached per item for the current
+        width bucket and only items in or near the viewport are measured using the delegate.
+        The size of items further away is estimated from the average measured size and then
+        refined as they are scrolled into view.
+
         This is typically run immediately before painting.
         """
+        # apply any row insertions/removals that haven't been processed yet:
+        self._apply_pending_row_changes()
+
         # double check that the item-info list is the correct length.  PyQt doesn't
         # seem to call 'rowsAboutToBeRemoved' when a model is cleared so this list can
         # become out of sync!
@@ -1028,32 +1075,39 @@ class GroupedListView(QtGui.QAbstractItemView):
             viewport_sz.setWidth(viewport_sz.width() - scroll_bar_width)
 
         if viewport_sz != self._prev_viewport_sz:
-            # the viewport width has changed so we'll need to update all geometry :(
+            # the viewport size has changed so we'll need to re-layout everything
+            # although cached size hints can be reused:
             viewport_resized = True
             # keep track of the new viewport size for the next time
             self._prev_viewport_sz = viewport_sz
 
+        # the range of content that should be laid out using real size hints:
+        measure_top, measure_bottom = self._get_measure_range()
+
         if (
             not self._update_some_item_info
             and not self._update_all_item_info
             and not viewport_resized
+            and not self._has_estimated_groups_in_range(measure_top, measure_bottom)
         ):
             # nothing to do!
             return
 
-        # print "%s, %s, %s, %s" % (self._update_all_item_info, self._update_some_item_info, viewport_resized, self._item_info)
-        self._update_all_item_info = self._update_all_item_info or viewport_resized
-
         # if we're updating all item info then may as well clear the existing list:
         if self._update_all_item_info:
             self._item_info = []
+            self._invalidate_group_offsets(0)
+            self._measured_size_total = (0, 0)
+            self._measured_size_count = 0
 
         viewport_width = viewport_sz.width()
         max_width = viewport_width - self._border.width()
         base_view_options = self.viewOptions()
+        size_bucket = viewport_width // GroupedListView._SIZE_HINT_BUCKET_WIDTH
 
         # iterate over root items:
         something_updated = False
+        y_offset = self._border.height()
         for row in range(self.model().rowCount()):
 
             # get the item info for this row - create it if needed!
@@ -1064,20 +1118,50 @@ class GroupedListView(QtGui.QAbstractItemView):
                 item_info = GroupedListView._ItemInfo()
                 self._item_info.append(item_info)
 
-            if not self._update_all_item_info and not item_info.dirty:
+            group_top = y_offset
+            if (
+                not self._update_all_item_info
+                and not viewport_resized
+                and not item_info.dirty
+                and not item_info.layout_dirty
+                and not self._group_needs_refining(
+                    item_info, group_top, measure_top, measure_bottom
+                )
+            ):
                 # no need to update item info!
                 max_width = max(max_width, item_info.child_area_rect.width())
+                y_offset += self._get_group_height(item_info)
                 continue
 
+            # the height of this group may change so offsets of this and all
+            # following groups will need recomputing:
+            self._invalidate_group_offsets(row)
+
             # construct the model index for this row:
             index = self.model().index(row, 0)
+            num_child_rows = self.model().rowCount(index)
+
+            # discard any cached size hints that are no longer valid:
+            if (
+                item_info.dirty
+                or item_info.size_bucket != size_bucket
+                or len(item_info.child_sizes) != num_child_rows
+            ):
+                item_info.header_size = None
+                item_info.child_sizes = [None] * num_child_rows
+            item_info.size_bucket = size_bucket
+            child_sizes = item_info.child_sizes
 
             # get the size of the item:
-            view_options = base_view_options
-            item_size = self.itemDelegate().sizeHint(view_options, index)
+            if item_info.header_size is None:
+                item_info.header_size = self.itemDelegate().sizeHint(
+                    base_view_options, index
+                )
+            item_size = item_info.header_size
             item_info.rect = QtCore.QRect(
                 self._border.width(), 0, item_size.width(), item_size.height()
             )
+            child_area_top = group_top + item_size.height()
 
             # update size info of children:
             row_height = 0
@@ -1087,16 +1171,33 @@ class GroupedListView(QtGui.QAbstractItemView):
             x_pos = left
             y_pos = self._item_spacing.height()
             child_info = []
-            for child_row in range(self.model().rowCount(index)):
-                child_index = self.model().index(child_row, 0, index)
-
-                # do we need to modify the view options?
-                view_options = base_view_options
-
-                # get the item size:
-                child_item_size = self.itemDelegate().sizeHint(
-                    view_options, child_index
-                )
+            layout_row_tops = []
+            layout_row_starts = []
+            estimated = False
+            for child_row in range(num_child_rows):
+
+                # get the item size, either from the cache, by measuring it if
+                # it's close to the viewport or by estimating it:
+                child_item_size = child_sizes[child_row]
+                if child_item_size is None:
+                    estimated_size = self._get_estimated_item_size()
+                    row_top = child_area_top + y_pos
+                    if estimated_size is None or (
+                        not item_info.collapsed
+                        and row_top <= measure_bottom
+                        and row_top + estimated_size.height() >= measure_top
+                    ):
+                        child_index = self.model().index(child_row, 0, index)
+                        child_item_size = self.itemDelegate().sizeHint(
+                            base_view_options, child_index
+                        )
+                        child_sizes[child_row] = child_item_size
+                        self._add_measured_item_size(child_item_size)
+                    else:
+                        # children of collapsed groups are never visible so there
+                        # is no need to refine their estimated size later:
+                        child_item_size = estimated_size
+                        estimated = estimated or not item_info.collapsed
 
                 # see if it fits in the current row:
                 if x_pos == left or (x_pos + child_item_size.width()) < viewport_width:
@@ -1110,6 +1211,11 @@ class GroupedListView(QtGui.QAbstractItemView):
                     relative_column = 0
                     relative_row += 1
 
+                if relative_column == 0:
+                    # first item in a visual row so keep track of where the row starts:
+                    layout_row_tops.append(y_pos)
+                    layout_row_starts.append(child_row)
+
                 # store the item rect:
                 child_item_rect = QtCore.QRect(
                     x_pos, y_pos, child_item_size.width(), child_item_size.height()
@@ -1123,13 +1229,21 @@ class GroupedListView(QtGui.QAbstractItemView):
                 relative_column += 1
 
             item_info.child_info = child_info
+            item_info.layout_row_tops = layout_row_tops
+            item_info.layout_row_starts = layout_row_starts
             item_info.child_area_rect = QtCore.QRect(
                 self._border.width(), 0, max_width, y_pos + row_height
             )
+            item_info.estimated = estimated
+            item_info.measured_range = (
+                (measure_top, measure_bottom) if estimated else None
+            )
 
-            # reset dirty flag for item:
+            # reset dirty flags for item:
             item_info.dirty = False
+            item_info.layout_dirty = False
             something_updated = True
+            y_offset += self._get_group_height(item_info)
 
         # reset flags:
         self._update_all_item_info = False
@@ -1143,3 +1257,237 @@ class GroupedListView(QtGui.QAbstractItemView):
 
             # update scroll bars for the new dimensions:
             self.updateGeometries()
+
+    def _get_measure_range(self):
+        """
+        Return the range of content, in content coordinates, within which items should
+        be laid out using their real size hints.  This is the visible area of the viewport
+        plus a page above and below it so that scrolling doesn't immediately hit estimated
+        items.
+
+        :returns:   A tuple containing the top and bottom of the range
+        """
+        page_height = self.viewport().height()
+        top = self.verticalOffset() - page_height
+        return (top, top + 3 * page_height)
+
+    def _group_needs_refining(self, item_info, group_top, measure_top, measure_bottom):
+        """
+        Determine if a group that was laid out using estimated child sizes needs to be
+        laid out again because it has moved into the measure range.
+
+        :param item_info:       The _ItemInfo instance for the group
+        :param group_top:       The y-offset of the top of the group
+        :param measure_top:     The top of the range that should be measured
+        :param measure_bottom:  The bottom of the range that should be measured
+        :returns:               True if the group should be laid out again
+        """
+        if not item_info.estimated:
+            return False
+        if group_top > measure_bottom:
+            return False
+        if group_top + self._get_group_height(item_info) < measure_top:
+            return False
+        prev_top, prev_bottom = item_info.measured_range
+        return measure_top < prev_top or measure_bottom > prev_bottom
+
+    def _has_estimated_groups_in_range(self, measure_top, measure_bottom):
+        """
+        Check if any of the groups within the specified range need refining.
+
+        :param measure_top:     The top of the range that should be measured
+        :param measure_bottom:  The bottom of the range that should be measured
+        :returns:               True if at least one group needs to be laid out again
+        """
+        offsets = self._get_group_offsets()
+        row = self._get_group_row_at(measure_top) or 0
+        while row < len(self._item_info) and offsets[row] <= measure_bottom:
+            if self._group_needs_refining(
+                self._item_info[row], offsets[row], measure_top, measure_bottom
+            ):
+                return True
+            row += 1
+        return False
+
+    def _add_measured_item_size(self, size):
+        """
+        Add a measured child size to the running totals used for estimating the
+        size of children that haven't been measured.
+
+        :param size:    The QSize that was measured
+        """
+        total_width, total_height = self._measured_size_total
+        self._measured_size_total = (
+            total_width + size.width(),
+            total_height + size.height(),
+        )
+        self._measured_size_count += 1
+
+    def _get_estimated_item_size(self):
+        """
+        Return the estimated size of a child that hasn't been measured yet.
+
+        :returns:   The average size of all children measured so far or None if
+                    no children have been measured yet
+        """
+        if not self._measured_size_count:
+            return None
+        total_width, total_height = self._measured_size_total
+        return QtCore.QSize(
+            total_width // self._measured_size_count,
+            total_height // self._measured_size_count,
+        )
+
+    def _queue_row_change(self, inserted, parent_row, start, end):
+        """
+        Queue up a row insertion or removal to be applied to the item info on the next
+        iteration of the event loop (or sooner if the item info is needed before then).
+
+        :param inserted:    True if the rows were inserted, False if they are being removed
+        :param parent_row:  The row of the parent group or None for root level rows
+        :param start:       The first row that was inserted/will be removed
+        :param end:         The last row that was inserted/will be removed
+        """
+        self._pending_row_changes.append((inserted, parent_row, start, end))
+        if not self._row_changes_timer.isActive():
+            self._row_changes_timer.start()
+
+    def _on_row_changes_timer(self):
+        """
+        Slot triggered when queued row changes should be applied.
+        """
+        self._apply_pending_row_changes()
+        self.viewport().update()
+
+    def _apply_pending_row_changes(self):
+        """
+        Apply all queued row insertions and removals to the item info in the order
+        they happened.  Groups that had children added or removed keep the cached size
+        hints for their other children and are just flagged for re-layout.
+        """
+        if not self._pending_row_changes:
+            return
+        self._row_changes_timer.stop()
+        pending_row_changes = self._pending_row_changes
+        self._pending_row_changes = []
+
+        if self._update_all_item_info:
+            # everything is going to be recomputed anyway!
+            return
+
+        for inserted, parent_row, start, end in pending_row_changes:
+            if parent_row is None:
+                # root level rows:
+                if inserted:
+                    self._item_info[start:start] = [
+                        GroupedListView._ItemInfo() for x in range(end + 1 - start)
+                    ]
+                else:
+                    del self._item_info[start : end + 1]
+                self._invalidate_group_offsets(start)
+            elif parent_row < len(self._item_info):
+                # group level rows:
+                item_info = self._item_info[parent_row]
+                if inserted:
+                    item_info.child_sizes[start:start] = [None] * (end + 1 - start)
+                else:
+                    del item_info.child_sizes[start : end + 1]
+                # the group header may depend on its children so re-measure it:
+                item_info.header_size = None
+                item_info.layout_dirty = True
+            else:
+                # something went wrong so refresh everything!
+                self._update_all_item_info = True
+                break
+
+        self._update_some_item_info = True
+
+    def _invalidate_group_offsets(self, row):
+        """
+        Mark the cached group offsets as stale from the specified group row onwards.
+
+        :param row: The first group row whose offset needs to be recomputed
+        """
+        if self._group_offsets_dirty_row is None or row < self._group_offsets_dirty_row:
+            self._group_offsets_dirty_row = row
+
+    def _get_group_height(self, item_info):
+        """
+        Return the total vertical space taken up by a group, including its children
+        and the spacing that follows it.
+
+        :param item_info:   The _ItemInfo instance for the group
+        :returns:           The height of the group in pixels
+        """
+        height = item_info.rect.height()
+        if not item_info.collapsed:
+            height += item_info.child_area_rect.height() + self._group_spacing
+        else:
+            height += self._item_spacing.height()
+        return height
+
+    def _get_group_offsets(self):
+        """
+        Return the y-offset of the top of each group, recomputing any stale entries first.
+        Only groups from the first dirty row onwards are recomputed.
+
+        :returns:   A list containing the offset for each group followed by the total
+                    height of the content.
+        """
+        if self._group_offsets_dirty_row is not None:
+            first_row = min(
+                self._group_offsets_dirty_row,
+                len(self._group_offsets) - 1,
+                len(self._item_info),
+            )
+            if first_row <= 0:
+                self._group_offsets = [self._border.height()]
+                first_row = 0
+            else:
+                del self._group_offsets[first_row + 1 :]
+
+            y_offset = self._group_offsets[-1]
+            for item_info in self._item_info[first_row:]:
+                y_offset += self._get_group_height(item_info)
+                self._group_offsets.append(y_offset)
+            self._group_offsets_dirty_row = None
+
+        return self._group_offsets
+
+    def _get_group_row_at(self, y):
+        """
+        Find the group containing the specified y position using a binary search
+        of the group offsets.
+
+        :param y:   The y position in content (not viewport) coordinates
+        :returns:   The row of the group or None if the position isn't within a group
+        """
+        offsets = self._get_group_offsets()
+        row = bisect.bisect_right(offsets, y) - 1
+        if row < 0 or row >= len(self._item_info):
+            return None
+        return row
+
+    def _get_child_row_at(self, item_info, local_point):
+        """
+        Find the child item under the specified point within a group's child area.
+
+        :param item_info:   The _ItemInfo instance for the group
+        :param local_point: The QPoint relative to the top of the group's child area
+        :returns:           The row of the child under the point or None if there isn't one
+        """
+        # find the visual row using a binary search of the row positions:
+        layout_row = bisect.bisect_right(item_info.layout_row_tops, local_point.y()) - 1
+        if layout_row < 0:
+            return None
+
+        # and then check the (few) items in that visual row:
+        start = item_info.layout_row_starts[layout_row]
+        if layout_row + 1 < len(item_info.layout_row_starts):
+            end = item_info.layout_row_starts[layout_row + 1]
+        else:
+            end = len(item_info.child_info)
+        for child_row in range(start, end):
+            if item_info.child_info[child_row][2].contains(local_point):
+                return child_row
+        return None
@@ -8,7 +8,9 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-from sgtk.platform.qt import QtGui
+import time
+
+from sgtk.platform.qt import QtCore, QtGui
 
 
 class ShotgunTableView(QtGui.QTableView):
@@ -16,8 +18,35 @@ class ShotgunTableView(QtGui.QTableView):
     A subclass of :class:`~PySide.QtGui.QTableView` that will automatically set
     the column delegates to the appropriate delegate for the type of Shotgun data
     contained in them.
+
+    Column delegates are created the first time their column is visible, and
+    are released again once their column hasn't been visible for
+    ``DELEGATE_RELEASE_TIMEOUT`` seconds. The cells of columns whose display
+    widgets are rendered are cached as pixmaps, up to ``PAINT_CACHE_SIZE``
+    bytes per column.
+
+    :ivar write_edits:  Whether edits are written back to Shotgun in the
+                        background, using the field manager's edit queue.
+    :vartype write_edits: bool
+
+    :ivar bulk_edit:    Whether an edit made to a cell is applied to that column
+                        in all of the selected rows. Clicking a cell of the
+                        selection starts the edit without losing the selection.
+                        When edits are written back to Shotgun, the edits of
+                        all the rows are sent in a single batch.
+    :vartype bulk_edit: bool
     """
 
+    # time in seconds after which the delegate of a column that isn't visible
+    # is released
+    DELEGATE_RELEASE_TIMEOUT = 120
+
+    # how often to check for delegates to release, in milliseconds
+    DELEGATE_RELEASE_INTERVAL = 30000
+
+    # byte budget of the paint cache of each column delegate
+    PAINT_CACHE_SIZE = 16 * 1024 * 1024
+
     def __init__(self, fields_manager, parent=None):
         """
         Constructor
@@ -30,6 +59,22 @@ class ShotgunTableView(QtGui.QTableView):
         """
         QtGui.QTableView.__init__(self, parent)
         self._fields_manager = fields_manager
+        self._write_edits = False
+        self._bulk_edit = False
+
+        # the other indexes to apply the current edit to in bulk edit mode
+        self._bulk_edit_indexes = []
+
+        # the entity type and the field of each column that needs a delegate,
+        # the delegates created so far and when their column was last visible
+        self._entity_type = None
+        self._column_fields = {}
+        self._column_delegates = {}
+        self._column_last_visible = {}
+
+        self._release_timer = QtCore.QTimer(self)
+        self._release_timer.setInterval(self.DELEGATE_RELEASE_INTERVAL)
+        self._release_timer.timeout.connect(self._release_hidden_delegates)
 
         self.setMouseTracking(True)
 
@@ -39,18 +84,281 @@ class ShotgunTableView(QtGui.QTableView):
             | QtGui.QAbstractItemView.EditKeyPressed
         )
 
+    def _get_write_edits(self):
+        """
+        Whether edits are written back to Shotgun.
+        """
+        return self._write_edits
+
+    def _set_write_edits(self, state):
+        self._write_edits = bool(state)
+        for delegate in self._get_field_delegates():
+            self._update_delegate_edit_queue(delegate)
+
+    write_edits = property(_get_write_edits, _set_write_edits)
+
+    def _get_bulk_edit(self):
+        """
+        Whether edits are applied to all of the selected rows.
+        """
+        return self._bulk_edit
+
+    def _set_bulk_edit(self, state):
+        self._bulk_edit = bool(state)
+
+        # Editing on a click in the selection happens before the click changes
+        # the selection, so it can be used to start a bulk edit.
+        if self._bulk_edit:
+            self.setEditTriggers(
+                self.editTriggers() | QtGui.QAbstractItemView.SelectedClicked
+            )
+        else:
+            self.setEditTriggers(
+                self.editTriggers() & ~QtGui.QAbstractItemView.SelectedClicked
+            )
+
+    bulk_edit = property(_get_bulk_edit, _set_bulk_edit)
+
     def setModel(self, model):
         """
         Overrides the base class setModel.  This assumes that the model is a ShotgunModel
         and will set the delegates for each column to the appropriate delegate to display
-        its Shotgun value.
+        its Shotgun value. The delegates are created once their column is visible.
         """
         QtGui.QTableView.setModel(self, model)
 
-        # set the delegates
-        columns_and_fields = model.get_additional_column_fields()
-        for column_info in columns_and_fields:
-            delegate = self._fields_manager.create_delegate(
-                model.get_entity_type(), column_info["field"], self
-            )
-            self.setItemDelegateForColumn(column_info["column_idx"], delegate)
+        # release the delegates of the previous model
+        for column in list(self._column_delegates.keys()):
+            self._release_column_delegate(column)
+
+        # remember which delegate each column needs
+        self._entity_type = model.get_entity_type()
+        self._column_fields = dict(
+            (column_info["column_idx"], column_info["field"])
+            for column_info in model.get_additional_column_fields()
+        )
+
+    def updateGeometries(self):
+        """
+        Overrides the base class updateGeometries to create the delegates of
+        the columns that become visible when the view is resized or its
+        columns are resized, moved, shown or hidden.
+        """
+        QtGui.QTableView.updateGeometries(self)
+        self._ensure_visible_delegates()
+
+    def scrollContentsBy(self, dx, dy):
+        """
+        Overrides the base class scrollContentsBy to create the delegates of
+        the columns scrolled into view before they are painted.
+
+        :param int dx: Horizontal distance scrolled, in pixels.
+        :param int dy: Vertical distance scrolled, in pixels.
+        """
+        QtGui.QTableView.scrollContentsBy(self, dx, dy)
+        if dx:
+            self._ensure_visible_delegates()
+
+    def sizeHintForColumn(self, column):
+        """
+        Overrides the base class sizeHintForColumn to make sure the column's
+        delegate exists before it is asked for sizes.
+
+        :param int column: The column to return the size hint for.
+
+        :returns: The width hint for the column.
+        """
+        if column in self._column_fields:
+            self._ensure_column_delegate(column)
+            self._column_last_visible[column] = time.time()
+        return QtGui.QTableView.sizeHintForColumn(self, column)
+
+    def edit(self, index, trigger=QtGui.QAbstractItemView.AllEditTriggers, event=None):
+        """
+        Overrides the base class edit to remember which rows were selected when
+        an edit starts in bulk edit mode.
+
+        :param index: The index to edit.
+        :type index: :class:`~PySide.QtCore.QModelIndex`
+        :param trigger: The trigger that caused the edit.
+        :param event: The event that caused the edit.
+        :type event: :class:`~PySide.QtCore.QEvent`
+
+        :returns: ``True`` if an editor was opened, ``False`` otherwise.
+        """
+        if index.isValid() and index.column() in self._column_fields:
+            self._ensure_column_delegate(index.column())
+
+        bulk_edit_indexes = []
+        if self._bulk_edit and index.isValid() and self.selectionModel():
+            rows = set(i.row() for i in self.selectionModel().selectedIndexes())
+            if index.row() in rows:
+                rows.discard(index.row())
+                bulk_edit_indexes = [
+                    QtCore.QPersistentModelIndex(index.sibling(row, index.column()))
+                    for row in sorted(rows)
+                ]
+
+        edited = QtGui.QTableView.edit(self, index, trigger, event)
+        if edited:
+            self._bulk_edit_indexes = bulk_edit_indexes
+        return edited
+
+    def commitData(self, editor):
+        """
+        Overrides the base class commitData to apply the editor's value to all
+        of the rows that were selected when the edit started in bulk edit mode.
+
+        :param editor: The editor widget.
+        :type editor: :class:`~PySide.QtGui.QWidget`
+        """
+        QtGui.QTableView.commitData(self, editor)
+
+        bulk_edit_indexes = self._bulk_edit_indexes
+        self._bulk_edit_indexes = []
+
+        for persistent_index in bulk_edit_indexes:
+            if not persistent_index.isValid():
+                # the row has been removed since the edit started
+                continue
+            index = QtCore.QModelIndex(persistent_index)
+            self.itemDelegate(index).setModelData(editor, self.model(), index)
+
+    def closeEditor(self, editor, hint):
+        """
+        Overrides the base class closeEditor to forget the bulk edit rows when
+        an edit is cancelled.
+
+        :param editor: The editor widget.
+        :type editor: :class:`~PySide.QtGui.QWidget`
+        :param hint: Hint for what to do after the editor is closed.
+        """
+        self._bulk_edit_indexes = []
+        QtGui.QTableView.closeEditor(self, editor, hint)
+
+    def _get_field_delegates(self):
+        """
+        Returns the column delegates that support writing edits to Shotgun.
+
+        :returns: A list of delegates
+        """
+        return [
+            delegate
+            for delegate in self._column_delegates.values()
+            if hasattr(delegate, "edit_queue")
+        ]
+
+    def _ensure_column_delegate(self, column):
+        """
+        Creates the delegate for the supplied column if it doesn't exist yet.
+
+        :param int column: The column to create the delegate for.
+        """
+        if column in self._column_delegates:
+            return
+
+        delegate = self._fields_manager.create_delegate(
+            self._entity_type, self._column_fields[column], self
+        )
+        self._update_delegate_edit_queue(delegate)
+        if getattr(delegate, "paint_cacheable", False):
+            delegate.enable_paint_cache(max_bytes=self.PAINT_CACHE_SIZE)
+        self.setItemDelegateForColumn(column, delegate)
+        self._column_delegates[column] = delegate
+
+        if not self._release_timer.isActive():
+            self._release_timer.start()
+
+    def _ensure_visible_delegates(self):
+        """
+        Creates the delegates of the columns shown in the viewport. Delegates
+        are set up ahead of painting, as setting a column's delegate lays the
+        view out again.
+        """
+        if not self._column_fields or not self.model():
+            return
+
+        first_column = self.columnAt(0)
+        if first_column == -1:
+            return
+
+        last_column = self.columnAt(self.viewport().width() - 1)
+        if last_column == -1:
+            last_column = self.model().columnCount() - 1
+
+        now = time.time()
+        for column in range(first_column, last_column + 1):
+            if column in self._column_fields and not self.isColumnHidden(column):
+                self._ensure_column_delegate(column)
+                self._column_last_visible[column] = now
+
+    def _release_column_delegate(self, column):
+        """
+        Releases the delegate of the supplied column.
+
+        :param int column: The column to release the delegate of.
+        """
+        delegate = self._column_delegates.pop(column)
+        self._column_last_visible.pop(column, None)
+
+        self.setItemDelegateForColumn(column, None)
+        if hasattr(delegate, "edit_queue"):
+            delegate.edit_queue = None
+        delegate.deleteLater()
+
+        if not self._column_delegates:
+            self._release_timer.stop()
+
+    def _release_hidden_delegates(self):
+        """
+        Releases the delegates of the columns that haven't been visible for
+        ``DELEGATE_RELEASE_TIMEOUT`` seconds.
+        """
+        editing_column = None
+        if self.state() == QtGui.QAbstractItemView.EditingState:
+            editing_column = self.currentIndex().column()
+
+        now = time.time()
+        expired = now - self.DELEGATE_RELEASE_TIMEOUT
+        for column in list(self._column_delegates.keys()):
+            if column == editing_column:
+                continue
+
+            # the view may not have been scrolled or laid out for a while, so
+            # columns that are on screen count as visible now
+            if self._is_column_on_screen(column):
+                self._column_last_visible[column] = now
+                continue
+
+            if self._column_last_visible.get(column, 0) < expired:
+                self._release_column_delegate(column)
+
+    def _is_column_on_screen(self, column):
+        """
+        Whether the supplied column is shown in the view's viewport.
+
+        :param int column: The column to check.
+        """
+        if not self.isVisible() or self.isColumnHidden(column):
+            return False
+
+        position = self.columnViewportPosition(column)
+        if position == -1:
+            return False
+
+        return (
+            position < self.viewport().width()
+            and position + self.columnWidth(column) > 0
+        )
+
+    def _update_delegate_edit_queue(self, delegate):
+        """
+        Sets the supplied delegate's edit queue depending on whether edits are
+        written back to Shotgun.
+
+        :param delegate: The column delegate to update
+        """
+        if self._write_edits:
+            delegate.edit_queue = self._fields_manager.edit_queue
+        else:
+            delegate.edit_queue = None
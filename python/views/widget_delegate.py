@@ -8,6 +8,7 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import collections
 import weakref
 
 import sgtk
@@ -42,8 +43,134 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
               the :meth:`_create_widget()` method instead of the separate :meth:`_get_painter_widget()`
               and :meth:`_create_editor_widget()` methods.
 
+    Rendering the painter widget for every cell is expensive so, optionally, the rendered
+    cells can be cached as pixmaps by calling :meth:`enable_paint_cache()`.  Cached cells are
+    invalidated when their data changes in the model so this should only be enabled when
+    everything the painter widget displays comes from the model.
     """
 
+    # default byte budget for the paint cache:
+    DEFAULT_PAINT_CACHE_SIZE = 64 * 1024 * 1024
+
+    class _PaintCache(object):
+        """
+        LRU cache of rendered cell pixmaps with a byte budget.  Entries are keyed by:
+
+            (index key, width, height, state, device pixel ratio)
+
+        where the index key is a tuple of the (row, column) hierarchy for the index.  A
+        secondary lookup from index key to cache keys is maintained so that all entries
+        for an index can be invalidated when its data changes.
+        """
+
+        def __init__(self, max_bytes):
+            """
+            :param max_bytes:   The maximum number of bytes of pixmap data to keep in the cache
+            """
+            self.max_bytes = max_bytes
+            self._pixmaps = collections.OrderedDict()
+            self._keys_by_index = {}
+            self._size_bytes = 0
+            self._cache_hits = 0
+            self._cache_misses = 0
+
+        @property
+        def cache_hit_miss_ratio(self):
+            """
+            Useful for debug to see how many cache hits vs misses there are
+            """
+            total_cache_queries = self._cache_hits + self._cache_misses
+            if total_cache_queries > 0:
+                return float(self._cache_hits) / float(total_cache_queries)
+            else:
+                return 0
+
+        @property
+        def stats(self):
+            """
+            A dictionary containing statistics about the cache usage
+            """
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_ratio": self.cache_hit_miss_ratio,
+                "count": len(self._pixmaps),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+        def get(self, key):
+            """
+            Get the cached pixmap for the specified key, marking it as most recently used.
+
+            :param key: The cache key to look up
+            :returns:   The cached QPixmap or None if it isn't in the cache
+            """
+            entry = self._pixmaps.pop(key, None)
+            if entry is None:
+                self._cache_misses += 1
+                return None
+            self._pixmaps[key] = entry
+            self._cache_hits += 1
+            return entry[0]
+
+        def add(self, key, pixmap):
+            """
+            Add a pixmap to the cache, evicting the least recently used entries as needed
+            to stay within the byte budget.
+
+            :param key:     The cache key for the pixmap
+            :param pixmap:  The QPixmap to add
+            """
+            size_bytes = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+            if size_bytes > self.max_bytes:
+                # never going to fit!
+                return
+
+            self._remove(key)
+            self._pixmaps[key] = (pixmap, size_bytes)
+            self._keys_by_index.setdefault(key[0], set()).add(key)
+            self._size_bytes += size_bytes
+
+            while self._size_bytes > self.max_bytes:
+                oldest_key = next(iter(self._pixmaps))
+                self._remove(oldest_key)
+
+        def remove_index(self, index_key):
+            """
+            Remove all entries for the specified index from the cache.
+
+            :param index_key:   The index key to remove entries for
+            """
+            for key in self._keys_by_index.pop(index_key, ()):
+                entry = self._pixmaps.pop(key, None)
+                if entry is not None:
+                    self._size_bytes -= entry[1]
+
+        def clear(self):
+            """
+            Clear the cache
+            """
+            self._pixmaps = collections.OrderedDict()
+            self._keys_by_index = {}
+            self._size_bytes = 0
+
+        def _remove(self, key):
+            """
+            Remove a single entry from the cache.
+
+            :param key: The cache key to remove
+            """
+            entry = self._pixmaps.pop(key, None)
+            if entry is None:
+                return
+            self._size_bytes -= entry[1]
+            index_keys = self._keys_by_index.get(key[0])
+            if index_keys is not None:
+                index_keys.discard(key)
+                if not index_keys:
+                    del self._keys_by_index[key[0]]
+
     def __init__(self, view):
         """
         :param view: The parent view for this delegate
@@ -60,6 +187,10 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
         # help the GC
         self.__editors = []
 
+        # optional cache of rendered cells and the model it's tracking:
+        self.__paint_cache = None
+        self.__paint_cache_model = None
+
     @property
     def view(self):
         """
@@ -71,6 +202,49 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
         """
         return self.parent()
 
+    def enable_paint_cache(self, enable=True, max_bytes=None):
+        """
+        Enable or disable caching of rendered cells.  When enabled, the painter widget is
+        only configured and rendered the first time a cell is painted at a particular size
+        and state and the resulting pixmap is reused until the data for the index changes.
+
+        :param enable:      True if caching should be enabled, False if it should be disabled.
+        :param max_bytes:   The maximum size of the cache in bytes.  Defaults to
+                            :attr:`DEFAULT_PAINT_CACHE_SIZE`.
+        """
+        if max_bytes is None:
+            max_bytes = WidgetDelegate.DEFAULT_PAINT_CACHE_SIZE
+
+        if not enable:
+            self.__track_paint_cache_model(None)
+            self.__paint_cache = None
+        elif self.__paint_cache:
+            self.__paint_cache.max_bytes = max_bytes
+            self.__paint_cache.clear()
+        else:
+            self.__paint_cache = WidgetDelegate._PaintCache(max_bytes)
+
+    def clear_paint_cache(self):
+        """
+        Clear all rendered cells from the paint cache, e.g. if something other than the
+        model data has changed that affects the way cells are painted.
+        """
+        if self.__paint_cache:
+            self.__paint_cache.clear()
+
+    @property
+    def paint_cache_stats(self):
+        """
+        Return statistics about the paint cache usage, useful for tuning the cache size.
+
+        :returns:   A dictionary containing the number of 'hits' and 'misses', the 'hit_ratio',
+                    the number of cached pixmaps ('count') and their total 'size_bytes' as
+                    well as the 'max_bytes' budget, or None if the paint cache isn't enabled.
+        """
+        if not self.__paint_cache:
+            return None
+        return self.__paint_cache.stats
+
     ########################################################################################
     # implemented by deriving classes
 
@@ -226,6 +400,16 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
         :param model_index:     The index in the data model that needs to be painted
         """
 
+        cache_key = None
+        if self.__paint_cache and model_index.isValid():
+            # see if we've already rendered this cell:
+            self.__track_paint_cache_model(model_index.model())
+            cache_key = self.__get_paint_cache_key(painter, style_options, model_index)
+            pixmap = self.__paint_cache.get(cache_key)
+            if pixmap is not None:
+                painter.drawPixmap(style_options.rect.topLeft(), pixmap)
+                return
+
         # for performance reasons, we are not creating a widget every time
         # but merely moving the same widget around.
         paint_widget = self._get_painter_widget(model_index, self.parent())
@@ -241,6 +425,13 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
         # call out to have the widget set the right values
         self._on_before_paint(paint_widget, model_index, style_options)
 
+        if cache_key is not None:
+            # render the widget into a pixmap, cache it and then paint the pixmap:
+            pixmap = self.__render_to_pixmap(paint_widget, style_options, cache_key[-1])
+            self.__paint_cache.add(cache_key, pixmap)
+            painter.drawPixmap(style_options.rect.topLeft(), pixmap)
+            return
+
         # now paint!
         painter.save()
         try:
@@ -267,3 +458,148 @@ class WidgetDelegate(QtGui.QStyledItemDelegate):
                 )
         finally:
             painter.restore()
+
+    def __render_to_pixmap(self, paint_widget, style_options, device_pixel_ratio):
+        """
+        Render the painter widget into a new transparent pixmap.
+
+        :param paint_widget:        The widget to render
+        :param style_options:       The style options to use when painting
+        :param device_pixel_ratio:  The device pixel ratio of the device being painted to
+        :returns:                   A QPixmap containing the rendered widget
+        """
+        size = style_options.rect.size()
+        pixmap = QtGui.QPixmap(size * device_pixel_ratio)
+        if hasattr(pixmap, "setDevicePixelRatio"):
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(QtCore.Qt.transparent)
+
+        paint_widget.resize(size)
+        pixmap_painter = QtGui.QPainter(pixmap)
+        try:
+            if USING_PYQT:
+                paint_widget.render(
+                    pixmap_painter,
+                    QtCore.QPoint(0, 0),
+                    QtGui.QRegion(),
+                    QtGui.QWidget.DrawChildren,
+                )
+            else:
+                paint_widget.render(
+                    pixmap_painter,
+                    QtCore.QPoint(0, 0),
+                    renderFlags=QtGui.QWidget.DrawChildren,
+                )
+        finally:
+            pixmap_painter.end()
+        return pixmap
+
+    def __get_paint_cache_key(self, painter, style_options, model_index):
+        """
+        Build the paint cache key for the specified index and style options.
+
+        :param painter:         The painter that will be used to paint the cell
+        :param style_options:   The style options to use when painting
+        :param model_index:     The index in the data model that needs to be painted
+        :returns:               A hashable key for the paint cache
+        """
+        device_pixel_ratio = 1.0
+        device = painter.device()
+        if hasattr(device, "devicePixelRatioF"):
+            device_pixel_ratio = device.devicePixelRatioF()
+        elif hasattr(device, "devicePixelRatio"):
+            device_pixel_ratio = device.devicePixelRatio()
+
+        return (
+            self.__get_index_key(model_index),
+            style_options.rect.width(),
+            style_options.rect.height(),
+            int(style_options.state),
+            device_pixel_ratio,
+        )
+
+    def __get_index_key(self, model_index):
+        """
+        Return a hashable key identifying the specified index.  QPersistentModelIndex
+        isn't hashable in all versions of PySide so a tuple of the (row, column) hierarchy
+        for the index is used instead.
+
+        :param model_index: The model index to return a key for
+        :returns:           A tuple identifying the index in the model
+        """
+        rows = []
+        while model_index.isValid():
+            rows.append((model_index.row(), model_index.column()))
+            model_index = model_index.parent()
+        return tuple(reversed(rows))
+
+    def __track_paint_cache_model(self, model):
+        """
+        Make sure the paint cache is tracking changes in the specified model, clearing
+        it if the model has changed.
+
+        :param model:   The model to track or None to stop tracking
+        """
+        if model is self.__paint_cache_model:
+            return
+
+        structure_signals = (
+            "modelReset",
+            "layoutChanged",
+            "rowsInserted",
+            "rowsRemoved",
+            "rowsMoved",
+            "columnsInserted",
+            "columnsRemoved",
+            "columnsMoved",
+        )
+        if self.__paint_cache_model:
+            try:
+                self.__paint_cache_model.dataChanged.disconnect(
+                    self.__on_paint_cache_data_changed
+                )
+                for signal_name in structure_signals:
+                    getattr(self.__paint_cache_model, signal_name).disconnect(
+                        self.__on_paint_cache_structure_changed
+                    )
+            except (RuntimeError, TypeError):
+                # the model may already have been destroyed!
+                pass
+
+        self.__paint_cache_model = model
+        if self.__paint_cache:
+            self.__paint_cache.clear()
+
+        if model:
+            model.dataChanged.connect(self.__on_paint_cache_data_changed)
+            for signal_name in structure_signals:
+                getattr(model, signal_name).connect(
+                    self.__on_paint_cache_structure_changed
+                )
+
+    def __on_paint_cache_data_changed(self, top_left, bottom_right, *args):
+        """
+        Slot triggered when data changes in the model - removes any cached cells for the
+        changed indexes.
+
+        :param top_left:        The top-left model index of the data that has changed
+        :param bottom_right:    The bottom-right model index of the data that has changed
+        """
+        if not self.__paint_cache:
+            return
+        if not top_left.isValid() or not bottom_right.isValid():
+            self.__paint_cache.clear()
+            return
+
+        parent_key = self.__get_index_key(top_left.parent())
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                self.__paint_cache.remove_index(parent_key + ((row, column),))
+
+    def __on_paint_cache_structure_changed(self, *args):
+        """
+        Slot triggered when the structure of the model changes.  Cache keys are based on
+        the row hierarchy so the whole cache is invalidated.
+        """
+        if self.__paint_cache:
+            self.__paint_cache.clear()
@@ -0,0 +1,132 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import time
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestCardDelegate(TankTestBase):
+    """
+    Benchmarks the selection checks done when the entity card delegate paints.
+    """
+
+    # number of rows painted
+    ROW_COUNT = 1000
+
+    # number of times the rows are painted to time them
+    PASS_COUNT = 5
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework.
+        """
+        super(TestCardDelegate, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        version_details = fw.import_module("version_details")
+        self._delegate_class = (
+            version_details.shotgun_entities.ShotgunEntityCardDelegate
+        )
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self.engine.destroy()
+        super(TestCardDelegate, self).tearDown()
+
+    def _time_paint(self, selected_count):
+        """
+        Calls the delegate's paint preparation for every row of a view with
+        the supplied number of selected rows.
+
+        :param int selected_count: Number of rows to select.
+
+        :returns: A tuple of the average time to prepare every row in seconds,
+            the number of rows painted as selected and the number of times the
+            list of selected indexes was requested.
+        """
+        QtGui = sgtk.platform.qt.QtGui
+
+        requests = []
+
+        class CountingSelectionModel(QtGui.QItemSelectionModel):
+            def selectedIndexes(self):
+                requests.append(None)
+                return super(CountingSelectionModel, self).selectedIndexes()
+
+        class PainterWidget(object):
+            def __init__(self):
+                self.entity = None
+                self.selected = 0
+
+            def set_selected(self, selected):
+                if selected:
+                    self.selected += 1
+
+        model = QtGui.QStandardItemModel()
+        for row in range(self.ROW_COUNT):
+            model.appendRow(QtGui.QStandardItem("Version %d" % row))
+
+        view = QtGui.QListView()
+        view.setModel(model)
+        selection_model = CountingSelectionModel(model, view)
+        view.setSelectionModel(selection_model)
+        if selected_count:
+            selection_model.select(
+                QtGui.QItemSelection(
+                    model.index(0, 0), model.index(selected_count - 1, 0)
+                ),
+                QtGui.QItemSelectionModel.Select,
+            )
+
+        # the delegate is created once the selection is set up so that it
+        # doesn't open an editor for it
+        delegate = self._delegate_class(view)
+        widget = PainterWidget()
+        option = QtGui.QStyleOptionViewItem()
+        indexes = [model.index(row, 0) for row in range(self.ROW_COUNT)]
+
+        start = time.time()
+        for _ in range(self.PASS_COUNT):
+            for index in indexes:
+                delegate._on_before_paint(widget, index, option)
+        paint_time = (time.time() - start) / self.PASS_COUNT
+
+        view.deleteLater()
+        return (paint_time, widget.selected // self.PASS_COUNT, len(requests))
+
+    def test_selection_checks(self):
+        """
+        Ensure painting rows doesn't get slower with the number of selected
+        rows.
+        """
+        (unselected_time, selected, requests) = self._time_paint(0)
+        self.assertEqual(selected, 0)
+
+        (selected_time, selected, requests) = self._time_paint(500)
+        self.assertEqual(selected, 500)
+
+        # the selection list isn't built for each row
+        self.assertEqual(requests, 0)
+
+        # searching the list of 500 selected indexes for each row would take
+        # several hundred times longer. allow for timing noise on busy machines.
+        self.assertLess(selected_time, unselected_time * 5 + 0.01)
@@ -0,0 +1,148 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import time
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestGroupedListView(TankTestBase):
+    """
+    Benchmarks the painting of the grouped list view.
+    """
+
+    # number of children in each group
+    CHILDREN_PER_GROUP = 10
+
+    # number of frames painted to time a view
+    FRAME_COUNT = 20
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework.
+        """
+        super(TestGroupedListView, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        self._views = fw.import_module("views")
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self.engine.destroy()
+        super(TestGroupedListView, self).tearDown()
+
+    def _create_view(self, group_count):
+        """
+        Creates a view showing a model with the supplied number of groups.
+
+        :param int group_count: Number of groups in the model.
+
+        :returns: A tuple of the view and the list painted children are
+            appended to.
+        """
+        QtCore = sgtk.platform.qt.QtCore
+        QtGui = sgtk.platform.qt.QtGui
+
+        painted = []
+
+        class CountingDelegate(self._views.GroupedListViewItemDelegate):
+            def sizeHint(self, style_options, model_index):
+                if model_index.parent() == self.view.rootIndex():
+                    return super(CountingDelegate, self).sizeHint(
+                        style_options, model_index
+                    )
+                return QtCore.QSize(80, 20)
+
+            def paint(self, painter, style_options, model_index):
+                painted.append(model_index.row())
+
+        model = QtGui.QStandardItemModel()
+        for group in range(group_count):
+            group_item = QtGui.QStandardItem("Group %d" % group)
+            group_item.appendRows(
+                [
+                    QtGui.QStandardItem("Item %d" % child)
+                    for child in range(self.CHILDREN_PER_GROUP)
+                ]
+            )
+            model.appendRow(group_item)
+
+        view = self._views.GroupedListView(None)
+        view.setItemDelegate(CountingDelegate(view))
+        view.setModel(model)
+        for group in range(group_count):
+            view.expand(model.index(group, 0))
+        view.resize(400, 300)
+        view.show()
+        self._app.processEvents()
+
+        # the first paint lays the items out
+        view.viewport().repaint()
+        return (view, painted)
+
+    def _time_frames(self, view, painted):
+        """
+        Repaints the view a number of times.
+
+        :param view: The view to paint.
+        :param list painted: The list painted children are appended to.
+
+        :returns: A tuple of the average frame time in seconds and the number
+            of children painted per frame.
+        """
+        del painted[:]
+        start = time.time()
+        for _ in range(self.FRAME_COUNT):
+            view.viewport().repaint()
+        frame_time = (time.time() - start) / self.FRAME_COUNT
+        return (frame_time, len(painted) // self.FRAME_COUNT)
+
+    def test_paint_visible_range(self):
+        """
+        Ensure the time to paint a frame doesn't grow with the number of groups
+        outside of the viewport.
+        """
+        results = {}
+        for group_count in (10, 1000):
+            (view, painted) = self._create_view(group_count)
+            try:
+                # scroll half way down so that groups before and after the
+                # viewport are skipped
+                view.verticalScrollBar().setValue(
+                    view.verticalScrollBar().maximum() // 2
+                )
+                self._app.processEvents()
+                results[group_count] = self._time_frames(view, painted)
+            finally:
+                view.close()
+                view.deleteLater()
+
+        (small_frame_time, small_painted) = results[10]
+        (large_frame_time, large_painted) = results[1000]
+
+        # only the children in the viewport are painted
+        self.assertGreater(large_painted, 0)
+        self.assertLessEqual(large_painted, small_painted + 2 * self.CHILDREN_PER_GROUP)
+
+        # a hundred times more groups would take in the order of a hundred
+        # times longer to paint if every group was visited. allow for timing
+        # noise on busy machines.
+        self.assertLess(large_frame_time, small_frame_time * 10 + 0.005)
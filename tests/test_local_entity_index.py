@@ -0,0 +1,234 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import datetime
+import os
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestLocalEntityIndex(TankTestBase):
+    """
+    Tests for the local entity index used by the global search completer.
+    """
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework and an
+        empty index.
+        """
+        super(TestLocalEntityIndex, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        search_completer = fw.import_module("search_completer")
+        self._index = search_completer.LocalEntityIndex(
+            cache_path=os.path.join(self.tank_temp, "search_index.sqlite")
+        )
+
+        self._updated_at = datetime.datetime(2020, 1, 1)
+        self._criteria = {"Shot": [["sg_status_list", "is", "ip"]]}
+        self._project_ids = [self.project["id"]]
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self._index.destroy()
+        self.engine.destroy()
+        super(TestLocalEntityIndex, self).tearDown()
+
+    def _add_shots(self, names, status="ip"):
+        """
+        Adds shots with the supplied names to the mocked Shotgun database.
+
+        :param list names: Names of the shots.
+        :param str status: Status of the shots.
+
+        :returns: The list of shot dictionaries.
+        """
+        shots = [
+            {
+                "type": "Shot",
+                "id": 1000 + i,
+                "code": name,
+                "sg_status_list": status,
+                "project": self.project,
+                "updated_at": self._updated_at,
+            }
+            for (i, name) in enumerate(names)
+        ]
+        self.add_to_sg_mock_db(shots)
+        return shots
+
+    def _sync(self):
+        """
+        Synchronizes the index with the mocked Shotgun database, one page at a
+        time, the way the background requests would.
+
+        :returns: The number of pages fetched.
+        """
+        scope = self._index._get_scope(
+            "Shot", self._criteria["Shot"], self._project_ids
+        )
+        data = {
+            "scope": scope,
+            "entity_type": "Shot",
+            "filters": self._criteria["Shot"],
+            "project_ids": self._project_ids,
+            "fields": None,
+        }
+        pages = 0
+        while True:
+            pages += 1
+            result = self._index._sync_page(self.mockgun, data)
+            data["fields"] = result["fields"]
+            if result["count"] < self._index.SYNC_BATCH_SIZE:
+                return pages
+
+    def _search(self, text):
+        """
+        Searches the index for the shots matching the test criteria.
+
+        :param str text: Text to search for.
+
+        :returns: The sorted names of the matching shots.
+        """
+        matches = self._index.search(text, self._criteria, self._project_ids)
+        return sorted(match["name"] for match in matches)
+
+    def test_sync_paging(self):
+        """
+        Ensure every entity is indexed when they span several pages, including
+        entities sharing the same update time.
+        """
+        self._index.SYNC_BATCH_SIZE = 2
+        self._add_shots(["shot_%03d" % i for i in range(5)])
+
+        self.assertEqual(self._sync(), 3)
+        self.assertEqual(len(self._search("shot")), 5)
+
+        # nothing has changed so a new synchronization starts where the last
+        # one ended
+        self.assertEqual(self._sync(), 1)
+        self.assertEqual(len(self._search("shot")), 5)
+
+    def test_search(self):
+        """
+        Ensure names are matched on any part of them, on each word of the text
+        and that names starting with the text come first.
+        """
+        self._add_shots(["bunny_010", "big_bunny", "rabbit_010", "bu"])
+        self._sync()
+
+        self.assertEqual(self._search("bunny"), ["big_bunny", "bunny_010"])
+        self.assertEqual(self._search("010"), ["bunny_010", "rabbit_010"])
+        self.assertEqual(self._search("bun 010"), ["bunny_010"])
+        # shorter than a trigram
+        self.assertEqual(self._search("bu"), ["big_bunny", "bu", "bunny_010"])
+        self.assertEqual(self._search("horse"), [])
+
+        matches = self._index.search("bunny", self._criteria, self._project_ids)
+        self.assertEqual(matches[0]["name"], "bunny_010")
+        self.assertEqual(matches[0]["type"], "Shot")
+        self.assertEqual(matches[0]["project_id"], self.project["id"])
+
+        # like wildcards are matched literally
+        self.assertEqual(self._search("%"), [])
+
+    def test_scope_keys(self):
+        """
+        Ensure entities are indexed separately for each search criteria and
+        that the order of the project ids doesn't matter.
+        """
+        self.assertEqual(
+            self._index._get_scope("Shot", [], [2, 1]),
+            self._index._get_scope("Shot", [], [1, 2]),
+        )
+        self.assertNotEqual(
+            self._index._get_scope("Shot", [], [1]),
+            self._index._get_scope("Shot", [], [1, 2]),
+        )
+        self.assertNotEqual(
+            self._index._get_scope("Shot", [], [1]),
+            self._index._get_scope("Shot", [["code", "is", "a"]], [1]),
+        )
+        self.assertNotEqual(
+            self._index._get_scope("Shot", [], [1]),
+            self._index._get_scope("Asset", [], [1]),
+        )
+
+        self._add_shots(["shot_010"])
+        self._sync()
+
+        # criteria that haven't been indexed aren't searched
+        self.assertIsNone(self._index.search("shot", {"Shot": []}, self._project_ids))
+        self.assertIsNone(self._index.search("shot", self._criteria, [12345]))
+        self.assertEqual(self._search("shot"), ["shot_010"])
+
+    def test_expire_entities(self):
+        """
+        Ensure entities that stop matching the filters are removed from the
+        index.
+        """
+        shots = self._add_shots(["shot_010", "shot_020"])
+        self._sync()
+        self.assertEqual(self._search("shot"), ["shot_010", "shot_020"])
+
+        self.mockgun.update(
+            "Shot",
+            shots[0]["id"],
+            {
+                "sg_status_list": "omt",
+                "updated_at": self._updated_at + datetime.timedelta(days=1),
+            },
+        )
+        self._sync()
+        self.assertEqual(self._search("shot"), ["shot_020"])
+
+    def test_clear(self):
+        """
+        Ensure clearing the index removes every entity.
+        """
+        self._add_shots(["shot_010"])
+        self._sync()
+        self._index.clear()
+        self.assertIsNone(self._index.search("shot", self._criteria, self._project_ids))
+
+    def test_clear_during_sync(self):
+        """
+        Ensure a page fetched while the index is cleared isn't written, so that
+        the next synchronization starts from the beginning.
+        """
+        self._index.SYNC_BATCH_SIZE = 2
+        self._add_shots(["shot_%03d" % i for i in range(4)])
+        self._sync()
+
+        find = self.mockgun.find
+
+        def find_and_clear(*args, **kwargs):
+            self.mockgun.find = find
+            self._index.clear()
+            return find(*args, **kwargs)
+
+        self.mockgun.find = find_and_clear
+        self._sync()
+        self.assertIsNone(self._index.search("shot", self._criteria, self._project_ids))
+
+        self.assertEqual(self._sync(), 3)
+        self.assertEqual(len(self._search("shot")), 4)
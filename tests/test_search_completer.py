@@ -0,0 +1,310 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestSearchCompleter(TankTestBase):
+    """
+    Tests for the search completers, driven by a stub data retriever.
+    """
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework and a
+        global search completer using a stub data retriever.
+        """
+        super(TestSearchCompleter, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        self._search_completer = fw.import_module("search_completer")
+
+        # start every test with empty caches
+        SearchCompleter = self._search_completer.search_completer.SearchCompleter
+        SearchCompleter._result_cache = None
+        SearchCompleter._thumbnail_cache = None
+
+        self._data_retriever = self._create_data_retriever()
+        self._completer = self._search_completer.GlobalSearchCompleter()
+        self._completer.set_data_retriever(self._data_retriever)
+        self._completer.set_searchable_entity_types({"Shot": []})
+        self._completer.search_delay = 0
+
+        # don't rank the results by the recent selections of the user running
+        # the tests
+        self._completer._ranker._recent_selections = []
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self._completer.destroy()
+        self.engine.destroy()
+        super(TestSearchCompleter, self).tearDown()
+
+    def _create_data_retriever(self):
+        """
+        Returns a data retriever that records the requests made to it instead
+        of running them.
+        """
+        QtCore = sgtk.platform.qt.QtCore
+
+        class StubDataRetriever(QtCore.QObject):
+            work_completed = QtCore.Signal(str, str, object)
+            work_failure = QtCore.Signal(str, str)
+
+            def __init__(self):
+                super(StubDataRetriever, self).__init__()
+                self.requests = []
+
+            def _request(self, *args):
+                self.requests.append(args)
+                return str(len(self.requests))
+
+            def request_thumbnail(self, url, entity_type, entity_id, field, **kwargs):
+                return self._request("thumbnail", url, entity_type, entity_id)
+
+            def execute_text_search(self, text, entity_types, project_ids):
+                return self._request("text_search", text, entity_types)
+
+            def stop_work(self, uid):
+                pass
+
+            def clear(self):
+                pass
+
+            def stop(self):
+                pass
+
+        return StubDataRetriever()
+
+    def _get_match(self, entity_id, name, image=None):
+        """
+        Returns a Shot match in the format returned by the Shotgun text search.
+        """
+        return {
+            "type": "Shot",
+            "id": entity_id,
+            "name": name,
+            "project_id": self.project["id"],
+            "status": None,
+            "links": [],
+            "image": image,
+        }
+
+    def _get_search_requests(self):
+        """
+        Returns the text searches requested from the data retriever.
+        """
+        return [
+            request
+            for request in self._data_retriever.requests
+            if request[0] == "text_search"
+        ]
+
+    def _complete_search(self, matches):
+        """
+        Completes the last text search requested with the supplied matches.
+
+        :param list matches: Matches returned by the text search.
+        """
+        self._data_retriever.work_completed.emit(
+            str(len(self._data_retriever.requests)),
+            "text_search",
+            {"sg": {"terms": [], "matches": matches}},
+        )
+
+    def _get_results(self):
+        """
+        Returns the names of the results listed by the completer, or ``None``
+        if it shows that results are loading.
+        """
+        model = self._completer.model()
+        modes = [
+            model.index(row, 0).data(self._completer.MODE_ROLE)
+            for row in range(model.rowCount())
+        ]
+        if self._completer.MODE_LOADING in modes:
+            return None
+        return [
+            model.index(row, 0).data()
+            for (row, mode) in enumerate(modes)
+            if mode == self._completer.MODE_RESULT
+        ]
+
+    def test_result_cache_eviction(self):
+        """
+        Ensure the least recently used results are evicted from the cache.
+        """
+        cache = self._search_completer.search_completer.SearchCompleter._ResultCache(
+            2, 60
+        )
+        cache.add("a", 1)
+        cache.add("b", 2)
+        self.assertEqual(cache.get("a"), (1, False))
+        cache.add("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (1, False))
+        self.assertEqual(cache.get("c"), (3, False))
+
+    def test_fresh_results(self):
+        """
+        Ensure fresh cached results are shown without searching again.
+        """
+        self._completer.search("shot")
+        self.assertEqual(len(self._get_search_requests()), 1)
+        self.assertIsNone(self._get_results())
+        self._complete_search([self._get_match(1, "shot_010")])
+        self.assertEqual(self._get_results(), ["shot_010"])
+
+        self._completer.search("bunny")
+        self._complete_search([self._get_match(2, "bunny_010")])
+
+        self._completer.search("shot")
+        self.assertEqual(len(self._get_search_requests()), 2)
+        self.assertEqual(self._get_results(), ["shot_010"])
+
+    def test_stale_results(self):
+        """
+        Ensure stale cached results are shown while they are searched for again
+        and replaced by the new results.
+        """
+        self._completer.search("shot")
+        self._complete_search([self._get_match(1, "shot_010")])
+
+        self._completer._result_cache._ttl = -1
+        self._completer.search("shot")
+        self.assertEqual(len(self._get_search_requests()), 2)
+        self.assertEqual(self._get_results(), ["shot_010"])
+
+        self._complete_search(
+            [self._get_match(1, "shot_010"), self._get_match(2, "shot_020")]
+        )
+        self.assertEqual(self._get_results(), ["shot_010", "shot_020"])
+
+    def test_evicted_results(self):
+        """
+        Ensure results evicted from the cache are searched for again.
+        """
+        self._completer._result_cache._max_entries = 1
+
+        self._completer.search("shot")
+        self._complete_search([self._get_match(1, "shot_010")])
+        self._completer.search("bunny")
+        self._complete_search([self._get_match(2, "bunny_010")])
+
+        self._completer.search("shot")
+        self.assertEqual(len(self._get_search_requests()), 3)
+        self.assertIsNone(self._get_results())
+        self._complete_search([self._get_match(1, "shot_010")])
+        self.assertEqual(self._get_results(), ["shot_010"])
+
+    def test_refined_results(self):
+        """
+        Ensure the results of a search are refined for a longer text, and only
+        confirmed by another search if asked to.
+        """
+        self._completer.search("sho")
+        self._complete_search(
+            [
+                self._get_match(1, "shot_010"),
+                self._get_match(2, "shot_020"),
+                self._get_match(3, "show_a"),
+            ]
+        )
+
+        self._completer.search("shot")
+        self.assertEqual(self._get_results(), ["shot_010", "shot_020"])
+        self.assertEqual(len(self._get_search_requests()), 2)
+        self._complete_search(
+            [self._get_match(1, "shot_010"), self._get_match(2, "shot_020")]
+        )
+
+        self._completer.confirm_refined_results = False
+        self._completer.search("shot_01")
+        self.assertEqual(self._get_results(), ["shot_010"])
+        self.assertEqual(len(self._get_search_requests()), 2)
+
+    def test_truncated_results(self):
+        """
+        Ensure results that may have been truncated aren't refined.
+        """
+        limit = self._completer.TEXT_SEARCH_RESULT_LIMIT
+        self._completer.search("sho")
+        self._complete_search(
+            [self._get_match(i, "shot_%03d" % i) for i in range(limit)]
+        )
+
+        self._completer.search("shot")
+        self.assertIsNone(self._get_results())
+        self.assertEqual(len(self._get_search_requests()), 2)
+
+        data = {
+            "sg": {"terms": [], "matches": [self._get_match(1, "shot_010")]},
+            "truncated": True,
+        }
+        self.assertIsNone(self._completer._refine_search_results(data, "shot"))
+
+    def test_refined_criteria_change(self):
+        """
+        Ensure results aren't refined once the search criteria have changed.
+        """
+        self._completer.search("sho")
+        self._complete_search([self._get_match(1, "shot_010")])
+
+        criteria = {"Shot": [["sg_status_list", "is", "ip"]]}
+        self._completer.set_searchable_entity_types(criteria)
+        self._completer.search("shot")
+        self.assertIsNone(self._get_results())
+        self.assertEqual(
+            self._get_search_requests(),
+            [("text_search", "sho", {"Shot": []}), ("text_search", "shot", criteria)],
+        )
+
+    def test_thumbnail_request_reuse(self):
+        """
+        Ensure results sharing a thumbnail share its request, and that the
+        composited thumbnail is reused for urls signed differently.
+        """
+        QtGui = sgtk.platform.qt.QtGui
+
+        url = "https://example.com/thumbs/shot_010.jpg"
+        first = self._completer._create_result_item(
+            self._get_match(1, "shot_010", url + "?Expires=1&Signature=a")
+        )
+        second = self._completer._create_result_item(
+            self._get_match(2, "shot_010_v2", url + "?Expires=2&Signature=b")
+        )
+
+        # a single request for both results
+        self.assertEqual(len(self._data_retriever.requests), 1)
+
+        image = QtGui.QImage(16, 16, QtGui.QImage.Format_ARGB32)
+        image.fill(0)
+        self._data_retriever.work_completed.emit("1", "thumbnail", {"image": image})
+        self.assertEqual(
+            first.icon().cacheKey(), second.icon().cacheKey(),
+        )
+
+        # the thumbnail is now cached, whatever the signature of its url
+        third = self._completer._create_result_item(
+            self._get_match(3, "shot_010_v3", url + "?Expires=3&Signature=c")
+        )
+        self.assertEqual(len(self._data_retriever.requests), 1)
+        self.assertEqual(third.icon().cacheKey(), first.icon().cacheKey())
@@ -0,0 +1,120 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import time
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestSearchResultRanker(TankTestBase):
+    """
+    Tests and benchmarks the ranking of global search matches.
+    """
+
+    # number of matches ranked per keystroke by the benchmark
+    MATCH_COUNT = 300
+
+    # maximum average time in seconds to rank the matches of a keystroke
+    MAX_RANK_TIME = 0.02
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework.
+        """
+        super(TestSearchResultRanker, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        search_completer = fw.import_module("search_completer")
+        self._ranker = search_completer.SearchResultRanker()
+
+        # don't read or write the recent selections of the user running the
+        # tests
+        self._ranker._recent_selections = []
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self.engine.destroy()
+        super(TestSearchResultRanker, self).tearDown()
+
+    def _get_match(self, entity_type, entity_id, name, project_id=None):
+        """
+        Returns a match in the format returned by the Shotgun text search.
+        """
+        return {
+            "type": entity_type,
+            "id": entity_id,
+            "name": name,
+            "project_id": project_id,
+            "status": None,
+            "links": [],
+            "image": None,
+        }
+
+    def test_rank(self):
+        """
+        Ensure matches are ordered by how well their name matches the text,
+        then by entity type.
+        """
+        matches = [
+            self._get_match("Shot", 1, "big_bunny_010"),
+            self._get_match("Group", 2, "bunny"),
+            self._get_match("Shot", 3, "bunny_010"),
+            self._get_match("ApiUser", 4, "bunny_script"),
+            self._get_match("Shot", 5, "rabbitbunny"),
+            self._get_match("Shot", 6, "bunny"),
+        ]
+        ranked = self._ranker.rank(matches, "bunny")
+        self.assertEqual([match["id"] for match in ranked], [6, 2, 3, 4, 1, 5])
+
+    def test_project_affinity(self):
+        """
+        Ensure matches in the current project are ranked first.
+        """
+        matches = [
+            self._get_match("Shot", 1, "shot_010", project_id=self.project["id"] + 1),
+            self._get_match("Shot", 2, "shot_010", project_id=self.project["id"]),
+        ]
+        ranked = self._ranker.rank(matches, "shot")
+        self.assertEqual([match["id"] for match in ranked], [2, 1])
+
+    def test_rank_time(self):
+        """
+        Ensure a few hundred matches can be ranked for every keystroke.
+        """
+        entity_types = list(self._ranker.entity_type_weights.keys())
+        matches = [
+            self._get_match(
+                entity_types[i % len(entity_types)],
+                i,
+                "seq_%03d_shot_%04d_comp" % (i % 20, i),
+                project_id=self.project["id"] + i % 2,
+            )
+            for i in range(self.MATCH_COUNT)
+        ]
+
+        text = "shot 01 comp"
+        start = time.time()
+        for length in range(1, len(text) + 1):
+            ranked = self._ranker.rank(matches, text[:length])
+            self.assertEqual(len(ranked), self.MATCH_COUNT)
+        rank_time = (time.time() - start) / len(text)
+
+        self.assertLess(rank_time, self.MAX_RANK_TIME)
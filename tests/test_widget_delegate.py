@@ -0,0 +1,168 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+
+class TestWidgetDelegate(TankTestBase):
+    """
+    Tests the cache of rendered cells of the widget delegate.
+    """
+
+    # size of the painted cells
+    CELL_WIDTH = 40
+    CELL_HEIGHT = 20
+
+    def setUp(self):
+        """
+        Prepare a configuration with a config that uses the framework.
+        """
+        super(TestWidgetDelegate, self).setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = sgtk.platform.qt.QtGui.QApplication.instance() or sgtk.platform.qt.QtGui.QApplication(
+            []
+        )
+
+        fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        self._views = fw.import_module("views")
+
+    def tearDown(self):
+        """
+        Terminate the engine and the rest of the test suite.
+        """
+        self.engine.destroy()
+        super(TestWidgetDelegate, self).tearDown()
+
+    def _create_delegate(self):
+        """
+        Creates a delegate rendering a label, with its paint cache enabled, for
+        a view showing a model with two rows.
+
+        :returns: A tuple of the delegate, the model and the list the text of
+            the rendered cells is appended to.
+        """
+        QtGui = sgtk.platform.qt.QtGui
+
+        rendered = []
+
+        class LabelDelegate(self._views.WidgetDelegate):
+            def _create_widget(self, parent):
+                return QtGui.QLabel(parent)
+
+            def _on_before_paint(self, widget, model_index, style_options):
+                rendered.append(model_index.data())
+                widget.setText(model_index.data())
+
+        model = QtGui.QStandardItemModel()
+        model.appendRow(QtGui.QStandardItem("shot_010"))
+        model.appendRow(QtGui.QStandardItem("shot_020"))
+
+        view = QtGui.QTableView()
+        view.setModel(model)
+        self.addCleanup(view.deleteLater)
+
+        delegate = LabelDelegate(view)
+        delegate.enable_paint_cache()
+        return (delegate, model, rendered)
+
+    def _paint(self, delegate, model_index):
+        """
+        Paints the cell of the supplied index with the supplied delegate.
+        """
+        QtCore = sgtk.platform.qt.QtCore
+        QtGui = sgtk.platform.qt.QtGui
+
+        pixmap = QtGui.QPixmap(self.CELL_WIDTH, self.CELL_HEIGHT)
+        option = QtGui.QStyleOptionViewItem()
+        option.rect = QtCore.QRect(0, 0, self.CELL_WIDTH, self.CELL_HEIGHT)
+        painter = QtGui.QPainter(pixmap)
+        try:
+            delegate.paint(painter, option, model_index)
+        finally:
+            painter.end()
+
+    def test_data_changed(self):
+        """
+        Ensure cells are rendered once, until their data changes.
+        """
+        QtGui = sgtk.platform.qt.QtGui
+
+        (delegate, model, rendered) = self._create_delegate()
+        first = model.index(0, 0)
+        second = model.index(1, 0)
+
+        self._paint(delegate, first)
+        self._paint(delegate, second)
+        self._paint(delegate, first)
+        self._paint(delegate, second)
+        self.assertEqual(rendered, ["shot_010", "shot_020"])
+
+        # only the changed cell is rendered again
+        model.setData(first, "shot_011")
+        self._paint(delegate, first)
+        self._paint(delegate, second)
+        self.assertEqual(rendered, ["shot_010", "shot_020", "shot_011"])
+
+        stats = delegate.paint_cache_stats
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["count"], 2)
+
+        # the rows are keyed by position, so any change to the structure of
+        # the model clears the cache
+        model.insertRow(0, QtGui.QStandardItem("shot_005"))
+        self.assertEqual(delegate.paint_cache_stats["count"], 0)
+
+    def test_byte_budget(self):
+        """
+        Ensure the least recently used pixmaps are evicted to keep the cache
+        within its byte budget.
+        """
+        QtGui = sgtk.platform.qt.QtGui
+
+        def create_pixmap():
+            return QtGui.QPixmap(self.CELL_WIDTH, self.CELL_HEIGHT)
+
+        pixmap_bytes = (
+            self.CELL_WIDTH * self.CELL_HEIGHT * max(create_pixmap().depth(), 8) // 8
+        )
+        cache = self._views.WidgetDelegate._PaintCache(pixmap_bytes * 2)
+
+        first_key = (((0, 0),), self.CELL_WIDTH, self.CELL_HEIGHT, 0, 1.0)
+        second_key = (((1, 0),), self.CELL_WIDTH, self.CELL_HEIGHT, 0, 1.0)
+        third_key = (((2, 0),), self.CELL_WIDTH, self.CELL_HEIGHT, 0, 1.0)
+
+        cache.add(first_key, create_pixmap())
+        cache.add(second_key, create_pixmap())
+        self.assertIsNotNone(cache.get(first_key))
+        cache.add(third_key, create_pixmap())
+
+        self.assertIsNone(cache.get(second_key))
+        self.assertIsNotNone(cache.get(first_key))
+        self.assertIsNotNone(cache.get(third_key))
+        self.assertEqual(cache.stats["count"], 2)
+        self.assertEqual(cache.stats["size_bytes"], pixmap_bytes * 2)
+
+        # pixmaps larger than the budget aren't cached at all
+        cache.add(
+            (((3, 0),), 1000, 1000, 0, 1.0), QtGui.QPixmap(1000, 1000),
+        )
+        self.assertEqual(cache.stats["count"], 2)
+
+        # invalidating an index removes all of its entries
+        cache.remove_index(((0, 0),))
+        self.assertIsNone(cache.get(first_key))
+        self.assertEqual(cache.stats["size_bytes"], pixmap_bytes)